@@ -0,0 +1,58 @@
+"""
+Loading of large (synthetic) element datasets with
+PeriodicTableDBBuilder.add_elements, into an in-memory database. The time
+per element should not grow with the size of the dataset.
+
+    python -m benchmarks.bench_add_elements
+"""
+from sqlalchemy import MetaData
+
+from periodic_table_db.builder import PeriodicTableDBBuilder
+from periodic_table_db.builder.shared import AtomicWeight, Element
+from periodic_table_db.dbconnector import POOL_STATIC
+from periodic_table_db.shared import (
+    Ion, WEIGHT_TYPE_NONE, WEIGHT_TYPE_REPORTED
+)
+
+from .shared import best_of, report
+
+
+def synthetic_elements(n: int) -> list[Element]:
+    """
+    n elements; every tenth has no weight, the others each have their own.
+    """
+    no_weight = AtomicWeight(None, None, None, None, WEIGHT_TYPE_NONE)
+    return [
+        Element(
+            atomic_number=i,
+            symbol=f"X{i}",
+            name=f"Element {i}",
+            weight=no_weight if i % 10 == 0 else AtomicWeight(
+                i + 0.5, 0.001, i + 0.499, i + 0.501, WEIGHT_TYPE_REPORTED
+            )
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def load(elements: list[Element]):
+    builder = PeriodicTableDBBuilder.from_url(
+        "sqlite:///:memory:", MetaData(), pooling=POOL_STATIC
+    )
+    builder.create_db()
+    builder.add_elements(elements)
+    Ion.clear_registry()
+
+
+def main():
+    for n in (1_000, 10_000, 50_000):
+        elements = synthetic_elements(n)
+        report(
+            f"add_elements ({n:,} elements)",
+            best_of(lambda: load(elements), repeat=3),
+            n
+        )
+
+
+if __name__ == "__main__":
+    main()
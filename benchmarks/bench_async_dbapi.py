@@ -0,0 +1,75 @@
+"""
+Throughput of AsyncPeriodicTableDBAPI with many concurrent coroutines,
+compared with the synchronous PeriodicTableDBAPI run through a thread pool.
+
+    python -m benchmarks.bench_async_dbapi
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+
+from sqlalchemy import MetaData
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.dbapi.async_dbapi import AsyncPeriodicTableDBAPI
+
+from .shared import build_db, report
+
+
+SYMBOLS = ["H", "C", "N", "O", "Fe", "Cu", "Zn", "Ag", "Au", "U"]
+LOOKUPS = 5000
+
+
+async def run_async(db_path: Path, concurrency: int) -> float:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}", pool_size=concurrency
+    )
+    api = await AsyncPeriodicTableDBAPI.create(engine, MetaData())
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(symbol):
+        async with semaphore:
+            return await api.get_atomic_nr_for_symbol(symbol)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        lookup(SYMBOLS[i % len(SYMBOLS)]) for i in range(LOOKUPS)
+    ))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed
+
+
+def run_threaded(api: PeriodicTableDBAPI, concurrency: int) -> float:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(
+            api.get_atomic_nr_for_symbol,
+            (SYMBOLS[i % len(SYMBOLS)] for i in range(LOOKUPS))
+        ))
+        return time.perf_counter() - start
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "periodic_table.sqlite"
+        engine = build_db(db_path)
+        api = PeriodicTableDBAPI(engine, MetaData())
+
+        print(f"{LOOKUPS} get_atomic_nr_for_symbol lookups")
+        for concurrency in (1, 10, 100):
+            report(
+                f"sync, thread pool ({concurrency} workers)",
+                run_threaded(api, concurrency), LOOKUPS
+            )
+            report(
+                f"async, aiosqlite ({concurrency} coroutines)",
+                asyncio.run(run_async(db_path, concurrency)), LOOKUPS
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Atom.dict() for all 118 elements, with the properties derived from the
+shells calculated on the first call and cached for later calls.
+
+    python -m benchmarks.bench_atom_dict
+"""
+from periodic_table_db.builder.extended.data.electronic_structure import (
+    MAX_ATOMIC_NR, Atom
+)
+
+from .shared import best_of, report
+
+
+def dicts(atoms: list[Atom], invalidate: bool):
+    for atom in atoms:
+        if invalidate:
+            atom.invalidate_cache()
+        atom.dict()
+
+
+def main():
+    atoms = [Atom(atomic_nr) for atomic_nr in range(1, MAX_ATOMIC_NR + 1)]
+    n = len(atoms)
+    report(f"Atom.dict(), first call ({n} elements)",
+           best_of(lambda: dicts(atoms, True), repeat=20), n)
+    report(f"Atom.dict(), cached ({n} elements)",
+           best_of(lambda: dicts(atoms, False), repeat=20), n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Electronic structures of all 118 elements plus their ions with charges -3
+to +8, calculated with the vectorized engine (requires numpy), compared
+with building an Atom for each.
+
+    python -m benchmarks.bench_aufbau
+"""
+from periodic_table_db.builder.extended.data.aufbau import (
+    MAX_ATOMIC_NR, electronic_structures
+)
+from periodic_table_db.builder.extended.data.electronic_structure import Atom
+
+from .shared import best_of, report
+
+
+ATOMIC_NRS = range(1, MAX_ATOMIC_NR + 1)
+CHARGES = range(-3, 9)
+
+
+def atom_dicts():
+    return [
+        Atom(atomic_nr, charge).dict()
+        for atomic_nr in ATOMIC_NRS for charge in CHARGES
+        if charge < atomic_nr
+    ]
+
+
+def main():
+    n = len(atom_dicts())
+    report(f"Atom(...).dict() ({n:,} atoms and ions)", best_of(atom_dicts), n)
+    report(
+        f"electronic_structures ({n:,} atoms and ions)",
+        best_of(lambda: electronic_structures(ATOMIC_NRS, CHARGES)),
+        n
+    )
+    report(
+        f"  with dicts() ({n:,} atoms and ions)",
+        best_of(lambda: electronic_structures(ATOMIC_NRS, CHARGES).dicts()),
+        n
+    )
+
+
+if __name__ == "__main__":
+    main()
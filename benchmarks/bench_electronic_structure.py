@@ -0,0 +1,51 @@
+"""
+Calculation of the electronic structures of all 118 elements, and of their
+ions with charges -3 to +8, with Atom (Aufbau filling of SubShells) and
+with AtomConfiguration.ionise (derived from the neutral atoms).
+
+    python -m benchmarks.bench_electronic_structure
+"""
+from periodic_table_db.builder.extended.data.electronic_structure import (
+    MAX_ATOMIC_NR, Atom
+)
+
+from .shared import best_of, report
+
+
+ATOMIC_NRS = range(1, MAX_ATOMIC_NR + 1)
+CHARGES = [charge for charge in range(-3, 9) if charge]
+
+
+def build_atoms():
+    return [Atom(atomic_nr) for atomic_nr in ATOMIC_NRS]
+
+
+def build_ions():
+    return [
+        Atom(atomic_nr, charge)
+        for atomic_nr in ATOMIC_NRS for charge in CHARGES
+        if charge < atomic_nr
+    ]
+
+
+def derive_ions(neutrals):
+    return [
+        neutral.ionise(charge)
+        for neutral in neutrals for charge in CHARGES
+        if charge < neutral.atomic_nr
+    ]
+
+
+def main():
+    n_ions = len(build_ions())
+    report(f"Atom ({MAX_ATOMIC_NR} elements)", best_of(build_atoms),
+           MAX_ATOMIC_NR)
+    report(f"Atom ({n_ions:,} ions)", best_of(build_ions), n_ions)
+
+    neutrals = [atom.configuration() for atom in build_atoms()]
+    report(f"AtomConfiguration.ionise ({n_ions:,} ions)",
+           best_of(lambda: derive_ions(neutrals)), n_ions)
+
+
+if __name__ == "__main__":
+    main()
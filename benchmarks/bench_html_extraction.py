@@ -0,0 +1,42 @@
+"""
+Extraction of the elements from the CIAAW atomic weights table in the test
+file, with BeautifulSoup (get_elements_from_html, then
+parse_elements_text) and with the streaming ElementRowParser.
+
+    python -m benchmarks.bench_html_extraction
+"""
+from types import SimpleNamespace
+
+from periodic_table_db.builder.features import (
+    get_elements, get_elements_from_html, iter_elements_from_html,
+    parse_elements_text
+)
+
+from .shared import AT_WEIGHTS_FILE, best_of, local_file_cfg, report
+
+
+def main():
+    html = AT_WEIGHTS_FILE.read_text(encoding="utf-8")
+    resp = SimpleNamespace(text=html)
+    chunks = [html[i:i + 16384] for i in range(0, len(html), 16384)]
+    n = len(get_elements(**local_file_cfg()))
+
+    report(
+        "BeautifulSoup",
+        best_of(lambda: parse_elements_text(get_elements_from_html(resp))),
+        n
+    )
+    report(
+        "ElementRowParser",
+        best_of(lambda: list(iter_elements_from_html(chunks))),
+        n
+    )
+    report(
+        "get_elements (streamed from file)",
+        best_of(lambda: get_elements(**local_file_cfg())),
+        n
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Memory use and row-conversion speed of the slotted Ion, compared with the
+previous plain dataclass converted to rows with dataclasses.asdict, and
+memory use of shared instances from Ion.get.
+
+    python -m benchmarks.bench_ion
+"""
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+import tracemalloc
+
+from periodic_table_db.shared import Ion
+
+from .shared import best_of, report
+
+
+@dataclass
+class DictIon:
+    """
+    Ion as it was before it was slotted.
+    """
+    symbol: str = field(init=False)
+    element_symbol: str
+    charge: int
+    valence_state: bool
+    atomic_number: int | None = None
+
+    def __post_init__(self):
+        if self.charge > 0:
+            self.symbol = f"{self.element_symbol}{abs(self.charge)}+"
+        elif self.charge < 0:
+            self.symbol = f"{self.element_symbol}{abs(self.charge)}-"
+        elif self.valence_state:
+            self.symbol = f"{self.element_symbol}val"
+        else:
+            self.symbol = f"{self.element_symbol}"
+
+
+def make_ions(ion_factory: Callable, n: int) -> list:
+    return [ion_factory("Fe", i % 7 - 3, False, 26) for i in range(n)]
+
+
+def allocated(ion_factory: Callable, n: int) -> int:
+    """
+    Bytes allocated to hold n ions made by ion_factory.
+    """
+    tracemalloc.start()
+    ions = make_ions(ion_factory, n)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ions
+    return size
+
+
+def main():
+    n = 1_000_000
+    for name, ion_factory in (
+            ("DictIon", DictIon), ("Ion", Ion), ("Ion.get", Ion.get)
+    ):
+        print(f"{name:<50} {allocated(ion_factory, n) / n:10.1f} bytes/ion")
+
+    n = 100_000
+    dict_ions = make_ions(DictIon, n)
+    ions = make_ions(Ion, n)
+    report(
+        f"DictIon: asdict ({n:,} ions)",
+        best_of(lambda: [asdict(ion) for ion in dict_ions]),
+        n
+    )
+    report(
+        f"Ion.to_row ({n:,} ions)",
+        best_of(lambda: [ion.to_row() for ion in ions]),
+        n
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Parsing of valid and invalid ion symbols with the hand-written scanner
+used by parse_ion_symbol, compared with ion_symbol_re (without
+memoization, so that every symbol is parsed).
+
+    python -m benchmarks.bench_ion_symbol
+"""
+from periodic_table_db.shared import _match_ion_symbol, _scan_ion_symbol
+
+from .shared import best_of, report
+
+
+VALID = [
+    "Fe3+", "O2-", "Na+", "Cl-", "Ca++", "S--", "Cu(II)", "Fe(III)",
+    "Cval", "Siva", "Naval", "He",
+]
+INVALID = [
+    "Li+-", "O2--", "Fe(III)3+", "Fe3", "Cu(IV)", "fe3+", "Navall",
+    "Fe3+ ", "Na" + "+" * 20 + "-", "Cu(" + "I" * 20 + "]",
+]
+
+
+def parse_all(parse, symbols: list[str]):
+    for symbol in symbols:
+        try:
+            parse(symbol)
+        except RuntimeError:
+            pass
+
+
+def main():
+    n = 10_000
+    for name, symbols in (("valid", VALID), ("invalid", INVALID)):
+        symbols = symbols * (n // len(symbols))
+        for parser_name, parse in (
+                ("ion_symbol_re", _match_ion_symbol),
+                ("scanner", _scan_ion_symbol),
+        ):
+            report(
+                f"{parser_name} ({len(symbols):,} {name} symbols)",
+                best_of(lambda: parse_all(parse, symbols)),
+                len(symbols)
+            )
+
+
+if __name__ == "__main__":
+    main()
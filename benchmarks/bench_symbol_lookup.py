@@ -0,0 +1,73 @@
+"""
+Lookup of ion ids for lists of 10, 10k and 1M symbols with
+PeriodicTableDBAPI.get_ids_for_ion_symbols (prebuilt statements with chunked
+IN lists, or a temporary table join), compared with building a new
+select(...).where(... IN (...)) for the whole list.
+
+    python -m benchmarks.bench_symbol_lookup
+"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sqlalchemy import MetaData, select
+from sqlalchemy.exc import OperationalError
+
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.shared import ION_ID, ION_SYMBOL
+
+from .shared import best_of, build_db, report
+
+
+def naive_lookup(dbapi: PeriodicTableDBAPI, symbols: list[str]):
+    ion = dbapi.tables["Ion"]
+    stmt = (
+        select(ion.c[ION_SYMBOL], ion.c[ION_ID])
+        .where(ion.c[ION_SYMBOL].in_(symbols))
+    )
+    with dbapi.connect() as conn:
+        return dict(conn.execute(stmt).all())
+
+
+def main():
+    with TemporaryDirectory() as tmp_dir:
+        engine = build_db(Path(tmp_dir) / "periodic_table.sqlite")
+        dbapi = PeriodicTableDBAPI(engine, MetaData())
+        temp_table_dbapi = PeriodicTableDBAPI(
+            engine, MetaData(), temp_table_threshold=0
+        )
+        elements = list(dbapi.snapshot().tables["Ion"].column(ION_SYMBOL))
+
+        for n in (10, 10_000, 1_000_000):
+            # Mostly unknown symbols, so the list cannot be deduplicated
+            symbols = elements[:n] + [
+                f"X{i}" for i in range(n - len(elements))
+            ]
+            repeat = 5 if n < 1_000_000 else 1
+
+            report(
+                f"get_ids_for_ion_symbols ({n:,} symbols)",
+                best_of(lambda: dbapi.get_ids_for_ion_symbols(symbols),
+                        repeat),
+                n
+            )
+            report(
+                f"  with temporary table ({n:,} symbols)",
+                best_of(
+                    lambda: temp_table_dbapi.get_ids_for_ion_symbols(symbols),
+                    repeat
+                ),
+                n
+            )
+            try:
+                report(
+                    f"single IN (...) query ({n:,} symbols)",
+                    best_of(lambda: naive_lookup(dbapi, symbols), repeat),
+                    n
+                )
+            except OperationalError as err:
+                print(f"single IN (...) query ({n:,} symbols) failed: "
+                      f"{err.orig}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks are run as modules from the repository root, e.g.:
+    python -m benchmarks.bench_async_dbapi
+"""
+from collections.abc import Callable
+from pathlib import Path
+import time
+
+from sqlalchemy import MetaData, create_engine
+
+from periodic_table_db.builder import generatedb
+
+from tests.resources.requests_local_file import LocalFileAdapter
+
+
+TEST_FILES = Path(__file__).parent.parent / "tests" / "test_files"
+AT_WEIGHTS_FILE = TEST_FILES / "atomic-weights.htm"
+
+
+def local_file_cfg() -> dict:
+    """
+    Keyword arguments for get_elements to read the CIAAW table from the test
+    file rather than the website.
+    """
+    return {
+        "url": AT_WEIGHTS_FILE.resolve().as_uri(),
+        "adapter_cfg": ("file://", LocalFileAdapter())
+    }
+
+
+def build_db(db_path: Path, extended: bool = True):
+    """
+    Build a periodic table database file at db_path and return its engine.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    generatedb.construct_db(engine, MetaData(), extended, **local_file_cfg())
+    return engine
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Shortest wall-clock time (s) of repeat calls of fn.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def report(name: str, seconds: float, n: int | None = None):
+    """
+    Print a timing, with the rate if the number of operations n is given.
+    """
+    line = f"{name:<50} {seconds * 1e3:10.3f} ms"
+    if n:
+        line += f" {n / seconds:14,.0f} /s"
+    print(line)
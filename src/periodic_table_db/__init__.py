@@ -1,10 +1,10 @@
-from .dbconnector import DBConnector
+from .dbconnector import DBConnector, create_db_engine
 from .dbapi import PeriodicTableDBAPI
-from .shared import Ion, parse_ion_symbol
+from .shared import Ion, parse_ion_symbol, parse_ion_symbols
 
 __all__ = [
-    DBConnector, PeriodicTableDBAPI,
-    Ion, parse_ion_symbol
+    DBConnector, create_db_engine, PeriodicTableDBAPI,
+    Ion, parse_ion_symbol, parse_ion_symbols
 ]
 
 VERSION = "0.2.4"
@@ -1,15 +1,18 @@
 import logging
-from contextlib import nullcontext
 
 from sqlalchemy import (
-    MetaData, insert, select, Connection, bindparam, null, or_, Engine,
+    Column, MetaData, insert, select, Connection, bindparam, Engine, delete,
+    func, update,
 )
 
-from ..dbconnector import DBConnector
+from ..dbconnector import DBConnector, clear_reflection_cache
 from ..dbapi import PeriodicTableDBAPI
 from .shared import Element
-from ..shared import Ion, ION_ID
+from ..shared import (
+    Ion, AT_WEIGHT, ATOMIC_NR, ELEM_SYMBOL, ION_CHARGE, ION_ID, ION_SYMBOL
+)
 from .data import atomic_weight_types as at_weight_values
+from .refresh import ChangeSummary, diff_rows
 from .schema import (
     element_table, atomic_weight_table, atomic_weight_type_table, ions_table
 )
@@ -43,6 +46,8 @@ class PeriodicTableDBBuilder(DBConnector):
         """
         logger.info("Initialising database.")
         self.metadata_obj.create_all(self.engine)
+        # Schema has changed - forget any tables previously reflected
+        clear_reflection_cache(self.engine)
 
         self.dbapi = PeriodicTableDBAPI(self.engine, self.metadata_obj)
 
@@ -52,33 +57,62 @@ class PeriodicTableDBBuilder(DBConnector):
         """
         Create the constants in the atomic weight type table.
         """
-        with self.connect() as conn:
+        with self._connection() as conn:
             logger.info(
                 f"Adding weight types to {self.atomic_weight_type.name} table."
             )
             conn.execute(
                 insert(self.atomic_weight_type), at_weight_values
             )
-            conn.commit()
+            self._commit(conn)
+
+    def _next_id(self, column: Column, conn: Connection) -> int:
+        """
+        First integer primary key value after those already in column.
+        """
+        return (conn.execute(select(func.max(column))).scalar() or 0) + 1
 
     def add_elements(self, elements: list[Element], conn: Connection = None):
         """
         Adds elements and their atomic weights to database, based on a list of
         elements supplied to the function.
+
+        Foreign keys are resolved in memory: the ids of the atomic weight
+        types are read once and the atomic weights are given their ids
+        before they are inserted, so each table is filled with a single
+        executemany and all of the rows are added in one transaction.
         """
-        with (nullcontext(conn) if conn else self.connect()) as conn:
-            element_values = []
+        with self._connection(conn) as conn:
+            weight_type_ids = dict(conn.execute(select(
+                self.atomic_weight_type.c.name, self.atomic_weight_type.c.id
+            )).all())
+
+            # Atomic weights (shared by several elements, e.g. no weight) and
+            # their ids, keyed by their values
+            weight_ids: dict[tuple, int] = {}
             weight_values = []
+            element_values = []
             elements_as_ions = []
+            next_weight_id = self._next_id(self.atomic_weight.c.id, conn)
 
             for elem in elements:
-                el = elem.dict()
-                weight = el.pop("weight")
-                el["weight"] = weight["weight"]
-                el["weight_type"] = weight["weight_type"]
-                element_values.append(el)
-                if weight not in weight_values:
-                    weight_values.append(weight)
+                weight = elem.weight.dict()
+                weight["weight_type_id"] = weight_type_ids[
+                    weight.pop("weight_type")
+                ]
+                weight_key = tuple(weight.values())
+                weight_id = weight_ids.get(weight_key)
+                if weight_id is None:
+                    weight_id = next_weight_id + len(weight_ids)
+                    weight_ids[weight_key] = weight_id
+                    weight_values.append({"id": weight_id, **weight})
+
+                element_values.append({
+                    ATOMIC_NR: elem.atomic_number,
+                    ELEM_SYMBOL: elem.symbol,
+                    "name": elem.name,
+                    "atomic_weight_id": weight_id,
+                })
 
                 # For each element add an Ion:
                 ion = Ion(
@@ -88,47 +122,232 @@ class PeriodicTableDBBuilder(DBConnector):
                     atomic_number=elem.atomic_number,)
                 elements_as_ions.append(ion)
 
-            # Insert the atomic weights
-            # Use subquery to associate weight types with each weight
-            weight_type_subq = (
-                select(self.atomic_weight_type.c.id)
-                .where(self.atomic_weight_type.c.name
-                       == bindparam("weight_type"))
-                .scalar_subquery()
-            )
-            weights_insert_stmt = (
-                insert(self.atomic_weight)
-                .values(weight_type_id=weight_type_subq)
-            )
             logger.info(f"Adding {len(weight_values)} entries "
                         f"to {self.atomic_weight.name} table.")
-            conn.execute(weights_insert_stmt, weight_values)
-            conn.commit()
-
-            # Insert the elements
-            # Use subquery to associate the weights with each element
-            weight_subq = (
-                select(self.atomic_weight.c.id)
-                .join(self.atomic_weight_type)
-                .where(
-                    self.atomic_weight_type.c.name == bindparam("weight_type"),
-                    or_(
-                        self.atomic_weight.c.weight == bindparam("weight"),
-                        self.atomic_weight.c.weight == null(),
-                    )
-                ).scalar_subquery()
-            )
-            # or_ statement needed above, since bindparam returns "col = None"
-            # rather than "col IS NULL". This is a variation on this:
-            #     https://stackoverflow.com/q/21668606
-            # There's probably a neater solution using a TypeDecorator, but
-            # this works
-            elements_insert_stmt = (
-                insert(self.element).values(atomic_weight_id=weight_subq)
-            )
+            conn.execute(insert(self.atomic_weight), weight_values)
+
             logger.info(f"Adding {len(element_values)} entries to "
                         f"{self.element.name} table.")
-            conn.execute(elements_insert_stmt, element_values)
-            conn.commit()
+            conn.execute(insert(self.element), element_values)
 
+            # Commits the weights and elements with the ions
             self.dbapi.add_ions(elements_as_ions, conn=conn)
+
+    def refresh_elements(
+            self, elements: list[Element], allow_deletes: bool = False,
+            conn: Connection = None
+    ) -> ChangeSummary:
+        """
+        Bring the elements and atomic weights of an existing database up to
+        date with a newly parsed list of elements, in a single transaction.
+
+        Existing rows are compared with the rows expected for elements and
+        only those which differ are inserted, updated or deleted. Ions added
+        to the database are kept (and renamed if the symbol of their element
+        changes), unless their element is removed.
+
+        To protect against a failed or truncated download, a RuntimeError is
+        raised (and nothing is changed) if elements is empty, or if elements
+        missing from it would be deleted although it does not cover the
+        range of atomic numbers already in the database. allow_deletes
+        permits such deletions.
+        """
+        if not elements:
+            raise RuntimeError("Cannot refresh the database from no elements.")
+
+        summary = ChangeSummary()
+        with self._connection(conn) as conn:
+            existing_nrs = set(conn.execute(
+                select(self.element.c[ATOMIC_NR])
+            ).scalars())
+            fresh_nrs = {elem.atomic_number for elem in elements}
+            removed = existing_nrs - fresh_nrs
+            covers_existing = (
+                min(fresh_nrs) <= min(existing_nrs, default=min(fresh_nrs))
+                and max(fresh_nrs) >= max(existing_nrs, default=0)
+            )
+            if removed and not (allow_deletes or covers_existing):
+                raise RuntimeError(
+                    f"Refusing to delete {len(removed)} elements not in the "
+                    "refreshed list (atomic numbers "
+                    f"{min(fresh_nrs)}-{max(fresh_nrs)}); the list may be "
+                    "incomplete. Use allow_deletes to delete them."
+                )
+
+            self._refresh_elements(elements, summary, conn)
+            self._commit(conn)
+        logger.info(f"Refreshed database:\n{summary}")
+        return summary
+
+    def _refresh_elements(
+            self, elements: list[Element], summary: ChangeSummary,
+            conn: Connection
+    ):
+        weight_type_ids = dict(conn.execute(select(
+            self.atomic_weight_type.c.name, self.atomic_weight_type.c.id
+        )).all())
+
+        # Atomic weights are identified by their (unique) weight
+        weight_cols = [
+            col.name for col in self.atomic_weight.c if col.name != "id"
+        ]
+        existing_weights = {}
+        weight_ids = {}
+        for row in conn.execute(select(self.atomic_weight)).mappings():
+            existing_weights[row[AT_WEIGHT]] = {
+                col: row[col] for col in weight_cols
+            }
+            weight_ids[row[AT_WEIGHT]] = row["id"]
+        fresh_weights = {}
+        for elem in elements:
+            weight = elem.weight.dict()
+            weight["weight_type_id"] = weight_type_ids[
+                weight.pop("weight_type")
+            ]
+            fresh_weights[weight[AT_WEIGHT]] = weight
+
+        inserts, updates, weight_deletes = diff_rows(
+            existing_weights, fresh_weights
+        )
+        next_id = self._next_id(self.atomic_weight.c.id, conn)
+        weight_ids.update(zip(inserts, range(next_id, next_id + len(inserts))))
+        if inserts:
+            conn.execute(insert(self.atomic_weight), [
+                {"id": weight_ids[key], **fresh_weights[key]}
+                for key in inserts
+            ])
+        if updates:
+            conn.execute(
+                update(self.atomic_weight)
+                .where(self.atomic_weight.c.id == bindparam("weight_id")),
+                [
+                    # Different name to the column to avoid collision with
+                    # bindparameter
+                    {"weight_id": weight_ids[key], **fresh_weights[key]}
+                    for key in updates
+                ]
+            )
+        summary.record(
+            self.atomic_weight.name, inserted=inserts, updated=updates,
+            deleted=weight_deletes
+        )
+
+        existing_elements = {
+            atomic_nr: {
+                ELEM_SYMBOL: symbol, "name": name,
+                "atomic_weight_id": atomic_weight_id
+            }
+            for atomic_nr, symbol, name, atomic_weight_id in conn.execute(
+                select(
+                    self.element.c[ATOMIC_NR], self.element.c[ELEM_SYMBOL],
+                    self.element.c.name, self.element.c.atomic_weight_id
+                )
+            )
+        }
+        fresh_elements = {
+            elem.atomic_number: {
+                ELEM_SYMBOL: elem.symbol, "name": elem.name,
+                "atomic_weight_id": weight_ids[elem.weight.weight]
+            }
+            for elem in elements
+        }
+        inserts, updates, deletes = diff_rows(
+            existing_elements, fresh_elements
+        )
+        if inserts:
+            conn.execute(insert(self.element), [
+                {ATOMIC_NR: key, **fresh_elements[key]} for key in inserts
+            ])
+        if updates:
+            conn.execute(
+                update(self.element)
+                .where(self.element.c[ATOMIC_NR] == bindparam("atomic_nr")),
+                [
+                    {"atomic_nr": key, **fresh_elements[key]}
+                    for key in updates
+                ]
+            )
+        summary.record(
+            self.element.name, inserted=inserts, updated=updates,
+            deleted=deletes
+        )
+
+        # Each new element is also an Ion...
+        next_id = self._next_id(self.ion.c[ION_ID], conn)
+        ion_values = [
+            {
+                ION_ID: ion_id,
+                **Ion(
+                    element_symbol=fresh_elements[atomic_nr][ELEM_SYMBOL],
+                    charge=0,
+                    valence_state=False,
+                    atomic_number=atomic_nr
+                ).to_row()
+            }
+            for ion_id, atomic_nr in enumerate(inserts, start=next_id)
+        ]
+        if ion_values:
+            conn.execute(insert(self.ion), ion_values)
+        summary.record(
+            self.ion.name, inserted=[row[ION_ID] for row in ion_values]
+        )
+        # ... and the ions of an element are renamed with its symbol
+        renamed = [
+            key for key in updates
+            if existing_elements[key][ELEM_SYMBOL]
+            != fresh_elements[key][ELEM_SYMBOL]
+        ]
+        if renamed:
+            ion_values = [
+                {
+                    "ion_id": ion_id,
+                    ION_SYMBOL: Ion(
+                        element_symbol=fresh_elements[atomic_nr][ELEM_SYMBOL],
+                        charge=charge,
+                        valence_state=valence_state
+                    ).symbol
+                }
+                for ion_id, atomic_nr, charge, valence_state in conn.execute(
+                    select(
+                        self.ion.c[ION_ID], self.ion.c[ATOMIC_NR],
+                        self.ion.c[ION_CHARGE], self.ion.c.valence_state
+                    ).where(self.ion.c[ATOMIC_NR].in_(renamed))
+                )
+            ]
+            conn.execute(
+                update(self.ion)
+                .where(self.ion.c[ION_ID] == bindparam("ion_id")),
+                ion_values
+            )
+            summary.record(
+                self.ion.name, updated=[row["ion_id"] for row in ion_values]
+            )
+
+        if deletes:
+            self._delete_elements(deletes, summary, conn)
+        if weight_deletes:
+            conn.execute(delete(self.atomic_weight).where(
+                self.atomic_weight.c.id.in_(
+                    [weight_ids[key] for key in weight_deletes]
+                )
+            ))
+
+    def _delete_elements(
+            self, atomic_nrs: list[int], summary: ChangeSummary,
+            conn: Connection
+    ):
+        """
+        Delete elements, together with all of their ions.
+        """
+        ion_ids = conn.execute(
+            select(self.ion.c[ION_ID])
+            .where(self.ion.c[ATOMIC_NR].in_(atomic_nrs))
+        ).scalars().all()
+        conn.execute(
+            delete(self.ion).where(self.ion.c[ATOMIC_NR].in_(atomic_nrs))
+        )
+        summary.record(self.ion.name, deleted=ion_ids)
+        conn.execute(
+            delete(self.element)
+            .where(self.element.c[ATOMIC_NR].in_(atomic_nrs))
+        )
@@ -1,6 +1,9 @@
-from .electronic_structure import Atom
+from .electronic_structure import (
+    Atom, AtomConfiguration, ion_configurations, precompute_configurations
+)
 from .group_block_data import groups, blocks, label_values, label_rules
 
 __all__ = [
-    Atom, groups, blocks, label_values, label_rules
+    Atom, AtomConfiguration, ion_configurations, precompute_configurations,
+    groups, blocks, label_values, label_rules
 ]
@@ -0,0 +1,217 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from ....shared import (
+    ATOMIC_NR, PERIOD, GROUP, BLOCK, E_SHELL_STRUCT, E_SUB_SHELL_STRUCT
+)
+from .electronic_structure import (
+    AZIMUTHAL_QUANTUM_NUMBER, AZIMUTHAL_QN_REVERSE_MAP, FILLING_ORDER,
+    GROUND_STATES, MAX_ATOMIC_NR, SubShell
+)
+
+# Sub-shells (principal, azimuthal quantum number) which may be filled, in
+# filling (Madelung) order
+SUB_SHELLS = FILLING_ORDER
+_PQN = np.array([pqn for pqn, _ in SUB_SHELLS])
+_AQN = np.array([aqn for _, aqn in SUB_SHELLS])
+_CAPACITY = SubShell.MAX_E_ORBITAL * (2 * _AQN + 1)
+# Electrons in all sub-shells filled before each sub-shell
+_FILLED_BEFORE = np.cumsum(_CAPACITY) - _CAPACITY
+# Columns of the occupancy matrix in the order sub-shells are listed in a
+# sub_shell_structure (by principal, then azimuthal quantum number)
+_LISTING_ORDER = np.lexsort((_AQN, _PQN)).tolist()
+_NAMES = [f"{pqn}{AZIMUTHAL_QUANTUM_NUMBER[aqn]}" for pqn, aqn in SUB_SHELLS]
+
+
+def _ground_state_overrides() -> dict[int, list[tuple[int, int]]]:
+    """
+    GROUND_STATES as (column of the occupancy matrix, electrons) overrides,
+    keyed by atomic number.
+    """
+    overrides = {}
+    for atomic_nr, sub_shell_struct in GROUND_STATES.items():
+        overrides[atomic_nr] = []
+        for struct in sub_shell_struct.split("."):
+            mtch = SubShell.ORBITAL_REGEX.match(struct)
+            qns = (
+                int(mtch.group("pqn")),
+                AZIMUTHAL_QN_REVERSE_MAP[mtch.group("aqn_char")]
+            )
+            overrides[atomic_nr].append(
+                (SUB_SHELLS.index(qns), int(mtch.group("electrons")))
+            )
+    return overrides
+
+
+_OVERRIDES = _ground_state_overrides()
+
+
+@dataclass
+class ElectronicStructures:
+    """
+    Electronic structures of a batch of atoms and ions, as columns.
+
+    occupancy has one row per atom/ion and one column per sub-shell of
+    SUB_SHELLS. listed marks the sub-shells which appear in the
+    sub_shell_structure (occupied, or set by a GROUND_STATES correction).
+    period and group are 0 and block is "" where they are not defined
+    (ions, and the groups of the f-block).
+    """
+    atomic_nr: np.ndarray
+    charge: np.ndarray
+    occupancy: np.ndarray
+    listed: np.ndarray
+    period: np.ndarray
+    group: np.ndarray
+    block: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.atomic_nr)
+
+    def _format_rows(self, format_row: Callable[[list, list], str]):
+        """
+        Apply format_row(occupancy, listed) to the rows of the occupancy and
+        listed matrices. Many atoms/ions have the same configuration, so
+        each distinct row is only formatted once.
+        """
+        formatted: dict[bytes, str] = {}
+        strings = []
+        for occupancy, listed in zip(self.occupancy, self.listed):
+            key = occupancy.tobytes() + listed.tobytes()
+            if key not in formatted:
+                formatted[key] = format_row(
+                    occupancy.tolist(), listed.tolist()
+                )
+            strings.append(formatted[key])
+        return strings
+
+    @property
+    def shell_structure(self) -> list[str]:
+        """
+        Total number of electrons in each shell, separated by dots.
+        """
+        pqns = _PQN.tolist()
+        shells = range(1, max(pqns) + 1)
+
+        def format_row(occupancy: list, listed: list) -> str:
+            electrons = dict.fromkeys(shells, 0)
+            is_listed = dict.fromkeys(shells, False)
+            for pqn, e, sub_shell_listed in zip(pqns, occupancy, listed):
+                electrons[pqn] += e
+                is_listed[pqn] |= bool(sub_shell_listed)
+            return ".".join(
+                str(electrons[pqn]) for pqn in shells if is_listed[pqn]
+            )
+
+        return self._format_rows(format_row)
+
+    @property
+    def sub_shell_structure(self) -> list[str]:
+        """
+        Sub-shell names with their number of electrons (as a superscript, in
+        LaTeX format), separated by dots.
+        """
+        def format_row(occupancy: list, listed: list) -> str:
+            return ".".join(
+                f"{_NAMES[i]}^{{{occupancy[i]}}}"
+                for i in _LISTING_ORDER if listed[i]
+            )
+
+        return self._format_rows(format_row)
+
+    def dicts(self) -> list[dict[str, int | str | None]]:
+        """
+        The same dictionaries as Atom.dict(), for every atom/ion.
+        """
+        return [
+            {
+                ATOMIC_NR: atomic_nr,
+                PERIOD: period or None,
+                GROUP: group or None,
+                BLOCK: block or None,
+                E_SHELL_STRUCT: shell_struct,
+                E_SUB_SHELL_STRUCT: sub_shell_struct,
+            }
+            for (atomic_nr, period, group, block, shell_struct,
+                 sub_shell_struct) in zip(
+                self.atomic_nr.tolist(), self.period.tolist(),
+                self.group.tolist(), self.block.tolist(),
+                self.shell_structure, self.sub_shell_structure
+            )
+        ]
+
+
+def electronic_structures(
+        atomic_nrs: Iterable[int] = range(1, MAX_ATOMIC_NR + 1),
+        charges: Iterable[int] = (0, )
+) -> ElectronicStructures:
+    """
+    Calculate the electronic structures of every combination of atomic
+    number and charge in one pass, giving the same results as Atom.
+
+    Sub-shells are filled in Madelung order for the number of electrons of
+    each atom/ion. Period, group and block of neutral atoms are calculated
+    from this filling, before the GROUND_STATES corrections are applied.
+    Combinations leaving an ion without electrons are skipped.
+    """
+    atomic_nr, charge = (
+        grid.ravel() for grid in np.meshgrid(
+            np.fromiter(atomic_nrs, dtype=int),
+            np.fromiter(charges, dtype=int),
+            indexing="ij"
+        )
+    )
+    keep = charge < atomic_nr
+    atomic_nr, charge = atomic_nr[keep], charge[keep]
+    electrons = atomic_nr - charge
+    if electrons.max(initial=0) > _CAPACITY.sum():
+        raise ValueError("Too many electrons for the sub-shells available.")
+
+    occupancy = np.clip(
+        electrons[:, np.newaxis] - _FILLED_BEFORE, 0, _CAPACITY
+    )
+
+    # Last sub-shell filled, and last s sub-shell filled (start of period)
+    last = (occupancy > 0).sum(axis=1) - 1
+    last_aqn = _AQN[last]
+    s_columns = np.flatnonzero(_AQN == 0)
+    last_s = s_columns[np.searchsorted(s_columns, last, side="right") - 1]
+    period = _PQN[last_s]
+    group = electrons - _FILLED_BEFORE[last_s]
+
+    # Edge cases of the group assignment (see Atom._calculate_period_group)
+    group = np.where((last_aqn == 0) & (period == 1) & (electrons == 2),
+                     18, group)
+    group = np.where((last_aqn != 0) & np.isin(period, [2, 3]),
+                     group + 10, group)
+    in_period_6_7 = (last_aqn != 0) & np.isin(period, [6, 7])
+    group = np.where(in_period_6_7 & np.isin(last_aqn, [1, 2]),
+                     group - 14, group)
+    group = np.where(in_period_6_7 & (last_aqn == 3), 0, group)
+    block = np.array([AZIMUTHAL_QUANTUM_NUMBER[aqn] for aqn in range(4)])[
+        last_aqn
+    ]
+
+    is_ion = charge != 0
+    period[is_ion] = 0
+    group[is_ion] = 0
+    block[is_ion] = ""
+
+    listed = occupancy > 0
+    corrected = ~is_ion & np.isin(atomic_nr, list(_OVERRIDES))
+    for row in np.flatnonzero(corrected):
+        for column, e in _OVERRIDES[atomic_nr[row]]:
+            occupancy[row, column] = e
+            listed[row, column] = True
+
+    return ElectronicStructures(
+        atomic_nr=atomic_nr,
+        charge=charge,
+        occupancy=occupancy,
+        listed=listed,
+        period=period,
+        group=group,
+        block=block,
+    )
@@ -1,6 +1,7 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
+from functools import cached_property, lru_cache
 import re
-from typing import Any
+from typing import Any, NamedTuple
 
 from ....shared import (
     ATOMIC_NR, PERIOD, GROUP, BLOCK, E_SHELL_STRUCT, E_SUB_SHELL_STRUCT
@@ -16,6 +17,30 @@ AZIMUTHAL_QN_REVERSE_MAP = {
 }
 
 
+# Highest atomic number of the known elements
+MAX_ATOMIC_NR = 118
+
+
+def _filling_order(max_pqn: int) -> tuple[tuple[int, int], ...]:
+    """
+    (principal, azimuthal quantum number) of each sub-shell in the order
+    they are filled by Atom (Madelung order).
+    """
+    order = []
+    for pqn in range(1, max_pqn + 1):
+        order.append((pqn, 0))
+        if pqn > 5:
+            order.append((pqn - 2, 3))
+        if pqn > 3:
+            order.append((pqn - 1, 2))
+        if pqn > 1:
+            order.append((pqn, 1))
+    return tuple(order)
+
+
+FILLING_ORDER = _filling_order(8)
+
+
 def get_last_occurrence_index(seq: Sequence, item: Any) -> int:
     return next(i for i in reversed(range(len(seq))) if seq[i] == item)
 
@@ -42,9 +67,17 @@ class SubShell:
         number with the letter code derived from the azimuthal quantum number.
 
         The number of electrons that can be allocated to each orbital is
-        limited by the MAX_E_ORBITAL variable.
+        limited by the MAX_E_ORBITAL variable. Only the total number of
+        electrons is stored; the occupancy of each orbital follows from it.
+
+        atom is the Atom whose shells contain this sub-shell (if any). Its
+        cached properties are invalidated whenever electrons are added or
+        removed.
         """
-        self.orbitals = [0] * len(range(-aqn, aqn + 1))
+        self.n_orbitals = len(range(-aqn, aqn + 1))
+        self.capacity = self.n_orbitals * self.MAX_E_ORBITAL
+        self._electrons = 0
+        self.atom: "Atom | None" = None
         self.name = f"{pqn}{AZIMUTHAL_QUANTUM_NUMBER[aqn]}"
         self._pqn = pqn
         self._aqn = aqn
@@ -83,13 +116,12 @@ class SubShell:
         entry if electrons were added to allow the sub-shell filling sequence
         to be determined.
         """
-
-        while (population["electrons"] and not self.is_full):
+        if population["electrons"]:
             population["electrons"] = (
                 self.add_electrons(population["electrons"])
             )
 
-        if bool(sum(self.orbitals)):
+        if self._electrons:
             # Only add to the sequence if some electrons added to the sub-shell
             population["sequence"].append((self._pqn, self._aqn))
 
@@ -97,59 +129,55 @@ class SubShell:
 
     def add_electrons(self, e: int = 1):
         """
-        Add electrons to the orbitals list following the Hund's rule.
+        Add up to e electrons to the sub-shell, returning the number which
+        did not fit.
 
         e should be a positive integer.
         """
-        for i in list(range(len(self.orbitals))) * self.MAX_E_ORBITAL:
-            if e and self.orbitals[i] < self.MAX_E_ORBITAL:
-                self.orbitals[i] += 1
-                e -= 1
-            elif e == 0:
-                break
-        return e
+        added = min(e, self.capacity - self._electrons)
+        self._electrons += added
+        if added and self.atom is not None:
+            self.atom.invalidate_cache()
+        return e - added
 
     def remove_electrons(self, e: int = 1):
         """
-        Remove electrons from the orbitals list following the Hund's rule.
+        Remove up to e electrons from the sub-shell, returning (as a
+        negative number) the number which could not be removed.
 
         e should be a positive integer.
         """
-        e = -e
-
-        if 2 in self.orbitals:
-            last_orb_idx = get_last_occurrence_index(self.orbitals, 2)
-        elif 1 in self.orbitals:
-            last_orb_idx = get_last_occurrence_index(self.orbitals, 1)
-        else:
-            return e
-
-        # List of indices to pass through self.orbitals 2x at most
-        rev_orbital_indies = (list(reversed(range(len(self.orbitals))))
-                              * self.MAX_E_ORBITAL)
-        # Start looping from the last orbital with the highest occupancy
-        for i in rev_orbital_indies[rev_orbital_indies.index(last_orb_idx):]:
-            if e and self.orbitals[i] > 0:
-                self.orbitals[i] -= 1
-                e += 1
-            elif e == 0:
-                break
+        removed = min(e, self._electrons)
+        self._electrons -= removed
+        if removed and self.atom is not None:
+            self.atom.invalidate_cache()
+        return removed - e
 
-        return e
+    @property
+    def orbitals(self) -> list[int]:
+        """
+        Number of electrons in each orbital of this sub-shell, following
+        Hund's rule: each orbital is singly occupied before any is doubly
+        occupied.
+        """
+        e, n = self._electrons, self.n_orbitals
+        if e <= n:
+            return [1] * e + [0] * (n - e)
+        return [2] * (e - n) + [1] * (2 * n - e)
 
     @property
     def electrons(self):
         """
         Total number of electrons (over all orbitals) in this sub-shell.
         """
-        return sum(self.orbitals)
+        return self._electrons
 
     @property
     def is_full(self):
         """
         True if all the orbitals in this sub-shell are filled.
         """
-        return self.electrons == len(self.orbitals) * self.MAX_E_ORBITAL
+        return self._electrons == self.capacity
 
     def __repr__(self) -> str:
         e_config = ", ".join(map(str, self.orbitals))
@@ -159,6 +187,107 @@ class SubShell:
         return f"{self.name}^{{{self.electrons}}}"
 
 
+class AtomConfiguration(NamedTuple):
+    """
+    Immutable record of the electronic configuration of an atom (or ion),
+    as calculated by Atom. sub_shells lists the (principal quantum number,
+    azimuthal quantum number, electrons) of each sub-shell, in the order of
+    sub_shell_structure.
+    """
+    atomic_nr: int
+    charge: int
+    period: int | None
+    group: int | None
+    block: str | None
+    shell_structure: str
+    sub_shell_structure: str
+    sub_shells: tuple[tuple[int, int, int], ...]
+
+    def ionise(self, charge: int) -> "AtomConfiguration":
+        """
+        Derive the configuration of the ion with the given charge from this
+        configuration (normally that of the neutral atom).
+
+        Electrons are removed from the outermost shell first (p before s),
+        then from the other sub-shells in reverse filling order, so that
+        e.g. the transition metals lose their ns electrons before (n-1)d
+        and the lanthanoids lose 6s, then 5d, then 4f. Electrons are added
+        to the first sub-shells which are not full, in filling (Madelung)
+        order. Sub-shells emptied by ionisation are dropped. Period, group
+        and block are not defined for ions.
+        """
+        electrons = {(pqn, aqn): e for pqn, aqn, e in self.sub_shells}
+        change = self.charge - charge
+        if sum(electrons.values()) + change < 0:
+            raise ValueError(
+                f"Atomic number {self.atomic_nr} cannot have charge {charge}."
+            )
+
+        outer_pqn = max(
+            (pqn for (pqn, _), e in electrons.items() if e), default=0
+        )
+        removal_order = sorted(
+            (qns for qns in electrons if qns[0] == outer_pqn), reverse=True
+        ) + [
+            qns for qns in reversed(FILLING_ORDER)
+            if qns in electrons and qns[0] != outer_pqn
+        ]
+
+        emptied = set()
+        for qns in removal_order:
+            if change >= 0:
+                break
+            removed = min(electrons[qns], -change)
+            electrons[qns] -= removed
+            change += removed
+            if removed and not electrons[qns]:
+                emptied.add(qns)
+
+        for qns in FILLING_ORDER:
+            if change <= 0:
+                break
+            capacity = SubShell.MAX_E_ORBITAL * (2 * qns[1] + 1)
+            added = min(capacity - electrons.get(qns, 0), change)
+            if added > 0:
+                electrons[qns] = electrons.get(qns, 0) + added
+                change -= added
+
+        sub_shells = tuple(
+            (pqn, aqn, electrons[(pqn, aqn)])
+            for pqn, aqn in sorted(electrons) if (pqn, aqn) not in emptied
+        )
+        shell_electrons: dict[int, int] = {}
+        for pqn, _, e in sub_shells:
+            shell_electrons[pqn] = shell_electrons.get(pqn, 0) + e
+
+        return AtomConfiguration(
+            atomic_nr=self.atomic_nr,
+            charge=charge,
+            period=None,
+            group=None,
+            block=None,
+            shell_structure=".".join(map(str, shell_electrons.values())),
+            sub_shell_structure=".".join(
+                f"{pqn}{AZIMUTHAL_QUANTUM_NUMBER[aqn]}^{{{e}}}"
+                for pqn, aqn, e in sub_shells
+            ),
+            sub_shells=sub_shells,
+        )
+
+    def dict(self) -> dict[str, int | float | str]:
+        """
+        The same dictionary as Atom.dict().
+        """
+        return {
+            ATOMIC_NR: self.atomic_nr,
+            PERIOD: self.period,
+            GROUP: self.group,
+            BLOCK: self.block,
+            E_SHELL_STRUCT: self.shell_structure,
+            E_SUB_SHELL_STRUCT: self.sub_shell_structure,
+        }
+
+
 class Atom:
 
     def __init__(self, atomic_nr, charge=0) -> None:
@@ -169,7 +298,7 @@ class Atom:
         period etc., are not.
         """
         self.atomic_nr = atomic_nr
-        population = {"electrons": atomic_nr + charge, "sequence": []}
+        population = {"electrons": atomic_nr - charge, "sequence": []}
         self.shells: dict[int, dict[int, SubShell]] = {}
         self.is_ion = bool(charge)
         self.labels: list[str] = []
@@ -208,6 +337,8 @@ class Atom:
                 for aqn, sub_shell in self.shells[pqn].items()
                 if sub_shell.electrons
             }
+            for sub_shell in self.shells[pqn].values():
+                sub_shell.atom = self
 
         # List of tuples containing the principal quantum and azimuthal
         # quantum numbers of each occupied sub-shell in the sequence they
@@ -226,10 +357,11 @@ class Atom:
             self.period, self.group = self._calculate_period_group()
 
         # Correct the cases where the default calculated orbital filling does
-        # not fit the rules.
+        # not fit the rules. The corrections are ground states of the neutral
+        # atoms, so do not apply to ions.
         # IMPORTANT: this must be the last step in the constructor, otherwise
         #            group/block may be calculated wrong!
-        if self.atomic_nr in GROUND_STATES:
+        if not self.is_ion and self.atomic_nr in GROUND_STATES:
             self.correct_orbital_filling(GROUND_STATES[self.atomic_nr])
 
     def _calculate_period_group(self):
@@ -288,9 +420,29 @@ class Atom:
         ]
 
         for sub_shell in corrected_sub_shells:
+            sub_shell.atom = self
             self.shells[sub_shell._pqn][sub_shell._aqn] = sub_shell
+        self.invalidate_cache()
 
-    @property
+    # Properties derived from the shells, which are cached until electrons
+    # are added to or removed from a sub-shell, or the sub-shells are
+    # corrected
+    _CACHED_PROPERTIES = (
+        "_shell_electrons", "shell_structure", "sub_shell_structure",
+        "electrons", "charge"
+    )
+
+    def invalidate_cache(self):
+        """
+        Discard the cached properties derived from the shells. Called by
+        the sub-shells of the atom when their electrons change, and by
+        correct_orbital_filling; must also be called after adding or
+        replacing sub-shells in shells directly.
+        """
+        for name in self._CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+
+    @cached_property
     def _shell_electrons(self):
         """
         Dictionary of principal quantum numbers of each occupied shell with
@@ -304,7 +456,7 @@ class Atom:
             for pqn in self.shells
         }
 
-    @property
+    @cached_property
     def shell_structure(self):
         """
         A string reporting the total number of electrons in each shell,
@@ -316,7 +468,7 @@ class Atom:
         ]
         return ".".join(cfg)
 
-    @property
+    @cached_property
     def sub_shell_structure(self) -> str:
         """
         A string containing the sub-shell name with the associated number of
@@ -335,7 +487,7 @@ class Atom:
         ]
         return ".".join(cfg)
 
-    @property
+    @cached_property
     def electrons(self) -> int:
         """
         Returns the total number of electrons in this Atom.
@@ -345,13 +497,55 @@ class Atom:
         ]
         return sum(electrons_per_shell)
 
-    @property
+    @cached_property
     def charge(self) -> int:
         """
         Returns the charge of the Atom (ion).
         """
         return self.atomic_nr - self.electrons
 
+    @classmethod
+    def for_atomic_number(
+            cls, atomic_nr: int, charge: int = 0
+    ) -> AtomConfiguration:
+        """
+        Get the configuration of an atom (or ion) without recalculating it.
+        Configurations are calculated once per (atomic_nr, charge) and
+        cached; see also precompute_configurations.
+
+        Ions are filled by the Aufbau principle, as for Atom(atomic_nr,
+        charge); see for_ion for configurations derived from the neutral
+        atom.
+        """
+        return _atom_configuration(atomic_nr, charge)
+
+    @classmethod
+    def for_ion(cls, atomic_nr: int, charge: int) -> AtomConfiguration:
+        """
+        Get the configuration of an ion, derived from the (cached) neutral
+        atom with AtomConfiguration.ionise. Results are cached.
+        """
+        return _ion_configuration(atomic_nr, charge)
+
+    def configuration(self) -> AtomConfiguration:
+        """
+        Immutable record of the current electronic configuration.
+        """
+        return AtomConfiguration(
+            atomic_nr=self.atomic_nr,
+            charge=self.charge,
+            period=self.period,
+            group=self.group,
+            block=self.block,
+            shell_structure=self.shell_structure,
+            sub_shell_structure=self.sub_shell_structure,
+            sub_shells=tuple(
+                (pqn, aqn, sub_shell.electrons)
+                for pqn, shell in self.shells.items()
+                for aqn, sub_shell in shell.items()
+            ),
+        )
+
     def dict(self) -> dict[str, int | float | str]:
         atom_dict = {
             ATOMIC_NR: self.atomic_nr,
@@ -403,3 +597,44 @@ GROUND_STATES = {
     110: "6d^{9}.7s^{1}",
     111: "6d^{10}.7s^{1}"
 }
+
+
+@lru_cache(maxsize=None)
+def _atom_configuration(atomic_nr: int, charge: int) -> AtomConfiguration:
+    return Atom(atomic_nr, charge).configuration()
+
+
+def precompute_configurations(
+        atomic_nrs: Iterable[int] = range(1, MAX_ATOMIC_NR + 1),
+        charge: int = 0
+) -> dict[int, AtomConfiguration]:
+    """
+    Calculate (and cache for Atom.for_atomic_number) the configurations of
+    all the given atomic numbers, by default all known elements.
+    """
+    return {
+        atomic_nr: Atom.for_atomic_number(atomic_nr, charge)
+        for atomic_nr in atomic_nrs
+    }
+
+
+@lru_cache(maxsize=None)
+def _ion_configuration(atomic_nr: int, charge: int) -> AtomConfiguration:
+    neutral = _atom_configuration(atomic_nr, 0)
+    return neutral.ionise(charge) if charge else neutral
+
+
+def ion_configurations(
+        atomic_nrs: Iterable[int] = range(1, MAX_ATOMIC_NR + 1),
+        charges: Iterable[int] = range(-3, 9)
+) -> Iterator[AtomConfiguration]:
+    """
+    Yield the configurations (see Atom.for_ion) of every combination of
+    atomic number and charge. Combinations leaving the ion without
+    electrons are skipped.
+    """
+    charges = list(charges)
+    for atomic_nr in atomic_nrs:
+        for charge in charges:
+            if charge < atomic_nr:
+                yield Atom.for_ion(atomic_nr, charge)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from collections.abc import Callable
 
-from .electronic_structure import Atom
+from .electronic_structure import Atom, AtomConfiguration
 from ....shared import BLOCK
 
 # TODO Add citations!
@@ -107,7 +107,7 @@ NOBLE_GAS = "Noble Gases"
 class LabelDefinition:
     name: str
     description: str
-    rule: Callable[[Atom], bool]
+    rule: Callable[[Atom | AtomConfiguration], bool]
 
 
 """
@@ -129,33 +129,33 @@ label_definitions = [
     LabelDefinition(
         name="Main Group",
         description="Groups 1, 2 and 13-18 (excluding hydrogen).",
-        rule=lambda at: at.atomic_nr != 1 and at.group in list(range(13, 19))
+        rule=lambda at: at.atomic_nr != 1 and at.group in range(13, 19)
     ),
     LabelDefinition(
         name="Transition Element",
         description="d-block elements with whose atoms or cations have "
                     "partially filled d-subshells.",
-        rule=lambda at: at.group in list(range(3, 12))
+        rule=lambda at: at.group in range(3, 12)
     ),
     LabelDefinition(
         name="Rare Earth Element",
         description="Scandium, yttrium and the lanthanoids.",
-        rule=lambda at: (at.atomic_nr in [21, 39]
-                         or at.atomic_nr in list(range(57, 72)))
+        rule=lambda at: (at.atomic_nr in (21, 39)
+                         or at.atomic_nr in range(57, 72))
     ),
     LabelDefinition(
         name="Lanthanoid",
         description="f-block elements with partially filled 4f orbital. "
                     "Chemically similar to lanthanum. The term lanthanoid "
                     "is preferred to 'lanthanide'.",
-        rule=lambda at: at.atomic_nr in list(range(57, 72))
+        rule=lambda at: at.atomic_nr in range(57, 72)
     ),
     LabelDefinition(
         name="Actinoid",
         description="f-block elements with partially filled 5f orbital. "
                     "Chemically similar to actinium. The term actinoid "
                     "is preferred to 'actinide'.",
-        rule=lambda at: at.atomic_nr in list(range(89, 104))
+        rule=lambda at: at.atomic_nr in range(89, 104)
     ),
     LabelDefinition(
         name="Alkali Metal",
@@ -1,14 +1,15 @@
-from contextlib import nullcontext
 import logging
 
 from sqlalchemy import (
-    Engine, MetaData, Connection, insert, select, bindparam, update,
+    Engine, MetaData, Connection, insert, select, bindparam, update, delete,
 )
 
 from ..db_builder import PeriodicTableDBBuilder
+from ..refresh import ChangeSummary, diff_rows
+from ..shared import Element
 from ...shared import (
     ATOMIC_NR, E_SHELL_STRUCT, E_SUB_SHELL_STRUCT, PERIOD, GROUP, BLOCK,
-    BLOCK_ID, LABEL, LABEL_ID
+    BLOCK_ID, ION_CHARGE, ION_ID, LABEL, LABEL_ID
 )
 from .data import (
     groups as group_values, blocks as block_values, label_values
@@ -17,6 +18,7 @@ from .schema import (
     period_table, group_table, block_table, label_table, label_to_element_table
 )
 from .data import Atom
+from .features import add_labels, get_electronic_structure
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +37,7 @@ class ExtendedPeriodicTableDBBuilder(PeriodicTableDBBuilder):
         )
 
     def _add_groups_blocks(self, conn: Connection = None):
-        with (nullcontext(conn) if conn else self.connect()) as conn:
+        with self._connection(conn) as conn:
             logger.info(
                 f"Adding group numbers, names and labels to {self.group.name} "
                 "table."
@@ -53,7 +55,7 @@ class ExtendedPeriodicTableDBBuilder(PeriodicTableDBBuilder):
             )
             conn.execute(insert(self.label), label_values)
 
-            conn.commit()
+            self._commit(conn)
 
     def add_electronic_structure_data(
             self, atom_orbitals: Atom | list[Atom],
@@ -65,7 +67,7 @@ class ExtendedPeriodicTableDBBuilder(PeriodicTableDBBuilder):
             at.dict() for at in atom_orbitals
         ]
 
-        with (nullcontext(conn) if conn else self.connect()) as conn:
+        with self._connection(conn) as conn:
             # Update entries in the Element table
             elem_values = [
                 {
@@ -133,4 +135,187 @@ class ExtendedPeriodicTableDBBuilder(PeriodicTableDBBuilder):
                 conn.execute(label_maker_stmt, labels)
 
             # Element and Ion table statements worked, so commit the changes
-            conn.commit()
+            self._commit(conn)
+
+    def add_ion_electronic_structure_data(self, conn: Connection = None):
+        """
+        Fill the shell and sub-shell structures of every ion in the Ion
+        table, with configurations derived from the neutral atoms (see
+        Atom.for_ion). Ions without electrons are left empty.
+        """
+        with self._connection(conn) as conn:
+            ions = conn.execute(
+                select(
+                    self.ion.c[ION_ID], self.ion.c[ATOMIC_NR],
+                    self.ion.c[ION_CHARGE]
+                )
+            ).all()
+
+            ion_values = []
+            for ion_id, atomic_nr, charge in ions:
+                if charge >= atomic_nr:
+                    continue
+                config = Atom.for_ion(atomic_nr, charge)
+                ion_values.append({
+                    # Different name to the column to avoid collision with
+                    # bindparameter
+                    "ion_id": ion_id,
+                    E_SHELL_STRUCT: config.shell_structure,
+                    E_SUB_SHELL_STRUCT: config.sub_shell_structure
+                })
+
+            if ion_values:
+                ions_update_stmt = (
+                    update(self.ion)
+                    .where(self.ion.c[ION_ID] == bindparam("ion_id"))
+                )
+                logger.info(f"Updating {len(ion_values)} entries in "
+                            f"{self.ion.name} table with electronic "
+                            "configuration.")
+                conn.execute(ions_update_stmt, ion_values)
+            self._commit(conn)
+
+    def _refresh_elements(
+            self, elements: list[Element], summary: ChangeSummary,
+            conn: Connection
+    ):
+        super()._refresh_elements(elements, summary, conn)
+
+        atoms = get_electronic_structure(elements)
+        add_labels(atoms)
+
+        # Period, group and block of the elements
+        block_ids = dict(conn.execute(
+            select(self.block.c[BLOCK], self.block.c[BLOCK_ID])
+        ).all())
+        existing_elements = {
+            atomic_nr: {PERIOD: period, GROUP: group, "block_id": block_id}
+            for atomic_nr, period, group, block_id in conn.execute(
+                select(
+                    self.element.c[ATOMIC_NR], self.element.c[PERIOD],
+                    self.element.c[GROUP], self.element.c.block_id
+                )
+            )
+        }
+        fresh_elements = {}
+        for atom in atoms:
+            config = atom.dict()
+            fresh_elements[atom.atomic_nr] = {
+                PERIOD: config[PERIOD],
+                GROUP: config[GROUP],
+                "block_id": block_ids.get(config[BLOCK])
+            }
+        _, updates, _ = diff_rows(existing_elements, fresh_elements)
+        if updates:
+            conn.execute(
+                update(self.element)
+                .where(self.element.c[ATOMIC_NR] == bindparam("atomic_nr")),
+                [
+                    {"atomic_nr": key, **fresh_elements[key]}
+                    for key in updates
+                ]
+            )
+        summary.record(self.element.name, updated=updates)
+
+        # Electronic structures of all ions (including those added with
+        # add_ions), as by add_ion_electronic_structure_data
+        existing_ions = {}
+        fresh_ions = {}
+        for ion_id, atomic_nr, charge, shells, sub_shells in conn.execute(
+            select(
+                self.ion.c[ION_ID], self.ion.c[ATOMIC_NR],
+                self.ion.c[ION_CHARGE], self.ion.c[E_SHELL_STRUCT],
+                self.ion.c[E_SUB_SHELL_STRUCT]
+            )
+        ):
+            if charge >= atomic_nr:
+                continue
+            existing_ions[ion_id] = {
+                E_SHELL_STRUCT: shells, E_SUB_SHELL_STRUCT: sub_shells
+            }
+            config = Atom.for_ion(atomic_nr, charge)
+            fresh_ions[ion_id] = {
+                E_SHELL_STRUCT: config.shell_structure,
+                E_SUB_SHELL_STRUCT: config.sub_shell_structure
+            }
+        _, updates, _ = diff_rows(existing_ions, fresh_ions)
+        if updates:
+            conn.execute(
+                update(self.ion)
+                .where(self.ion.c[ION_ID] == bindparam("ion_id")),
+                [{"ion_id": key, **fresh_ions[key]} for key in updates]
+            )
+        summary.record(self.ion.name, updated=updates)
+
+        # Labels of the elements
+        label_ids = dict(conn.execute(
+            select(self.label.c[LABEL], self.label.c[LABEL_ID])
+        ).all())
+        new_labels = [
+            values for values in label_values
+            if values[LABEL] not in label_ids
+        ]
+        if new_labels:
+            next_id = self._next_id(self.label.c[LABEL_ID], conn)
+            for label_id, values in enumerate(new_labels, start=next_id):
+                label_ids[values[LABEL]] = label_id
+            conn.execute(insert(self.label), [
+                {LABEL_ID: label_ids[values[LABEL]], **values}
+                for values in new_labels
+            ])
+            summary.record(
+                self.label.name,
+                inserted=[values[LABEL] for values in new_labels]
+            )
+
+        existing_labels = set(map(tuple, conn.execute(select(
+            self.label_element.c[LABEL_ID], self.label_element.c[ATOMIC_NR]
+        ))))
+        fresh_labels = {
+            (label_ids[lab], atom.atomic_nr)
+            for atom in atoms for lab in atom.labels
+        }
+        inserts = fresh_labels - existing_labels
+        deletes = existing_labels - fresh_labels
+        if inserts:
+            conn.execute(insert(self.label_element), [
+                {LABEL_ID: label_id, ATOMIC_NR: atomic_nr}
+                for label_id, atomic_nr in inserts
+            ])
+        if deletes:
+            conn.execute(
+                delete(self.label_element)
+                .where(
+                    self.label_element.c[LABEL_ID] == bindparam("label_id"),
+                    self.label_element.c[ATOMIC_NR] == bindparam("atomic_nr")
+                ),
+                [
+                    {"label_id": label_id, "atomic_nr": atomic_nr}
+                    for label_id, atomic_nr in deletes
+                ]
+            )
+        summary.record(
+            self.label_element.name, inserted=inserts, deleted=deletes
+        )
+
+    def _delete_elements(
+            self, atomic_nrs: list[int], summary: ChangeSummary,
+            conn: Connection
+    ):
+        """
+        Delete elements, together with all of their ions and labels.
+        """
+        label_rows = conn.execute(
+            select(
+                self.label_element.c[LABEL_ID],
+                self.label_element.c[ATOMIC_NR]
+            ).where(self.label_element.c[ATOMIC_NR].in_(atomic_nrs))
+        ).all()
+        conn.execute(
+            delete(self.label_element)
+            .where(self.label_element.c[ATOMIC_NR].in_(atomic_nrs))
+        )
+        summary.record(
+            self.label_element.name, deleted=map(tuple, label_rows)
+        )
+        super()._delete_elements(atomic_nrs, summary, conn)
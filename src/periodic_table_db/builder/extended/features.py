@@ -1,5 +1,7 @@
+from collections.abc import Iterable
+
 from ..shared import Element
-from .data import Atom, label_rules
+from .data import Atom, AtomConfiguration, label_rules
 
 
 def get_electronic_structure(elements: list[Element]):
@@ -12,13 +14,117 @@ def get_electronic_structure(elements: list[Element]):
     ]
 
 
-def add_labels(atoms: list[Atom]):
+class LabelIndex:
+
+    def __init__(self, atoms: Iterable[Atom | AtomConfiguration]) -> None:
+        """
+        Index of the labels (see label_rules), periods, groups and blocks of
+        a set of atoms, built by evaluating each label rule once per atom.
+
+        Each label (period, group or block) is held as a bitset over atomic
+        numbers: an int with bit Z set if the element with atomic number Z
+        has the label. Bitsets can be combined with the usual operators, e.g.
+        index.label("Transition Element") & index.period(4), and converted
+        back to atomic numbers with atomic_nrs(). ~ gives a negative int
+        (with every higher bit set), so use complement() instead; all is the
+        bitset of every indexed element.
+        """
+        self.all = 0
+        self._labels: dict[str, int] = dict.fromkeys(label_rules, 0)
+        self._periods: dict[int, int] = {}
+        self._groups: dict[int, int] = {}
+        self._blocks: dict[str, int] = {}
+        self._labels_of: dict[int, tuple[str, ...]] = {}
+
+        for atom in atoms:
+            bit = 1 << atom.atomic_nr
+            self.all |= bit
+            labels = tuple(
+                label for label, rule in label_rules.items() if rule(atom)
+            )
+            for label in labels:
+                self._labels[label] |= bit
+            self._labels_of[atom.atomic_nr] = labels
+
+            for bitsets, key in (
+                    (self._periods, atom.period),
+                    (self._groups, atom.group),
+                    (self._blocks, atom.block)
+            ):
+                if key is not None:
+                    bitsets[key] = bitsets.get(key, 0) | bit
+
+    def label(self, name: str) -> int:
+        """
+        Bitset of the elements with the named label.
+        """
+        return self._labels[name]
+
+    def period(self, number: int) -> int:
+        """
+        Bitset of the elements in a period.
+        """
+        return self._periods.get(number, 0)
+
+    def group(self, number: int) -> int:
+        """
+        Bitset of the elements in a group.
+        """
+        return self._groups.get(number, 0)
+
+    def block(self, name: str) -> int:
+        """
+        Bitset of the elements in a block ("s", "p", "d" or "f").
+        """
+        return self._blocks.get(name, 0)
+
+    def labels_of(self, atomic_nr: int) -> tuple[str, ...]:
+        """
+        Labels of the element with the given atomic number.
+        """
+        return self._labels_of.get(atomic_nr, ())
+
+    def complement(self, bitset: int) -> int:
+        """
+        Bitset of the indexed elements which are not in bitset.
+        """
+        return self.all & ~bitset
+
+    @staticmethod
+    def atomic_nrs(bitset: int) -> list[int]:
+        """
+        Atomic numbers (in ascending order) of the elements in a bitset.
+        Raises ValueError for a negative bitset (e.g. made with ~; see
+        complement()).
+        """
+        if bitset < 0:
+            raise ValueError(
+                "Bitset must not be negative; use complement() rather than ~."
+            )
+        atomic_nrs = []
+        while bitset:
+            lowest = bitset & -bitset
+            atomic_nrs.append(lowest.bit_length() - 1)
+            bitset ^= lowest
+        return atomic_nrs
+
+    def elements_with(self, *labels: str) -> list[int]:
+        """
+        Atomic numbers of the elements which have all of the given labels.
+        """
+        bitset = ~0
+        for label in labels:
+            bitset &= self._labels[label]
+        return self.atomic_nrs(bitset) if labels else []
+
+
+def add_labels(atoms: list[Atom]) -> LabelIndex:
     """
     Adds labels to atoms based on the rules in label_rules.
     Labels are derived from properties of the electronic configurations
-    (e.g. group) or atomic number.
+    (e.g. group) or atomic number. The LabelIndex used is returned.
     """
+    index = LabelIndex(atoms)
     for atom in atoms:
-        for label in label_rules:
-            if label_rules[label](atom):
-                atom.labels.append(label)
+        atom.labels.extend(index.labels_of(atom.atomic_nr))
+    return index
@@ -39,7 +39,7 @@ def label_table(metadata_obj: MetaData, prefix="", **kwargs) -> Table:
         f"{prefix}{TABLE_NAMES_EXTENDED[3]}",
         metadata_obj,
         Column(LABEL_ID, Integer, primary_key=True),
-        Column(LABEL, String, nullable=False),
+        Column(LABEL, String, nullable=False, index=True),
         Column("description", String, nullable=True)
     )
 
@@ -52,8 +52,10 @@ def label_to_element_table(metadata_obj: MetaData, prefix="") -> Table:
             LABEL_ID, Integer, ForeignKey(f"Label.{LABEL_ID}"),
             primary_key=True
         ),
+        # The primary key index is ordered by label, so the labels of an
+        # element need their own index
         Column(
             ATOMIC_NR, Integer, ForeignKey(f"Element.{ATOMIC_NR}"),
-            primary_key=True
+            primary_key=True, index=True
         ),
     )
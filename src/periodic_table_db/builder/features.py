@@ -1,4 +1,8 @@
+from collections.abc import Iterable, Iterator
+import codecs
 from dataclasses import dataclass
+from html.parser import HTMLParser
+from itertools import chain
 import logging
 import math
 import re
@@ -27,6 +31,23 @@ class RawElement:
     atomic_weight_tabulated: list[str]
 
 
+def _raw_element(cells: list[str]) -> RawElement:
+    """
+    RawElement from the text of the cells of one row of the table.
+    """
+    tabulated_weights = list(
+        cells[3].replace("\xa0", "")  # Remove &nbsp;s
+        .replace(" ", "")
+        .strip("[").strip("]").split(",")
+    )
+    return RawElement(
+        atomic_nr=int(cells[0]),
+        symbol=cells[1],
+        name=cells[2].capitalize(),
+        atomic_weight_tabulated=tabulated_weights
+    )
+
+
 def get_elements_from_html(resp: requests.Response) -> list[RawElement]:
     """
     Returns list of elements with string properties from supplied html reponse.
@@ -40,110 +61,201 @@ def get_elements_from_html(resp: requests.Response) -> list[RawElement]:
         vals: ResultSet[Tag] = elem.find_all("td")
         if len(vals) == 0:
             continue
-        tabulated_weights = list(
-            vals[3].text.replace("\xa0", "")  # Remove &nbsp;s
-            .replace(" ", "")
-            .strip("[").strip("]").split(",")
-        )
-        raw_elements.append(RawElement(
-            atomic_nr=int(vals[0].text),
-            symbol=vals[1].text,
-            name=vals[2].text.capitalize(),
-            atomic_weight_tabulated=tabulated_weights
-        ))
+        raw_elements.append(_raw_element([val.text for val in vals]))
 
     return raw_elements
 
 
-def parse_elements_text(raw_elements: list[RawElement]) -> list[Element]:
-    """
-    Returns a list of elements with properties with types as required for
-    database entries.
-    """
+class ElementRowParser(HTMLParser):
 
-    def get_precision(number: str):
+    def __init__(self) -> None:
         """
-        Returns the number of digits after the decimal place for a string
-        representing a number.
+        Event-driven parser of the body of the first table of the CIAAW
+        page, as read by get_elements_from_html.
+
+        HTML may be fed in chunks; each row is converted to a RawElement as
+        soon as it is closed and is collected in raw_elements, until taken
+        with pop_raw_elements(). Rows without any td cells are skipped.
+        close() raises RuntimeError if no table, or no element rows, were
+        found.
         """
-        return len(number.split(".")[1])
+        super().__init__(convert_charrefs=True)
+        self.raw_elements: list[RawElement] = []
+        self.rows_read = 0
+        self._tables_seen = 0
+        self._in_tbody = False
+        self._cells: list[str] | None = None
+        self._cell: list[str] | None = None
 
-    # regex to differentiate one and no weight
-    one_weight_regex = re.compile(r"(\d*\.\d*)\((\d\d?)\)")
+    def _close_cell(self):
+        if self._cell is not None:
+            self._cells.append("".join(self._cell))
+            self._cell = None
 
-    # Define a constant for the case where no weight is given
-    NO_WEIGHT = AtomicWeight(
-                    weight=None, weight_esd=None, weight_min=None,
-                    weight_max=None, weight_type=WEIGHT_TYPE_NONE
-                )
+    def _close_row(self):
+        self._close_cell()
+        if self._cells:
+            self.raw_elements.append(_raw_element(self._cells))
+            self.rows_read += 1
+        self._cells = None
+
+    def handle_starttag(self, tag: str, attrs):
+        if tag == "table":
+            self._tables_seen += 1
+        elif self._tables_seen != 1:
+            return
+        elif tag == "tbody":
+            self._in_tbody = True
+        elif not self._in_tbody:
+            return
+        elif tag == "tr":
+            # End tags of rows and cells may be omitted
+            self._close_row()
+            self._cells = []
+        elif tag == "td" and self._cells is not None:
+            self._close_cell()
+            self._cell = []
+
+    def handle_endtag(self, tag: str):
+        if not self._in_tbody:
+            return
+        if tag == "td":
+            self._close_cell()
+        elif tag == "tr":
+            self._close_row()
+        elif tag in ("tbody", "table"):
+            self._close_row()
+            self._in_tbody = False
+
+    def handle_data(self, data: str):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def close(self):
+        super().close()
+        if not self._tables_seen:
+            raise RuntimeError("No element table found in the html.")
+        if not self.rows_read:
+            raise RuntimeError("No element rows found in the html table.")
+
+    def pop_raw_elements(self) -> list[RawElement]:
+        """
+        Remove and return the elements of the rows closed so far.
+        """
+        raw_elements, self.raw_elements = self.raw_elements, []
+        return raw_elements
+
+
+def iter_elements_from_html(html_chunks: Iterable[str]) -> Iterator[Element]:
+    """
+    Yields parsed elements from the CIAAW table, given as an iterable of
+    chunks of html, as soon as the row of each element has been read.
+    Raises RuntimeError if the html contains no table of elements.
+    """
+    parser = ElementRowParser()
+    for chunk in html_chunks:
+        parser.feed(chunk)
+        for raw in parser.pop_raw_elements():
+            yield parse_element_row(raw)
+    parser.close()
+    for raw in parser.pop_raw_elements():
+        yield parse_element_row(raw)
+
+
+# regex to differentiate one and no weight
+one_weight_regex = re.compile(r"(\d*\.\d*)\((\d\d?)\)")
+
+# Define a constant for the case where no weight is given
+NO_WEIGHT = AtomicWeight(
+                weight=None, weight_esd=None, weight_min=None,
+                weight_max=None, weight_type=WEIGHT_TYPE_NONE
+            )
+
+
+def get_precision(number: str):
+    """
+    Returns the number of digits after the decimal place for a string
+    representing a number.
+    """
+    return len(number.split(".")[1])
 
-    logger.info("Processing scraped text to element properties.")
-    elements = []
-    for raw in raw_elements:
 
-        if len(raw.atomic_weight_tabulated) == 2:
-            # Atomic weight quoted as an interval - we find the midpoint
-            weight_interval = list(map(float, raw.atomic_weight_tabulated))
-            weight_min = min(weight_interval)
-            weight_max = max(weight_interval)
-            prec = get_precision(raw.atomic_weight_tabulated[0])
-            esd = round((weight_max - weight_min) / 2, prec)
+def parse_element_row(raw: RawElement) -> Element:
+    """
+    Returns an element with properties with types as required for database
+    entries.
+    """
+    if len(raw.atomic_weight_tabulated) == 2:
+        # Atomic weight quoted as an interval - we find the midpoint
+        weight_interval = list(map(float, raw.atomic_weight_tabulated))
+        weight_min = min(weight_interval)
+        weight_max = max(weight_interval)
+        prec = get_precision(raw.atomic_weight_tabulated[0])
+        esd = round((weight_max - weight_min) / 2, prec)
+
+        at_weight = AtomicWeight(
+            weight=round(weight_max - esd, prec),
+            weight_esd=esd,
+            weight_min=weight_min,
+            weight_max=weight_max,
+            weight_type=WEIGHT_TYPE_INTERVAL
+        )
+        logger.debug(f"Element '{raw.symbol}' atomic weight quoted as "
+                     f"'{WEIGHT_TYPE_INTERVAL}' type. Weight calculated.")
+
+    elif len(raw.atomic_weight_tabulated) == 1:
+        # Atomic weight quoted either as a best value or none
+        # Use regex to decide:
+        mtch = one_weight_regex.search(raw.atomic_weight_tabulated[0])
+
+        # N.B. next line: em-dash, not a hyphen!
+        if not mtch and raw.atomic_weight_tabulated[0] == "—":
+            at_weight = NO_WEIGHT
+            logger.debug(f"Element '{raw.symbol}' atomic weight is "
+                         f"'{WEIGHT_TYPE_NONE}' type. Assigned to 'None' "
+                         "weight.")
+
+        else:
+            weight = float(mtch.group(1))
+            prec = get_precision(mtch.group(1))
+            esd = round(float(mtch.group(2)) * math.pow(10, -prec), prec)
 
             at_weight = AtomicWeight(
-                weight=round(weight_max - esd, prec),
+                weight=weight,
                 weight_esd=esd,
-                weight_min=weight_min,
-                weight_max=weight_max,
-                weight_type=WEIGHT_TYPE_INTERVAL
+                weight_min=round(weight - esd, prec),
+                weight_max=round(weight + esd, prec),
+                weight_type=WEIGHT_TYPE_REPORTED
             )
-            logger.debug(f"Element '{raw.symbol}' atomic weight quoted as "
-                         f"'{WEIGHT_TYPE_INTERVAL}' type. Weight calculated.")
-
-        elif len(raw.atomic_weight_tabulated) == 1:
-            # Atomic weight quoted either as a best value or none
-            # Use regex to decide:
-            mtch = one_weight_regex.search(raw.atomic_weight_tabulated[0])
-
-            # N.B. next line: em-dash, not a hyphen!
-            if not mtch and raw.atomic_weight_tabulated[0] == "—":
-                at_weight = NO_WEIGHT
-                logger.debug(f"Element '{raw.symbol}' atomic weight is "
-                             f"'{WEIGHT_TYPE_NONE}' type. Assigned to 'None' "
-                             "weight.")
-
-            else:
-                weight = float(mtch.group(1))
-                prec = get_precision(mtch.group(1))
-                esd = round(float(mtch.group(2)) * math.pow(10, -prec), prec)
-
-                at_weight = AtomicWeight(
-                    weight=weight,
-                    weight_esd=esd,
-                    weight_min=round(weight - esd, prec),
-                    weight_max=round(weight + esd, prec),
-                    weight_type=WEIGHT_TYPE_REPORTED
-                )
-                logger.debug(f"Element '{raw.symbol}' atomic weight is "
-                             f"'{WEIGHT_TYPE_REPORTED}' type. Weight min and "
-                             "max calculated.")
-
-        elements.append(Element(
-            atomic_number=raw.atomic_nr,
-            symbol=raw.symbol,
-            name=raw.name,
-            weight=at_weight
-        ))
-
-    return elements
+            logger.debug(f"Element '{raw.symbol}' atomic weight is "
+                         f"'{WEIGHT_TYPE_REPORTED}' type. Weight min and "
+                         "max calculated.")
 
+    return Element(
+        atomic_number=raw.atomic_nr,
+        symbol=raw.symbol,
+        name=raw.name,
+        weight=at_weight
+    )
 
-def get_elements(
+
+def parse_elements_text(raw_elements: list[RawElement]) -> list[Element]:
+    """
+    Returns a list of elements with properties with types as required for
+    database entries.
+    """
+    logger.info("Processing scraped text to element properties.")
+    return [parse_element_row(raw) for raw in raw_elements]
+
+
+def iter_elements(
         url: str = PERIODIC_TABLE_URL,
-        adapter_cfg: tuple[str, requests.adapters.BaseAdapter] | None = None
-) -> list[Element]:
+        adapter_cfg: tuple[str, requests.adapters.BaseAdapter] | None = None,
+        chunk_size: int = 16384
+) -> Iterator[Element]:
     """
-    Entry point for parsing PERIODIC_TABLE_URL website and table therein.
-    Returns parsed list of elements.
+    Streams the PERIODIC_TABLE_URL website, yielding each element of the
+    table therein as soon as its row has been downloaded and parsed.
     """
     # with-statement ensures session is closed as the end, making sure we avoid
     # leaving open sockets. See comment in `requests.api.request()` for more
@@ -152,7 +264,31 @@ def get_elements(
         if adapter_cfg:
             session.mount(*adapter_cfg)
         logger.info(f"Getting URL: {url}")
-        html = session.get(url)
+        with session.get(url, stream=True) as resp:
+            resp.raise_for_status()
+            # The CIAAW page is UTF-8, but does not always say so in its
+            # headers
+            decoder = codecs.getincrementaldecoder(
+                resp.encoding or "utf-8"
+            )(errors="replace")
+            html_chunks = chain(
+                (
+                    decoder.decode(chunk)
+                    for chunk in resp.iter_content(chunk_size)
+                ),
+                # Flush any incomplete character left in the decoder
+                (decoder.decode(b"", final=True), )
+            )
+            logger.info("Processing element rows.")
+            yield from iter_elements_from_html(html_chunks)
 
-    raw_elements = get_elements_from_html(html)
-    return parse_elements_text(raw_elements)
+
+def get_elements(
+        url: str = PERIODIC_TABLE_URL,
+        adapter_cfg: tuple[str, requests.adapters.BaseAdapter] | None = None
+) -> list[Element]:
+    """
+    Entry point for parsing PERIODIC_TABLE_URL website and table therein.
+    Returns parsed list of elements.
+    """
+    return list(iter_elements(url, adapter_cfg))
@@ -3,11 +3,18 @@ import logging
 from pathlib import Path
 import sys
 
-from sqlalchemy import MetaData, Engine, create_engine
+from sqlalchemy import MetaData, Engine, inspect
 
 # Absolute imports here so that debugging can be run
+from periodic_table_db.dbconnector import create_db_engine, POOL_STATIC
+from periodic_table_db.shared import TABLE_NAMES_EXTENDED
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.dbapi.ingest import IngestReport, read_csv_column
 from periodic_table_db.builder import PeriodicTableDBBuilder
+from periodic_table_db.builder.data import PERIODIC_TABLE_URL
 from periodic_table_db.builder.features import get_elements
+from periodic_table_db.builder.http_cache import CachingAdapter
+from periodic_table_db.builder.refresh import ChangeSummary
 from periodic_table_db.builder.extended import (
     ExtendedPeriodicTableDBBuilder
 )
@@ -31,8 +38,9 @@ def get_db_url(db_path: Path | None, interactive: bool):
                     print("Cancelled.")
                     sys.exit(0)
             logger.warning(f"Deleting existing file at {db_path}")
+            db_path.unlink()
 
-            db_url = f"sqlite:///{db_path}"
+        db_url = f"sqlite:///{db_path}"
     else:
         db_url = "sqlite:///:memory:"
 
@@ -68,11 +76,66 @@ def generate_db(
         extended: bool = True, **kwargs: dict
 ):
     db_url = get_db_url(db_path, interactive)
-    engine = create_engine(db_url)
+    # An in-memory database only exists as long as its connection, so all
+    # users must share one
+    engine = create_db_engine(
+        db_url, pooling=None if db_path else POOL_STATIC
+    )
     metadata_obj = MetaData()
     return construct_db(engine, metadata_obj, extended, **kwargs)
 
 
+def update_db(
+        db_path: Path, extended: bool | None = None,
+        allow_deletes: bool = False, **kwargs: dict
+) -> ChangeSummary:
+    """
+    Update an existing database in place from the CIAAW website, rather
+    than deleting and rebuilding it. Only rows which have changed are
+    written, in a single transaction, so readers of the database never see
+    it missing or partly built. Ions added to the database are kept.
+
+    Whether the database is extended is detected from its tables; a
+    RuntimeError is raised if extended is given and does not match. See
+    refresh_elements for allow_deletes.
+    """
+    engine = create_db_engine(f"sqlite:///{db_path.resolve()}")
+    is_extended = inspect(engine).has_table(TABLE_NAMES_EXTENDED[-1])
+    if extended is not None and extended != is_extended:
+        raise RuntimeError(
+            f"Database at {db_path} is "
+            f"{'' if is_extended else 'not '}an extended database."
+        )
+    pt_db = (
+        ExtendedPeriodicTableDBBuilder(engine, MetaData()) if is_extended
+        else PeriodicTableDBBuilder(engine, MetaData())
+    )
+    return pt_db.refresh_elements(
+        get_elements(**kwargs), allow_deletes=allow_deletes
+    )
+
+
+def ingest_ions(
+        db_path: Path, csv_path: Path, column: int | str = 0,
+        chunk_size: int = 1000, extended: bool = False
+) -> IngestReport:
+    """
+    Add ions to an existing database from a column of ion symbols in a CSV
+    file. For an extended database, the electronic structures of the ions
+    are then filled in.
+    """
+    engine = create_db_engine(f"sqlite:///{db_path.resolve()}")
+    pt_dbapi = PeriodicTableDBAPI(engine, MetaData(), cache_size=256)
+    report = pt_dbapi.ingest_ion_symbols(
+        read_csv_column(csv_path, column), chunk_size=chunk_size
+    )
+    if extended:
+        ExtendedPeriodicTableDBBuilder(
+            engine, MetaData()
+        ).add_ion_electronic_structure_data()
+    return report
+
+
 def main(interactive=True):
     logging.basicConfig(level=logging.INFO)
     kwargs = {}
@@ -92,6 +155,55 @@ def main(interactive=True):
             "--extended", action="store_true",
             help="Enable extended database features."
         )
+        parser.add_argument(
+            "--update", action="store_true",
+            help="Update an existing database in --db-path in place, only "
+                 "changing the rows which differ, instead of deleting and "
+                 "rebuilding it. The database is extended if its tables "
+                 "are."
+        )
+        parser.add_argument(
+            "--allow-deletes", action="store_true",
+            help="With --update, delete elements which are no longer in the "
+                 "CIAAW table, even if they are outside its range of atomic "
+                 "numbers."
+        )
+        parser.add_argument(
+            "--cache-dir", type=Path,
+            help="Directory in which to cache the downloaded CIAAW atomic "
+                 "weights page. Later runs only download it again if it has "
+                 "changed."
+        )
+        parser.add_argument(
+            "--cache-ttl", type=float, default=0,
+            help="Age (in seconds) below which the cached page is used "
+                 "without checking whether it has changed (default: 0)."
+        )
+        parser.add_argument(
+            "--offline", action="store_true",
+            help="Only use the cached page; never connect to the CIAAW "
+                 "website. Requires --cache-dir."
+        )
+
+        subparsers = parser.add_subparsers(dest="command")
+        ingest_parser = subparsers.add_parser(
+            "ingest-ions",
+            help="Add ions from a CSV file of ion symbols to the existing "
+                 "database in --db-path."
+        )
+        ingest_parser.add_argument(
+            "csv_path", type=Path,
+            help="CSV file containing ion symbols."
+        )
+        ingest_parser.add_argument(
+            "--column", default="0",
+            help="Index, or name in the header row, of the column containing "
+                 "the ion symbols (default: 0)."
+        )
+        ingest_parser.add_argument(
+            "--chunk-size", type=int, default=1000,
+            help="Number of ions added per transaction (default: 1000)."
+        )
 
         args = parser.parse_args()
 
@@ -107,6 +219,40 @@ def main(interactive=True):
         if args.debug:
             logging.getLogger().setLevel(logging.DEBUG)
 
+        if args.cache_dir:
+            kwargs["adapter_cfg"] = CachingAdapter.adapter_cfg(
+                PERIODIC_TABLE_URL, args.cache_dir, ttl=args.cache_ttl,
+                offline=args.offline
+            )
+        elif args.offline:
+            print("ERROR: --offline requires --cache-dir.\n")
+            sys.exit(1)
+
+        if args.command == "ingest-ions":
+            if not args.db_path or not db_path.exists():
+                print("ERROR: --db-path must be a directory containing a "
+                      "periodic table database.\n")
+                sys.exit(1)
+            column = int(args.column) if args.column.isdigit() else args.column
+            report = ingest_ions(
+                db_path, args.csv_path, column, args.chunk_size,
+                args.extended
+            )
+            sys.exit(1 if report.failed_chunks else 0)
+
+        if args.update:
+            if not args.db_path:
+                print("ERROR: --update requires --db-path.\n")
+                sys.exit(1)
+            if db_path.exists():
+                del kwargs["db_path"]
+                summary = update_db(
+                    db_path, args.extended or None, args.allow_deletes,
+                    **kwargs
+                )
+                print(summary)
+                sys.exit(0)
+
         if args.extended:
             kwargs["extended"] = True
 
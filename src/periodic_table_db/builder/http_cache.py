@@ -0,0 +1,189 @@
+from dataclasses import asdict, dataclass
+import hashlib
+from io import BytesIO
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from urllib.parse import urlsplit
+
+import requests
+import requests.adapters
+from urllib3 import HTTPResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """
+    Metadata of a cached response body: the validators sent back to the
+    server in a conditional request, and the time (seconds since the epoch)
+    at which the body was last fetched or revalidated.
+    """
+    url: str
+    etag: str | None
+    last_modified: str | None
+    content_type: str | None
+    fetched_at: float
+
+
+class CachingAdapter(requests.adapters.HTTPAdapter):
+
+    def __init__(
+            self, cache_dir: Path, ttl: float = 0, offline: bool = False,
+            adapter: requests.adapters.BaseAdapter | None = None
+    ) -> None:
+        """
+        A `requests` transport adapter which keeps the bodies of successful
+        GET responses on disk in cache_dir, keyed by URL, together with
+        their ETag and Last-Modified headers.
+
+        Requests are sent by adapter (by default a plain HTTPAdapter).
+        A cached body younger than ttl seconds is returned without any
+        request being made. Otherwise a conditional request (If-None-Match /
+        If-Modified-Since) is made and the cached body is reused if the
+        server replies 304 Not Modified, or if the server cannot be reached.
+        With offline, the network is never used and requests for URLs which
+        are not cached fail with a requests.ConnectionError.
+
+        Mount the adapter in a session through the adapter_cfg of
+        get_elements, e.g. with CachingAdapter.adapter_cfg(url, cache_dir).
+        """
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.offline = offline
+        self.adapter = adapter if adapter is not None else (
+            requests.adapters.HTTPAdapter()
+        )
+
+    @classmethod
+    def adapter_cfg(
+            cls, url: str, cache_dir: Path, **kwargs
+    ) -> tuple[str, "CachingAdapter"]:
+        """
+        adapter_cfg for get_elements, mounting a new CachingAdapter for the
+        scheme of url. Keyword arguments are passed to the constructor.
+        """
+        return f"{urlsplit(url).scheme}://", cls(cache_dir, **kwargs)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        """
+        Paths of the files holding the metadata and body cached for url.
+        """
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def load(self, url: str) -> tuple[CacheEntry, bytes] | None:
+        """
+        The cache entry and body stored for url, or None if it is not cached.
+        """
+        entry_path, body_path = self._paths(url)
+        try:
+            entry = CacheEntry(**json.loads(entry_path.read_text()))
+            body = body_path.read_bytes()
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry, body
+
+    def store(self, entry: CacheEntry, body: bytes | None = None):
+        """
+        Write the entry (and body, if given) for entry.url to the cache.
+        Files are replaced atomically, so several processes may share a
+        cache_dir.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path, body_path = self._paths(entry.url)
+        if body is not None:
+            self._write(body_path, body)
+        self._write(entry_path, json.dumps(asdict(entry)).encode())
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _cached_response(
+            self, request: requests.PreparedRequest, entry: CacheEntry,
+            body: bytes
+    ) -> requests.Response:
+        headers = {
+            name: value for name, value in (
+                ("ETag", entry.etag),
+                ("Last-Modified", entry.last_modified),
+                ("Content-Type", entry.content_type),
+                ("Content-Length", str(len(body))),
+            ) if value is not None
+        }
+        return self.build_response(request, HTTPResponse(
+            body=BytesIO(body), headers=headers, status=200, reason="OK",
+            preload_content=False, decode_content=False
+        ))
+
+    def send(
+            self, request: requests.PreparedRequest, stream=False,
+            timeout=None, verify=True, cert=None, proxies=None
+    ) -> requests.Response:
+        send_kwargs = dict(
+            stream=stream, timeout=timeout, verify=verify, cert=cert,
+            proxies=proxies
+        )
+        if request.method != "GET":
+            return self.adapter.send(request, **send_kwargs)
+
+        url = request.url
+        cached = self.load(url)
+        if self.offline:
+            if cached is None:
+                raise requests.ConnectionError(
+                    f"{url} is not cached and the cache is offline.",
+                    request=request
+                )
+            logger.info(f"Using cached copy of {url} (offline).")
+            return self._cached_response(request, *cached)
+
+        if cached is not None:
+            entry, body = cached
+            if time.time() - entry.fetched_at < self.ttl:
+                logger.info(f"Using cached copy of {url}.")
+                return self._cached_response(request, entry, body)
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            # The body is read in full so that it can be cached
+            send_kwargs["stream"] = False
+            resp = self.adapter.send(request, **send_kwargs)
+        except requests.ConnectionError:
+            if cached is None:
+                raise
+            logger.warning(f"Cannot fetch {url}; using cached copy.")
+            return self._cached_response(request, *cached)
+
+        if cached is not None and resp.status_code == 304:
+            logger.info(f"{url} not modified; using cached copy.")
+            entry, body = cached
+            entry.fetched_at = time.time()
+            self.store(entry)
+            return self._cached_response(request, entry, body)
+
+        if resp.status_code == 200:
+            headers = resp.headers or {}
+            self.store(CacheEntry(
+                url=url,
+                etag=headers.get("ETag"),
+                last_modified=headers.get("Last-Modified"),
+                content_type=headers.get("Content-Type"),
+                fetched_at=time.time(),
+            ), resp.content)
+        return resp
+
+    def close(self):
+        self.adapter.close()
+        super().close()
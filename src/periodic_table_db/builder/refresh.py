@@ -0,0 +1,66 @@
+from collections.abc import Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TableChanges:
+    """
+    Keys (e.g. atomic numbers or ids) of the rows of one table which were
+    inserted, updated and deleted.
+    """
+    inserted: set[Hashable] = field(default_factory=set)
+    updated: set[Hashable] = field(default_factory=set)
+    deleted: set[Hashable] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+
+@dataclass
+class ChangeSummary:
+    """
+    Summary of the changes made to each table by a refresh of an existing
+    database. Rows which are inserted and then updated during the same
+    refresh are only counted as inserted.
+    """
+    tables: dict[str, TableChanges] = field(default_factory=dict)
+
+    def record(
+            self, table: str, inserted: Iterable[Hashable] = (),
+            updated: Iterable[Hashable] = (), deleted: Iterable[Hashable] = ()
+    ):
+        changes = self.tables.setdefault(table, TableChanges())
+        changes.inserted.update(inserted)
+        changes.updated.update(
+            key for key in updated if key not in changes.inserted
+        )
+        changes.deleted.update(deleted)
+
+    @property
+    def changed(self) -> bool:
+        return any(self.tables.values())
+
+    def __str__(self) -> str:
+        lines = [
+            f"{table}: {len(changes.inserted)} inserted, "
+            f"{len(changes.updated)} updated, {len(changes.deleted)} deleted"
+            for table, changes in self.tables.items() if changes
+        ]
+        return "\n".join(lines) if lines else "No changes."
+
+
+def diff_rows(
+        existing: Mapping[Hashable, dict], fresh: Mapping[Hashable, dict]
+) -> tuple[list[Hashable], list[Hashable], list[Hashable]]:
+    """
+    Compare the rows of a table (keyed by e.g. primary key) with the rows it
+    should contain. Returns the keys of the rows to insert (only in fresh),
+    to update (values differ) and to delete (only in existing).
+    """
+    inserts = [key for key in fresh if key not in existing]
+    updates = [
+        key for key, row in fresh.items()
+        if key in existing and existing[key] != row
+    ]
+    deletes = [key for key in existing if key not in fresh]
+    return inserts, updates, deletes
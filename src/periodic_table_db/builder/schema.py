@@ -21,9 +21,10 @@ def element_table(
 
     if extended:
         extra_cols = [
-            Column(PERIOD, Integer, ForeignKey("Period.number")),
-            Column(GROUP, Integer, ForeignKey("Group.number")),
-            Column("block_id", Integer, ForeignKey("Block.id")),
+            # Indexed for queries of the elements by period, group and block
+            Column(PERIOD, Integer, ForeignKey("Period.number"), index=True),
+            Column(GROUP, Integer, ForeignKey("Group.number"), index=True),
+            Column("block_id", Integer, ForeignKey("Block.id"), index=True),
         ]
         columns.extend(extra_cols)
 
@@ -62,9 +63,13 @@ def ions_table(
 ) -> Table:
     columns = [
         Column(ION_ID, Integer, primary_key=True),
-        Column(ION_SYMBOL, String, nullable=False),
+        # Symbol is unique: it is fully determined by element, charge and
+        # valence state
+        Column(ION_SYMBOL, String, nullable=False, unique=True),
         Column(ION_CHARGE, Integer, nullable=False),
-        Column(ATOMIC_NR, Integer, ForeignKey(f"Element.{ATOMIC_NR}")),
+        Column(
+            ATOMIC_NR, Integer, ForeignKey(f"Element.{ATOMIC_NR}"), index=True
+        ),
         Column("valence_state", Boolean, nullable=False)
     ]
 
@@ -1,5 +1,6 @@
 from .dbapi import PeriodicTableDBAPI
+from .snapshot import SnapshotDBAPI
 
 __all__ = [
-    PeriodicTableDBAPI
+    PeriodicTableDBAPI, SnapshotDBAPI
 ]
@@ -0,0 +1,134 @@
+from contextlib import nullcontext
+import logging
+
+from sqlalchemy import Connection, MetaData, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from ..dbconnector import DBConnector
+from ..shared import (
+    ATOMIC_NR, ELEM_SYMBOL, ION_ID, TABLE_NAMES, TABLE_NAMES_EXTENDED, Ion
+)
+from .dbapi import (
+    ion_rows, lookup_statements, symbol_chunks, unique_symbols,
+    unknown_element_symbols
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPeriodicTableDBAPI:
+
+    def __init__(self, engine: AsyncEngine, tables: dict) -> None:
+        """
+        asyncio version of the PeriodicTableDBAPI, using an SQLAlchemy
+        AsyncEngine (e.g. with the aiosqlite driver:
+        "sqlite+aiosqlite:///<path>").
+
+        Use the create() coroutine to construct an instance. Each method
+        which is not given a connection checks out its own connection from
+        the engine's pool, so several calls may be run concurrently with
+        asyncio.gather().
+
+        The statements and rows are those of PeriodicTableDBAPI; only their
+        execution differs.
+        """
+        self.engine = engine
+        self.tables = tables
+
+        self._atomic_nr_stmt, self._lookup_stmts = lookup_statements(
+            self.tables
+        )
+
+    @classmethod
+    async def create(
+            cls, engine: AsyncEngine, md: MetaData, extended=False, **kwargs
+    ) -> "AsyncPeriodicTableDBAPI":
+        """
+        Reflect the periodic table tables from the database of engine and
+        return a new API instance.
+        """
+        tab_names = list(TABLE_NAMES)
+        if extended:
+            tab_names.extend(TABLE_NAMES_EXTENDED)
+
+        def get_tables(sync_conn: Connection):
+            return DBConnector(
+                engine.sync_engine, md
+            ).get_tables_from_existing(tab_names, conn=sync_conn, **kwargs)
+
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(get_tables)
+
+        return cls(engine, tables)
+
+    def connect(self) -> AsyncConnection:
+        """
+        Calls the internal SQLalchemy AsyncEngine.connect() method.
+        Convenience method.
+        """
+        return self.engine.connect()
+
+    async def get_atomic_nr_for_symbol(
+            self, symbol: str, conn: AsyncConnection = None
+    ) -> int | None:
+        """
+        Get the atomic number of an element from its symbol.
+        """
+        async with (nullcontext(conn) if conn else self.connect()) as conn:
+            atomic_nr_res = await conn.execute(
+                self._atomic_nr_stmt, {ELEM_SYMBOL: symbol}
+            )
+            return atomic_nr_res.scalar_one_or_none()
+
+    async def _lookup_symbols(
+            self, key: str, symbols: str | list[str],
+            conn: AsyncConnection = None
+    ) -> dict[str, int]:
+        """
+        Find the values for a list of symbols with the IN (...) lookup
+        statement for key. Symbols which are not found are omitted.
+        """
+        symbols = unique_symbols(symbols)
+        in_stmt, _ = self._lookup_stmts[key]
+
+        found = {}
+        async with (nullcontext(conn) if conn else self.connect()) as conn:
+            for params in symbol_chunks(symbols):
+                found_res = await conn.execute(in_stmt, params)
+                found.update(found_res.all())
+        return found
+
+    async def get_atomic_nrs_for_symbols(
+            self, symbols: str | list[str], conn: AsyncConnection = None
+    ) -> dict[str, int]:
+        """
+        Get the atomic numbers of several elements from their symbols, with
+        one query per MAX_IN_PARAMETERS symbols. Symbols which are not found
+        are omitted.
+        """
+        return await self._lookup_symbols(ATOMIC_NR, symbols, conn)
+
+    async def add_ions(
+            self, ions: Ion | list[Ion], conn: AsyncConnection = None
+    ):
+        if isinstance(ions, Ion):
+            ions = [ions, ]
+
+        async with (nullcontext(conn) if conn else self.connect()) as conn:
+            unknown_symbols = unknown_element_symbols(ions)
+            atomic_nrs = (
+                await self.get_atomic_nrs_for_symbols(unknown_symbols, conn)
+                if unknown_symbols else {}
+            )
+            ion_values = ion_rows(ions, atomic_nrs)
+
+            logger.info(f"Adding {len(ion_values)} entries to "
+                        f"{self.tables['Ion'].name} table.")
+            await conn.execute(insert(self.tables["Ion"]), ion_values)
+            await conn.commit()
+
+    async def get_ids_for_ion_symbols(
+            self, ion_symbols: str | list[str], conn: AsyncConnection = None
+    ) -> dict[str, int]:
+        return await self._lookup_symbols(ION_ID, ion_symbols, conn)
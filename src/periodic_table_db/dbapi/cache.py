@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LookupCache:
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        A size-bounded mapping of lookup keys (e.g. element or ion symbols) to
+        the values found for them in the database.
+
+        When more than maxsize entries are stored, the least recently used
+        entry is discarded. Hits and misses are counted to allow the
+        effectiveness of the cache to be monitored (see info()).
+        """
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be positive (got {maxsize}).")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for key, or default if key is not cached.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        """
+        Discard all cached entries. Hit and miss counters are retained.
+        """
+        self._data.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
@@ -1,24 +1,158 @@
-from contextlib import nullcontext
+from collections.abc import Iterable, Iterator
 import logging
+import time
 
-from sqlalchemy import Engine, MetaData, Connection, insert, select
+from sqlalchemy import (
+    Column, ColumnElement, Engine, MetaData, Connection, Select, String, Table,
+    bindparam, insert, select,
+)
+from sqlalchemy.exc import SQLAlchemyError
 
 from ..dbconnector import DBConnector
+from .cache import LookupCache, CacheInfo
+from .ingest import IngestReport, chunked
+from .snapshot import SnapshotDBAPI
 
 from ..shared import (
-    ATOMIC_NR, ELEM_SYMBOL, ION_ID, ION_SYMBOL, TABLE_NAMES,
-    TABLE_NAMES_EXTENDED, Ion
+    ATOMIC_NR, BLOCK, BLOCK_ID, ELEM_SYMBOL, GROUP, ION_CHARGE, ION_ID,
+    ION_SYMBOL, LABEL, LABEL_ID, PERIOD, TABLE_NAMES, TABLE_NAMES_EXTENDED,
+    Ion, parse_ion_symbol
 )
 
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of values bound in a single IN (...) clause. SQLite versions
+# before 3.32 limit a statement to 999 bound parameters.
+MAX_IN_PARAMETERS = 999
+
+# Name of the expanding bind parameter holding the symbols of a lookup
+LOOKUP_SYMBOLS = "symbols"
+
+# Temporary (per-connection) table used for very large symbol lookups
+lookup_symbols_table = Table(
+    "pt_lookup_symbols", MetaData(),
+    Column("symbol", String, primary_key=True),
+    prefixes=["TEMPORARY"]
+)
+
+
+def symbol_lookup_statements(
+        symbol_col: ColumnElement, value_col: ColumnElement
+) -> tuple[Select, Select]:
+    """
+    Statements selecting (symbol, value) pairs for a list of symbols:
+    - with an IN (...) clause, using the expanding bind parameter
+      LOOKUP_SYMBOLS, so that the compiled statement is reused for lists of
+      any length.
+    - selecting the symbols held in lookup_symbols_table.
+    """
+    columns = (symbol_col, value_col)
+    return (
+        select(*columns).where(
+            symbol_col.in_(bindparam(LOOKUP_SYMBOLS, expanding=True))
+        ),
+        select(*columns).where(
+            symbol_col.in_(select(lookup_symbols_table.c.symbol))
+        ),
+    )
+
+
+def lookup_statements(
+        tables: dict[str, Table]
+) -> tuple[Select, dict[str, tuple[Select, Select]]]:
+    """
+    Statements for the symbol lookups of the (sync and async) APIs: the
+    select of the atomic number of a single element symbol, and the
+    symbol_lookup_statements for element symbols to atomic numbers
+    (ATOMIC_NR) and for ion symbols to ids (ION_ID).
+    """
+    element = tables["Element"]
+    ion = tables["Ion"]
+    atomic_nr_stmt = (
+        select(element.c[ATOMIC_NR])
+        .where(element.c[ELEM_SYMBOL] == bindparam(ELEM_SYMBOL))
+    )
+    return atomic_nr_stmt, {
+        ATOMIC_NR: symbol_lookup_statements(
+            element.c[ELEM_SYMBOL], element.c[ATOMIC_NR]
+        ),
+        ION_ID: symbol_lookup_statements(ion.c[ION_SYMBOL], ion.c[ION_ID]),
+    }
+
+
+def unique_symbols(symbols: str | Iterable[str]) -> list[str]:
+    """
+    List of symbols (a single symbol may be given as a string) with
+    duplicates removed, preserving order, so that each chunk of a lookup is
+    as full as possible.
+    """
+    if isinstance(symbols, str):
+        symbols = [symbols, ]
+    return list(dict.fromkeys(symbols))
+
+
+def symbol_chunks(symbols: list[str]) -> Iterator[dict[str, list[str]]]:
+    """
+    Parameters of the IN (...) lookup statement for each chunk of up to
+    MAX_IN_PARAMETERS symbols.
+    """
+    for i in range(0, len(symbols), MAX_IN_PARAMETERS):
+        yield {LOOKUP_SYMBOLS: symbols[i:i + MAX_IN_PARAMETERS]}
+
+
+def unknown_element_symbols(ions: list[Ion]) -> list[str]:
+    """
+    Element symbols of the ions whose atomic number is not known.
+    """
+    return [
+        elem_ion.element_symbol for elem_ion in ions
+        if elem_ion.atomic_number is None
+    ]
+
+
+def ion_rows(
+        ions: list[Ion], atomic_nrs: dict[str, int]
+) -> list[dict[str, str | int | bool]]:
+    """
+    Rows for the Ion table for a list of Ions. Missing atomic numbers are
+    filled in from atomic_nrs (element symbol to atomic number).
+    """
+    ion_values = []
+    for elem_ion in ions:
+        if elem_ion.atomic_number is None:
+            atomic_nr = atomic_nrs.get(elem_ion.element_symbol)
+            if atomic_nr is None:
+                raise RuntimeError(
+                    f"Cannot find atomic number for {elem_ion}."
+                )
+            elem_ion.fill_atomic_number(atomic_nr)
+        ion_values.append(elem_ion.to_row())
+    return ion_values
+
 
 class PeriodicTableDBAPI(DBConnector):
 
     def __init__(
-            self, engine: Engine, md: MetaData, extended=False, **kwargs
+            self, engine: Engine, md: MetaData, extended=False,
+            cache_size: int | None = None,
+            temp_table_threshold: int | None = None, **kwargs
     ):
+        """
+        API to query (and add ions to) an existing periodic table database.
+
+        If cache_size is given, the results of symbol lookups (element symbol
+        to atomic number, ion symbol to id) are held in size-bounded caches
+        of that size. The caches are cleared whenever this API writes to the
+        database or a session() is rolled back; clear_cache() should be
+        called if the database is modified by other means.
+
+        Lookups of lists of symbols are made with IN (...) queries of up to
+        MAX_IN_PARAMETERS symbols each. If temp_table_threshold is given,
+        lists longer than this are instead inserted into a temporary table
+        and joined against. (With SQLite, chunked IN (...) queries are
+        usually faster, so this is disabled by default.)
+        """
         super().__init__(engine, md)
 
         tab_names = list(TABLE_NAMES)
@@ -27,60 +161,331 @@ class PeriodicTableDBAPI(DBConnector):
 
         self.tables = self.get_tables_from_existing(tab_names, **kwargs)
 
+        # Statements are built once, so that SQLAlchemy's compiled cache is
+        # always hit
+        self._atomic_nr_stmt, self._lookup_stmts = lookup_statements(
+            self.tables
+        )
+
+        self.temp_table_threshold = temp_table_threshold
+
+        self._caches: dict[str, LookupCache] = {}
+        if cache_size:
+            self._caches = {
+                ATOMIC_NR: LookupCache(cache_size),
+                ION_ID: LookupCache(cache_size),
+            }
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        """
+        Hit/miss statistics of the lookup caches. Empty if caching is
+        disabled.
+        """
+        return {key: cache.info() for key, cache in self._caches.items()}
+
+    def clear_cache(self):
+        """
+        Discard all cached lookup results.
+        """
+        for cache in self._caches.values():
+            cache.clear()
+
+    def _on_rollback(self):
+        # Lookups inside the session may have cached rows which no longer
+        # exist
+        self.clear_cache()
+
+    def _lookup_symbols(
+            self, key: str, symbols: str | list[str], conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Find the values for a list of symbols with the lookup statements
+        (and cache) for key. Symbols which are not found are omitted.
+        """
+        symbols = unique_symbols(symbols)
+
+        found = {}
+        cache = self._caches.get(key)
+        if cache is not None:
+            uncached_symbols = []
+            for symbol in symbols:
+                value = cache.get(symbol)
+                if value is None:
+                    uncached_symbols.append(symbol)
+                else:
+                    found[symbol] = value
+            symbols = uncached_symbols
+
+        if not symbols:
+            return found
+
+        in_stmt, join_stmt = self._lookup_stmts[key]
+        new_found = {}
+        with self._connection(conn) as conn:
+            if (self.temp_table_threshold is not None
+                    and len(symbols) > self.temp_table_threshold):
+                lookup_symbols_table.create(conn, checkfirst=True)
+                try:
+                    conn.execute(
+                        insert(lookup_symbols_table),
+                        [{"symbol": symbol} for symbol in symbols]
+                    )
+                    new_found.update(conn.execute(join_stmt).all())
+                finally:
+                    lookup_symbols_table.drop(conn)
+            else:
+                for params in symbol_chunks(symbols):
+                    new_found.update(conn.execute(in_stmt, params).all())
+
+        if cache is not None:
+            for symbol, value in new_found.items():
+                cache[symbol] = value
+        found.update(new_found)
+        return found
+
+    def snapshot(self, conn: Connection = None) -> SnapshotDBAPI:
+        """
+        Load the contents of the database into an immutable, in-memory
+        SnapshotDBAPI, which answers lookups without querying the database.
+        """
+        with self._connection(conn) as conn:
+            return SnapshotDBAPI(self.tables, conn)
+
     def get_atomic_nr_for_symbol(
             self, symbol: str, conn: Connection = None
     ) -> int | None:
         """
         Get the atomic number of an element from its symbol.
         """
-        atomic_nr_stmt = (
-            select(self.tables["Element"].c[ATOMIC_NR])
-            .where(self.tables["Element"].c[ELEM_SYMBOL] == symbol)
-        )
+        cache = self._caches.get(ATOMIC_NR)
+        if cache is not None:
+            atomic_nr = cache.get(symbol)
+            if atomic_nr is not None:
+                return atomic_nr
+
+        with self._connection(conn) as conn:
+            atomic_nr_res = conn.execute(
+                self._atomic_nr_stmt, {ELEM_SYMBOL: symbol}
+            )
+            atomic_nr = atomic_nr_res.scalar_one_or_none()
+
+        if atomic_nr is not None and cache is not None:
+            cache[symbol] = atomic_nr
+        return atomic_nr
+
+    def get_atomic_nrs_for_symbols(
+            self, symbols: str | list[str], conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the atomic numbers of several elements from their symbols.
 
-        with (nullcontext(conn) if conn else self.connect()) as conn:
-            atomic_nr_res = conn.execute(atomic_nr_stmt)
-            return atomic_nr_res.scalar_one_or_none()
+        Returns a dictionary of symbol to atomic number; symbols which are not
+        found are omitted. The symbols are resolved with one query per
+        MAX_IN_PARAMETERS symbols (or by a join against a temporary table,
+        see temp_table_threshold).
+        """
+        return self._lookup_symbols(ATOMIC_NR, symbols, conn)
+
+    def _ion_values(
+            self, ions: list[Ion], conn: Connection
+    ) -> list[dict[str, str | int | bool]]:
+        """
+        Rows for the Ion table for a list of Ions. Missing atomic numbers are
+        resolved (in one go) from the element symbols.
+        """
+        unknown_symbols = unknown_element_symbols(ions)
+        atomic_nrs = (
+            self.get_atomic_nrs_for_symbols(unknown_symbols, conn)
+            if unknown_symbols else {}
+        )
+        return ion_rows(ions, atomic_nrs)
 
     def add_ions(self, ions: Ion | list[Ion], conn: Connection = None):
         if isinstance(ions, Ion):
             ions = [ions, ]
 
-        with (nullcontext(conn) if conn else self.connect()) as conn:
-            ion_values = []
-            for elem_ion in ions:
-                if elem_ion.atomic_number is None:
-                    at_nr = self.get_atomic_nr_for_symbol(
-                        elem_ion.symbol, conn
-                    )
-                    if at_nr is None:
-                        raise RuntimeError(
-                            f"Cannot find atomic number for {elem_ion}."
-                        )
-                    elem_ion.atomic_number = at_nr
-                ion_values.append(elem_ion.dict())
+        with self._connection(conn) as conn:
+            ion_values = self._ion_values(ions, conn)
 
             if len(ions) == 1:
                 msg = f"Adding entry for '{ions[0].symbol}' to"
             else:
                 msg = f"Adding {len(ion_values)} entries to"
-            logger.info(f"{msg} {self.tables["Ion"].name} table.")
+            logger.info(f"{msg} {self.tables['Ion'].name} table.")
             conn.execute(insert(self.tables["Ion"]), ion_values)
-            conn.commit()
+            self._commit(conn)
+
+        self.clear_cache()
+
+    def ingest_ion_symbols(
+            self, ion_symbols: Iterable[str], chunk_size: int = 1000,
+            conn: Connection = None
+    ) -> IngestReport:
+        """
+        Add ions to the Ion table from a (possibly very long) stream of ion
+        symbols, e.g. from read_csv_column().
+
+        Symbols are read, parsed and inserted chunk_size at a time, so memory
+        use does not depend on the length of the stream. Each chunk is
+        inserted in its own savepoint and committed: if a symbol in a chunk
+        cannot be parsed, its element is not found or the insert fails, only
+        that chunk is rolled back and the failure is recorded in the returned
+        report.
+        """
+        report = IngestReport()
+        ion_table = self.tables["Ion"]
+        start = time.perf_counter()
+
+        with self._connection(conn) as conn:
+            for i, chunk in enumerate(chunked(ion_symbols, chunk_size)):
+                report.chunks += 1
+                try:
+                    with conn.begin_nested():
+                        ions = [
+                            Ion.get(**parse_ion_symbol(symbol))
+                            for symbol in chunk
+                        ]
+                        conn.execute(
+                            insert(ion_table), self._ion_values(ions, conn)
+                        )
+                except (RuntimeError, SQLAlchemyError) as err:
+                    logger.warning(f"Failed to add chunk {i} of ions to "
+                                   f"{ion_table.name} table: {err}")
+                    report.failed_chunks.append((i, str(err)))
+                else:
+                    report.rows_inserted += len(chunk)
+                    logger.debug(f"Added chunk {i} ({len(chunk)} entries) "
+                                 f"to {ion_table.name} table.")
+                self._commit(conn)
+
+        self.clear_cache()
+        report.seconds = time.perf_counter() - start
+        logger.info(f"Added {report.rows_inserted} entries to "
+                    f"{ion_table.name} table ({report.rows_per_second:.0f} "
+                    f"rows/s); {len(report.failed_chunks)} chunks failed.")
+        return report
+
+    def preload_ions(self, conn: Connection = None) -> list[Ion]:
+        """
+        Register every ion of the Ion table (with its atomic number) as the
+        shared instance returned by Ion.get().
+        """
+        element = self.tables["Element"]
+        ion = self.tables["Ion"]
+        ions_stmt = (
+            select(
+                element.c[ELEM_SYMBOL], ion.c[ION_CHARGE],
+                ion.c.valence_state, ion.c[ATOMIC_NR]
+            ).join(element, element.c[ATOMIC_NR] == ion.c[ATOMIC_NR])
+        )
+        with self._connection(conn) as conn:
+            return [
+                Ion.get(*row) for row in conn.execute(ions_stmt)
+            ]
 
     def get_ids_for_ion_symbols(
             self, ion_symbols: str | list[str], conn: Connection = None
     ) -> dict[str, int]:
-        if isinstance(ion_symbols, str):
-            ion_symbols = [ion_symbols, ]
+        """
+        Get the ids of ions from their symbols. Ion symbols which are not
+        found are omitted. See get_atomic_nrs_for_symbols for how large
+        lists of symbols are handled.
+        """
+        return self._lookup_symbols(ION_ID, ion_symbols, conn)
 
-        ion_symbol_ids_stmt = (
-            select(
-                self.tables["Ion"].c[ION_SYMBOL],
-                self.tables["Ion"].c[ION_ID]
-            ).where(self.tables["Ion"].c[ION_SYMBOL].in_(ion_symbols))
-        )
+    def _elements_stmt(
+            self, labels: Iterable[str], group: int | None,
+            period: int | None, block: str | None
+    ) -> Select:
+        """
+        Select of the symbols and atomic numbers of the elements matching
+        all of the criteria of get_elements.
+        """
+        element = self.tables["Element"]
+        element_label = self.tables["ElementLabel"]
+        label = self.tables["Label"]
+        block_table = self.tables["Block"]
+
+        elements_stmt = select(element.c[ELEM_SYMBOL], element.c[ATOMIC_NR])
+        for label_name in labels:
+            elements_stmt = elements_stmt.where(
+                element.c[ATOMIC_NR].in_(
+                    select(element_label.c[ATOMIC_NR])
+                    .join(
+                        label, label.c[LABEL_ID] == element_label.c[LABEL_ID]
+                    )
+                    .where(label.c[LABEL] == label_name)
+                )
+            )
+        if group is not None:
+            elements_stmt = elements_stmt.where(element.c[GROUP] == group)
+        if period is not None:
+            elements_stmt = elements_stmt.where(element.c[PERIOD] == period)
+        if block is not None:
+            elements_stmt = elements_stmt.where(
+                element.c.block_id == (
+                    select(block_table.c[BLOCK_ID])
+                    .where(block_table.c[BLOCK] == block)
+                    .scalar_subquery()
+                )
+            )
+        return elements_stmt.order_by(element.c[ATOMIC_NR])
+
+    def get_elements(
+            self, labels: str | Iterable[str] = (), group: int | None = None,
+            period: int | None = None, block: str | None = None,
+            conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements matching all of
+        the given criteria: having every one of labels, and being in group,
+        period and block. Requires the extended database.
 
-        with (nullcontext(conn) if conn else self.connect()) as conn:
-            ion_symbol_ids_res = conn.execute(ion_symbol_ids_stmt)
-            return dict(ion_symbol_ids_res.t.all())
+        The query is a single select of the Element table, using the
+        indexes on its group, period and block_id columns and on the Label
+        and ElementLabel tables.
+        """
+        if "ElementLabel" not in self.tables:
+            raise RuntimeError(
+                "Querying elements by label, group, period or block requires "
+                "the extended database."
+            )
+        if isinstance(labels, str):
+            labels = [labels, ]
+
+        elements_stmt = self._elements_stmt(labels, group, period, block)
+        with self._connection(conn) as conn:
+            return dict(conn.execute(elements_stmt).all())
+
+    def get_elements_by_label(
+            self, label: str, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements with a label.
+        """
+        return self.get_elements(labels=label, conn=conn)
+
+    def get_elements_in_group(
+            self, group: int, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements in a group.
+        """
+        return self.get_elements(group=group, conn=conn)
+
+    def get_elements_in_period(
+            self, period: int, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements in a period.
+        """
+        return self.get_elements(period=period, conn=conn)
+
+    def get_elements_in_block(
+            self, block: str, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements in a block ("s",
+        "p", "d" or "f").
+        """
+        return self.get_elements(block=block, conn=conn)
@@ -0,0 +1,61 @@
+from collections.abc import Iterable, Iterator
+import csv
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+
+@dataclass
+class IngestReport:
+    """
+    Summary of a streaming ingestion of rows into the database.
+
+    failed_chunks lists the (zero-based) index of each chunk which could not
+    be inserted, together with the reason.
+    """
+    rows_inserted: int = 0
+    chunks: int = 0
+    failed_chunks: list[tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_inserted / self.seconds if self.seconds else 0.0
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """
+    Yield successive lists of up to size items from an iterable, without
+    reading further ahead than the current chunk.
+    """
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive (got {size}).")
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def read_csv_column(
+        csv_path: Path, column: int | str = 0, **fmtparams
+) -> Iterator[str]:
+    """
+    Yield the (stripped, non-empty) values of one column of a CSV file, one
+    row at a time.
+
+    column is either the index of the column, or its name as given in the
+    header row. fmtparams are passed to csv.reader.
+    """
+    with open(csv_path, newline="") as csv_file:
+        reader = csv.reader(csv_file, **fmtparams)
+        if isinstance(column, str):
+            header = next(reader, [])
+            try:
+                column = header.index(column)
+            except ValueError:
+                raise RuntimeError(
+                    f"Column '{column}' not found in {csv_path}"
+                ) from None
+
+        for row in reader:
+            if len(row) > column and (value := row[column].strip()):
+                yield value
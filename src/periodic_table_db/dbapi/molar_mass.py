@@ -0,0 +1,215 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+
+import numpy as np
+from sqlalchemy import Connection, select
+
+from ..dbconnector import DBConnector
+from ..shared import ATOMIC_NR, ELEM_SYMBOL, AT_WEIGHT
+
+# Tokens of a chemical formula: element symbol, count, opening and closing
+# brackets and hydrate separator (e.g. CuSO4·5H2O)
+formula_token_re = re.compile(
+    r"([A-Z][a-z]?)|(\d+(?:\.\d+)?|\.\d+)|([(\[])|([)\]])|([·*])|(\s+)"
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_formula(formula: str) -> tuple[tuple[str, float], ...]:
+    """
+    Memoized implementation of parse_formula. Returns an immutable tuple of
+    (symbol, count) pairs so that the cached value cannot be altered.
+    """
+    # Stack of element counts: one dict per open bracket, plus the formula
+    # part (between hydrate separators) being read
+    stack: list[dict[str, float]] = [{}]
+    parts: list[dict[str, float]] = []
+    part_factor = 1.0
+    # Last element or bracket read, to which a following count applies
+    last: str | dict[str, float] | None = None
+    counted = True
+
+    pos = 0
+    while pos < len(formula):
+        mtch = formula_token_re.match(formula, pos)
+        if mtch is None:
+            raise RuntimeError(f"Cannot parse formula {formula}")
+        pos = mtch.end()
+        symbol, count, opening, closing, separator, _ = mtch.groups()
+
+        if symbol:
+            stack[-1][symbol] = stack[-1].get(symbol, 0) + 1
+            last, counted = symbol, False
+        elif count:
+            if last is None and not stack[-1] and len(stack) == 1:
+                # Leading coefficient of a formula part, e.g. 5H2O
+                part_factor = float(count)
+            elif counted:
+                raise RuntimeError(f"Cannot parse formula {formula}")
+            elif isinstance(last, str):
+                stack[-1][last] += float(count) - 1
+            else:
+                for sym, n in last.items():
+                    stack[-1][sym] += n * (float(count) - 1)
+            counted = True
+        elif opening:
+            stack.append({})
+            last, counted = None, True
+        elif closing:
+            if len(stack) == 1 or not stack[-1]:
+                raise RuntimeError(f"Cannot parse formula {formula}")
+            group = stack.pop()
+            for sym, n in group.items():
+                stack[-1][sym] = stack[-1].get(sym, 0) + n
+            last, counted = group, False
+        elif separator:
+            if len(stack) > 1 or not stack[-1]:
+                raise RuntimeError(f"Cannot parse formula {formula}")
+            parts.append({
+                sym: n * part_factor for sym, n in stack[-1].items()
+            })
+            stack = [{}]
+            part_factor = 1.0
+            last, counted = None, True
+
+    if len(stack) > 1 or not stack[-1]:
+        raise RuntimeError(f"Cannot parse formula {formula}")
+    parts.append({sym: n * part_factor for sym, n in stack[-1].items()})
+
+    composition: dict[str, float] = {}
+    for part in parts:
+        for sym, n in part.items():
+            composition[sym] = composition.get(sym, 0) + n
+    return tuple(composition.items())
+
+
+def parse_formula(formula: str) -> dict[str, float]:
+    """
+    Parse a chemical formula (e.g. "Fe2O3", "Ca(OH)2", "CuSO4·5H2O") into a
+    dictionary of element symbol to number of atoms.
+
+    Brackets may be nested and counts may be decimal (e.g. non-stoichiometric
+    "Fe0.95O"). Parts of a formula separated by "·" or "*" may be preceded
+    by a multiplier. Results are memoized.
+    """
+    return dict(_parse_formula(formula))
+
+
+@dataclass
+class MolarMasses:
+    """
+    Molar masses (g/mol) of a batch of compositions with their propagated
+    uncertainties (esd) and the interval of possible values (min, max).
+    Values are NaN for compositions containing an element which has no
+    standard atomic weight.
+    """
+    mass: np.ndarray
+    esd: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+
+
+class MolarMassCalculator:
+
+    def __init__(self, dbapi: DBConnector, conn: Connection = None) -> None:
+        """
+        Vectorized calculation of molar masses from the atomic weights in a
+        periodic table database.
+
+        The atomic weights are read once from the database, into vectors
+        indexed by atomic number. Compositions are represented as a matrix
+        with one row per composition and one column per atomic number
+        (column 0 is unused), so the masses of a batch of compositions are
+        calculated with a single matrix product.
+        """
+        element = dbapi.tables["Element"]
+        weight = dbapi.tables["AtomicWeight"]
+        weights_stmt = (
+            select(
+                element.c[ATOMIC_NR],
+                element.c[ELEM_SYMBOL],
+                weight.c[AT_WEIGHT],
+                weight.c[f"{AT_WEIGHT}_esd"],
+                weight.c[f"{AT_WEIGHT}_min"],
+                weight.c[f"{AT_WEIGHT}_max"],
+            ).join(weight, element.c.atomic_weight_id == weight.c.id)
+        )
+        with dbapi._connection(conn) as conn:
+            rows = conn.execute(weights_stmt).all()
+
+        atomic_nrs, symbols, *values = zip(*rows)
+        self.atomic_nrs: dict[str, int] = dict(zip(symbols, atomic_nrs))
+
+        size = max(atomic_nrs) + 1
+        idx = np.array(atomic_nrs)
+        vectors = []
+        for vals in values:
+            vector = np.zeros(size)
+            vector[idx] = np.array(vals, dtype=float)  # None -> NaN
+            vectors.append(vector)
+        weight_vec, esd_vec, min_vec, max_vec = vectors
+
+        # Elements without a weight (WEIGHT_TYPE_NONE) are handled separately:
+        # NaN in the weight vectors would make every product NaN
+        self._no_weight = np.isnan(weight_vec)
+        self._weight = np.nan_to_num(weight_vec)
+        self._esd_sq = np.nan_to_num(esd_vec) ** 2
+        self._min = np.nan_to_num(min_vec)
+        self._max = np.nan_to_num(max_vec)
+
+    @property
+    def size(self) -> int:
+        """
+        Number of columns of a composition matrix (highest atomic number + 1).
+        """
+        return len(self._weight)
+
+    def composition_matrix(self, formulas: Sequence[str]) -> np.ndarray:
+        """
+        Composition matrix for a sequence of chemical formulas. Raises
+        RuntimeError if a formula contains an unknown element symbol.
+        """
+        matrix = np.zeros((len(formulas), self.size))
+        for i, formula in enumerate(formulas):
+            for symbol, n in _parse_formula(formula):
+                try:
+                    matrix[i, self.atomic_nrs[symbol]] += n
+                except KeyError:
+                    raise RuntimeError(
+                        f"Unknown element '{symbol}' in formula {formula}"
+                    ) from None
+        return matrix
+
+    def molar_masses(
+            self, compositions: Sequence[str] | np.ndarray
+    ) -> MolarMasses:
+        """
+        Calculate the molar masses of a batch of compositions, given either
+        as chemical formulas or a composition matrix.
+
+        Uncertainties of the atomic weights of different elements are assumed
+        to be independent, so esd = sqrt(sum((n_i * esd_i)^2)).
+        """
+        if isinstance(compositions, np.ndarray):
+            matrix = np.atleast_2d(compositions)
+            if matrix.shape[1] != self.size:
+                raise ValueError(
+                    f"Composition matrix must have {self.size} columns "
+                    f"(got {matrix.shape[1]})."
+                )
+        else:
+            matrix = self.composition_matrix(compositions)
+
+        no_weight = np.any((matrix != 0) & self._no_weight, axis=1)
+        results = [
+            matrix @ self._weight,
+            np.sqrt((matrix ** 2) @ self._esd_sq),
+            matrix @ self._min,
+            matrix @ self._max,
+        ]
+        for result in results:
+            result[no_weight] = np.nan
+
+        return MolarMasses(*results)
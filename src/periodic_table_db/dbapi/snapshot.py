@@ -0,0 +1,290 @@
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+from sqlalchemy import Connection, Table, select
+
+from ..shared import (
+    ATOMIC_NR, BLOCK, BLOCK_ID, ELEM_SYMBOL, GROUP, ION_ID, ION_SYMBOL, LABEL,
+    LABEL_ID, PERIOD, TABLE_NAMES_EXTENDED
+)
+
+
+class TableSnapshot:
+
+    __slots__ = ("name", "columns", "_data")
+
+    def __init__(self, table: Table, conn: Connection) -> None:
+        """
+        Read-only, column-oriented copy of all rows of a database table.
+
+        Each column is held as a tuple, so that row i of the table is made up
+        of the i-th value of every column.
+        """
+        rows = conn.execute(select(table)).all()
+        self.name = table.name
+        self.columns: tuple[str, ...] = tuple(table.c.keys())
+        if rows:
+            self._data = dict(zip(self.columns, zip(*rows)))
+        else:
+            self._data = {col: () for col in self.columns}
+
+    def __len__(self) -> int:
+        return len(self._data[self.columns[0]])
+
+    def column(self, name: str) -> tuple:
+        """
+        All values of the named column, in row order.
+        """
+        return self._data[name]
+
+    def row(self, i: int) -> dict[str, Any]:
+        """
+        Row i of the table as a dictionary of column name to value.
+        """
+        return {col: self._data[col][i] for col in self.columns}
+
+    def index(self, column: str) -> dict[Hashable, int]:
+        """
+        Build a mapping of the values in a unique column to their row.
+        """
+        return {val: i for i, val in enumerate(self._data[column])}
+
+    def multi_index(self, column: str) -> dict[Hashable, tuple[int, ...]]:
+        """
+        Build a mapping of the values in a (non-unique) column to all rows
+        containing that value.
+        """
+        idx: dict[Hashable, list[int]] = {}
+        for i, val in enumerate(self._data[column]):
+            idx.setdefault(val, []).append(i)
+        return {val: tuple(rows) for val, rows in idx.items()}
+
+
+class SnapshotDBAPI:
+
+    def __init__(self, tables: dict[str, Table], conn: Connection) -> None:
+        """
+        Immutable, in-memory copy of a periodic table database.
+
+        All tables are loaded once (in a single transaction) and indexed on
+        element symbol, name and atomic number and on ion symbol. After
+        construction no lookup touches the database, and since nothing is
+        modified a single instance can be shared between threads without
+        locking.
+
+        Normally created with PeriodicTableDBAPI.snapshot().
+        """
+        self.extended = TABLE_NAMES_EXTENDED[0] in tables
+        self.tables: dict[str, TableSnapshot] = {
+            name: TableSnapshot(table, conn)
+            for name, table in tables.items()
+        }
+
+        element = self.tables["Element"]
+        self._element_by_symbol = element.index(ELEM_SYMBOL)
+        self._element_by_name = element.index("name")
+        self._element_by_atomic_nr = element.index(ATOMIC_NR)
+        self._atomic_nrs = dict(zip(
+            element.column(ELEM_SYMBOL), element.column(ATOMIC_NR)
+        ))
+
+        self._weight_by_id = self.tables["AtomicWeight"].index("id")
+        self._weight_type_by_id = self.tables["AtomicWeightType"].index("id")
+
+        ion = self.tables["Ion"]
+        self._ion_ids = dict(zip(ion.column(ION_SYMBOL), ion.column(ION_ID)))
+        self._ions_by_atomic_nr = ion.multi_index(ATOMIC_NR)
+
+        if self.extended:
+            self._label_by_id = self.tables["Label"].index(LABEL_ID)
+            self._labels_by_atomic_nr = (
+                self.tables["ElementLabel"].multi_index(ATOMIC_NR)
+            )
+            self._elements_by_group = element.multi_index(GROUP)
+            self._elements_by_period = element.multi_index(PERIOD)
+            self._elements_by_block_id = element.multi_index("block_id")
+            block = self.tables["Block"]
+            self._block_ids = dict(
+                zip(block.column(BLOCK), block.column(BLOCK_ID))
+            )
+            label = self.tables["Label"]
+            self._label_ids = dict(
+                zip(label.column(LABEL), label.column(LABEL_ID))
+            )
+            element_label = self.tables["ElementLabel"]
+            self._atomic_nrs_by_label_id = {
+                label_id: frozenset(
+                    element_label.column(ATOMIC_NR)[i] for i in rows
+                )
+                for label_id, rows in (
+                    element_label.multi_index(LABEL_ID).items()
+                )
+            }
+
+    def get_atomic_nr_for_symbol(
+            self, symbol: str, conn: Connection = None
+    ) -> int | None:
+        """
+        Get the atomic number of an element from its symbol.
+
+        conn is ignored; it is accepted for compatibility with
+        PeriodicTableDBAPI.
+        """
+        return self._atomic_nrs.get(symbol)
+
+    def get_atomic_nrs_for_symbols(
+            self, symbols: str | Iterable[str], conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the atomic numbers of several elements from their symbols. Symbols
+        which are not found are omitted.
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols, ]
+        atomic_nrs = self._atomic_nrs
+        return {
+            symbol: atomic_nrs[symbol]
+            for symbol in symbols if symbol in atomic_nrs
+        }
+
+    def get_ids_for_ion_symbols(
+            self, ion_symbols: str | Iterable[str], conn: Connection = None
+    ) -> dict[str, int]:
+        if isinstance(ion_symbols, str):
+            ion_symbols = [ion_symbols, ]
+        ion_ids = self._ion_ids
+        return {
+            symbol: ion_ids[symbol]
+            for symbol in ion_symbols if symbol in ion_ids
+        }
+
+    def get_element(self, key: int | str) -> dict[str, Any] | None:
+        """
+        Get all properties of an element, by atomic number, symbol or name.
+
+        The atomic weight and the name of its type are included. For the
+        extended database, the labels of the element are also included.
+        """
+        if isinstance(key, int):
+            row = self._element_by_atomic_nr.get(key)
+        else:
+            row = self._element_by_symbol.get(key)
+            if row is None:
+                row = self._element_by_name.get(key)
+        if row is None:
+            return None
+
+        element = self.tables["Element"].row(row)
+
+        weight = self.tables["AtomicWeight"].row(
+            self._weight_by_id[element["atomic_weight_id"]]
+        )
+        weight_type = self.tables["AtomicWeightType"].row(
+            self._weight_type_by_id[weight.pop("weight_type_id")]
+        )
+        del weight["id"]
+        element.update(weight)
+        element["weight_type"] = weight_type["name"]
+
+        if self.extended:
+            label_ids = self.tables["ElementLabel"].column(LABEL_ID)
+            label_names = self.tables["Label"].column("name")
+            element["labels"] = [
+                label_names[self._label_by_id[label_ids[i]]]
+                for i in self._labels_by_atomic_nr.get(
+                    element[ATOMIC_NR], ()
+                )
+            ]
+
+        return element
+
+    def get_ion_symbols_for_atomic_nr(self, atomic_nr: int) -> list[str]:
+        """
+        Get the symbols of all ions of an element.
+        """
+        symbols = self.tables["Ion"].column(ION_SYMBOL)
+        return [
+            symbols[i] for i in self._ions_by_atomic_nr.get(atomic_nr, ())
+        ]
+
+    def get_elements(
+            self, labels: str | Iterable[str] = (), group: int | None = None,
+            period: int | None = None, block: str | None = None,
+            conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements matching all of
+        the given criteria: having every one of labels, and being in group,
+        period and block. Requires the extended database.
+        """
+        if not self.extended:
+            raise RuntimeError(
+                "Querying elements by label, group, period or block requires "
+                "the extended database."
+            )
+        if isinstance(labels, str):
+            labels = [labels, ]
+
+        element = self.tables["Element"]
+        atomic_nrs = element.column(ATOMIC_NR)
+        # Rows of the Element table selected by each criterion
+        selections = [
+            {
+                self._element_by_atomic_nr[atomic_nr]
+                for atomic_nr in self._atomic_nrs_by_label_id.get(
+                    self._label_ids.get(label_name), ()
+                )
+            }
+            for label_name in labels
+        ]
+        if group is not None:
+            selections.append(set(self._elements_by_group.get(group, ())))
+        if period is not None:
+            selections.append(set(self._elements_by_period.get(period, ())))
+        if block is not None:
+            selections.append(set(self._elements_by_block_id.get(
+                self._block_ids.get(block), ()
+            )))
+
+        rows = (
+            set.intersection(*selections) if selections
+            else range(len(element))
+        )
+        symbols = element.column(ELEM_SYMBOL)
+        return {
+            symbols[i]: atomic_nrs[i]
+            for i in sorted(rows, key=atomic_nrs.__getitem__)
+        }
+
+    def get_elements_by_label(
+            self, label: str, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements with a label.
+        """
+        return self.get_elements(labels=label)
+
+    def get_elements_in_group(
+            self, group: int, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements in a group.
+        """
+        return self.get_elements(group=group)
+
+    def get_elements_in_period(
+            self, period: int, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements in a period.
+        """
+        return self.get_elements(period=period)
+
+    def get_elements_in_block(
+            self, block: str, conn: Connection = None
+    ) -> dict[str, int]:
+        """
+        Get the symbols and atomic numbers of the elements in a block ("s",
+        "p", "d" or "f").
+        """
+        return self.get_elements(block=block)
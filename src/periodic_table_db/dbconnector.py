@@ -1,6 +1,106 @@
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
 from sqlalchemy import (
-    MetaData, Connection, Engine, Table,
+    MetaData, Connection, Engine, Table, create_engine, make_url,
 )
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+
+# Pooling strategies for create_db_engine:
+# - one connection, shared by all users (e.g. for in-memory SQLite databases)
+POOL_STATIC = "static"
+# - pool of connections shared between threads (e.g. file-backed databases
+#   with many readers)
+POOL_QUEUE = "queue"
+# - one connection per thread
+POOL_THREAD = "thread"
+
+# Key in Connection.info marking connections owned by DBConnector.session()
+_SESSION_INFO_KEY = "periodic_table_db_session"
+
+
+# Tables reflected from existing databases, keyed by database URL and table
+# name prefix. Shared by all DBConnectors in the process.
+_reflected_tables: dict[tuple[str, str], dict[str, Table]] = {}
+
+
+def _reflection_cache_url(engine: Engine) -> str | None:
+    """
+    Key used to identify the database of engine in the reflection cache.
+    None if the database is in-memory (every such engine is a different
+    database, even though they have the same URL).
+    """
+    if engine.url.get_backend_name() == "sqlite" and (
+        engine.url.database in (None, "", ":memory:")
+    ):
+        return None
+    return engine.url.render_as_string(hide_password=False)
+
+
+def clear_reflection_cache(engine: Engine | None = None):
+    """
+    Discard cached reflected tables for the database of engine, or for all
+    databases if no engine is given. Needed if the schema of a database is
+    changed after it has been reflected.
+    """
+    if engine is None:
+        _reflected_tables.clear()
+        return
+
+    url = _reflection_cache_url(engine)
+    for key in [key for key in _reflected_tables if key[0] == url]:
+        del _reflected_tables[key]
+
+
+def _copy_table(table: Table, md: MetaData) -> Table:
+    """
+    Copy table into md, together with the tables it references. Tables
+    which are already in md are not copied again.
+    """
+    if table.key in md.tables:
+        return md.tables[table.key]
+    copy = table.to_metadata(md)
+    for fk in table.foreign_keys:
+        _copy_table(fk.column.table, md)
+    return copy
+
+
+def create_db_engine(
+        url: str, pooling: str | None = None, pool_size: int = 5, **kwargs
+) -> Engine:
+    """
+    Create an SQLAlchemy Engine for url with the given pooling strategy:
+    - POOL_STATIC ("static"): a single connection used by everything. Keeps
+      an in-memory SQLite database alive for the lifetime of the Engine.
+    - POOL_QUEUE ("queue"): up to pool_size connections (plus the same
+      number of overflow connections) shared between threads.
+    - POOL_THREAD ("thread"): each thread keeps its own connection (up to
+      pool_size threads).
+    - None: SQLAlchemy's default for the database.
+    Further keyword arguments are passed to sqlalchemy.create_engine.
+    """
+    if pooling is None:
+        return create_engine(url, **kwargs)
+
+    if make_url(url).get_backend_name() == "sqlite":
+        # Connections may be used by threads other than their creator
+        connect_args = kwargs.setdefault("connect_args", {})
+        connect_args.setdefault("check_same_thread", False)
+
+    if pooling == POOL_STATIC:
+        kwargs["poolclass"] = StaticPool
+    elif pooling == POOL_QUEUE:
+        kwargs["poolclass"] = QueuePool
+        kwargs.setdefault("pool_size", pool_size)
+        kwargs.setdefault("max_overflow", pool_size)
+    elif pooling == POOL_THREAD:
+        kwargs["poolclass"] = SingletonThreadPool
+        kwargs.setdefault("pool_size", pool_size)
+    else:
+        raise ValueError(f"Unknown pooling strategy '{pooling}'.")
+
+    return create_engine(url, **kwargs)
 
 
 class DBConnector:
@@ -8,6 +108,22 @@ class DBConnector:
     def __init__(self, engine: Engine, md: MetaData):
         self.metadata_obj = md
         self.engine = engine
+        self._session_conn: ContextVar[Connection | None] = ContextVar(
+            f"session_conn_{id(self)}", default=None
+        )
+
+    @classmethod
+    def from_url(
+            cls, url: str, md: MetaData | None = None,
+            pooling: str | None = None, pool_size: int = 5, **kwargs
+    ):
+        """
+        Create an instance connected to the database at url, using one of
+        the pooling strategies of create_db_engine. Further keyword arguments
+        are passed to the constructor.
+        """
+        engine = create_db_engine(url, pooling=pooling, pool_size=pool_size)
+        return cls(engine, md if md is not None else MetaData(), **kwargs)
 
     def connect(self) -> Connection:
         """
@@ -16,12 +132,95 @@ class DBConnector:
         """
         return self.engine.connect()
 
+    @contextmanager
+    def session(self) -> Iterator[Connection]:
+        """
+        Context manager in which all method calls on this instance share one
+        connection and transaction, without needing to pass conn.
+
+        The transaction is committed when the with-block ends, or rolled
+        back if an exception is raised. Nested session() blocks reuse the
+        outer session.
+        """
+        conn = self._session_conn.get()
+        if conn is not None:
+            yield conn
+            return
+
+        with self.engine.connect() as conn:
+            conn.info[_SESSION_INFO_KEY] = True
+            token = self._session_conn.set(conn)
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                self._on_rollback()
+                raise
+            finally:
+                self._session_conn.reset(token)
+                del conn.info[_SESSION_INFO_KEY]
+
+    def _on_rollback(self):
+        """
+        Called after the transaction of a session() has been rolled back.
+        Subclasses override this to discard state derived from the
+        discarded changes.
+        """
+
+    def _connection(self, conn: Connection = None):
+        """
+        Context manager providing the connection for a method call: conn if
+        given, the session connection inside a session() block, otherwise a
+        new connection which is closed afterwards.
+        """
+        if conn is None:
+            conn = self._session_conn.get()
+        return nullcontext(conn) if conn else self.connect()
+
+    def _commit(self, conn: Connection):
+        """
+        Commit the transaction of conn, unless conn belongs to a session()
+        (which commits when it ends).
+        """
+        if not conn.info.get(_SESSION_INFO_KEY):
+            conn.commit()
+
     def get_tables_from_existing(
-            self, table_names: list[str], prefix=""
+            self, table_names: list[str], prefix="", use_cache=True,
+            conn: Connection = None
     ) -> dict[str, Table]:
-        self.metadata_obj.reflect(bind=self.engine)
+        """
+        Get the named tables (with names prefixed by prefix) from the
+        database.
+
+        Only the requested tables (and any tables they reference) are
+        reflected. Reflected tables are cached for the process, so later
+        calls for the same database and prefix do not need to query the
+        schema again; the cached tables are copied into the MetaData of
+        this instance. Tables of in-memory databases are not cached.
+
+        If conn is given, it is used to reflect the tables instead of a new
+        connection from the engine.
+        """
+        url = _reflection_cache_url(self.engine)
+        if use_cache and url is not None:
+            cached = _reflected_tables.setdefault((url, prefix), {})
+        else:
+            cached = {}
+
+        missing = [
+            f"{prefix}{name}" for name in table_names
+            if f"{prefix}{name}" not in cached
+        ]
+        if missing:
+            self.metadata_obj.reflect(
+                bind=conn if conn else self.engine, only=missing
+            )
+            for full_name in missing:
+                cached[full_name] = self.metadata_obj.tables[full_name]
 
         return {
-            name: self.metadata_obj.tables[f"{prefix}{name}"]
+            name: _copy_table(cached[f"{prefix}{name}"], self.metadata_obj)
             for name in table_names
         }
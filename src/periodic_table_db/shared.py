@@ -1,5 +1,9 @@
+from collections.abc import Iterable
 from dataclasses import dataclass, asdict, field
+from functools import lru_cache
 import re
+from threading import Lock
+from typing import ClassVar
 
 ATOMIC_NR = "atomic_number"
 ELEM_SYMBOL = "symbol"
@@ -34,23 +38,95 @@ TABLE_NAMES_EXTENDED = [
 ]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Ion:
+    """
+    An ion (or neutral atom) of an element. Immutable and slotted, so that
+    large numbers of instances can be held in memory without a __dict__
+    each.
+
+    atomic_number is determined by the element, so it is not part of the
+    identity (equality and hash) of an ion. If it is not known when the ion
+    is created, it is filled in once found (e.g. by add_ions()).
+
+    Use Ion.get() to share one instance between all uses of the same ion.
+    """
     symbol: str = field(init=False)
     element_symbol: str
     charge: int
-    valence_state: bool
-    atomic_number: int | None = None
+    valence_state: bool = False
+    atomic_number: int | None = field(default=None, compare=False)
+
+    # Interned instances, keyed by (element_symbol, charge, valence_state)
+    _registry: ClassVar[dict[tuple[str, int, bool], "Ion"]] = {}
+    _registry_lock: ClassVar[Lock] = Lock()
 
     def __post_init__(self):
         if self.charge > 0:
-            self.symbol = f"{self.element_symbol}{abs(self.charge)}+"
+            symbol = f"{self.element_symbol}{abs(self.charge)}+"
         elif self.charge < 0:
-            self.symbol = f"{self.element_symbol}{abs(self.charge)}-"
+            symbol = f"{self.element_symbol}{abs(self.charge)}-"
         elif self.valence_state:
-            self.symbol = f"{self.element_symbol}val"
+            symbol = f"{self.element_symbol}val"
         else:
-            self.symbol = f"{self.element_symbol}"
+            symbol = f"{self.element_symbol}"
+        object.__setattr__(self, "symbol", symbol)
+
+    def fill_atomic_number(self, atomic_number: int):
+        """
+        Set the atomic number of an ion which does not have one yet. A
+        conflicting atomic number raises RuntimeError.
+        """
+        if self.atomic_number is None:
+            object.__setattr__(self, "atomic_number", atomic_number)
+        elif self.atomic_number != atomic_number:
+            raise RuntimeError(
+                f"Cannot set atomic number of {self.symbol} to "
+                f"{atomic_number}: it is {self.atomic_number}."
+            )
+
+    @classmethod
+    def get(
+            cls, element_symbol: str, charge: int, valence_state: bool = False,
+            atomic_number: int | None = None
+    ) -> "Ion":
+        """
+        Get the shared instance of an ion, creating it on first use. Safe to
+        call from several threads.
+
+        If atomic_number is given and the shared instance has none, it is
+        filled in (see fill_atomic_number()), so every caller keeps the same
+        instance. A conflicting atomic number raises RuntimeError.
+        """
+        key = (element_symbol, charge, valence_state)
+        ion = cls._registry.get(key)
+        if ion is None:
+            with cls._registry_lock:
+                ion = cls._registry.setdefault(key, cls(*key, atomic_number))
+        if atomic_number is not None and ion.atomic_number != atomic_number:
+            with cls._registry_lock:
+                ion.fill_atomic_number(atomic_number)
+        return ion
+
+    @classmethod
+    def clear_registry(cls):
+        """
+        Discard all shared instances.
+        """
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    def to_row(self) -> dict[str, str | int | bool | None]:
+        """
+        Values of the columns of the Ion table for this ion. Much faster
+        than dict(), which recursively copies every field.
+        """
+        return {
+            ION_SYMBOL: self.symbol,
+            ION_CHARGE: self.charge,
+            ATOMIC_NR: self.atomic_number,
+            "valence_state": self.valence_state,
+        }
 
     dict = asdict
 
@@ -61,7 +137,11 @@ ion_symbol_re = re.compile(
 )
 
 
-def parse_ion_symbol(symbol: str, atomic_nr: int = None):
+def _match_ion_symbol(symbol: str) -> tuple[str, int, bool]:
+    """
+    Parse an ion symbol with ion_symbol_re. Reference implementation of
+    the grammar which _scan_ion_symbol implements without a regex.
+    """
     symbol_parts = ion_symbol_re.match(symbol)
     if symbol_parts is None:
         raise RuntimeError(f"Cannot parse ion symbol {symbol}")
@@ -95,9 +175,125 @@ def parse_ion_symbol(symbol: str, atomic_nr: int = None):
         charge = 0
         val = True
 
+    return elem_symbol, charge, val
+
+
+def _scan_ion_symbol(symbol: str) -> tuple[str, int, bool]:
+    """
+    Parse an ion symbol in a single pass, without backtracking. Accepts
+    exactly the symbols matched by ion_symbol_re (including its quirks: a
+    single trailing newline is ignored and charges may be written with any
+    Unicode decimal digits) and returns the (element symbol, charge,
+    valence state) tuple of _match_ion_symbol.
+    """
+    end = len(symbol)
+    if end and symbol[-1] == "\n":
+        end -= 1
+    if not end or not "A" <= symbol[0] <= "Z":
+        raise RuntimeError(f"Cannot parse ion symbol {symbol}")
+
+    # Element symbol: upper case letter, optionally followed by lower case
+    pos = 2 if end > 1 and "a" <= symbol[1] <= "z" else 1
+    elem_symbol = symbol[:pos]
+    if pos == end:
+        return elem_symbol, 0, False
+
+    char = symbol[pos]
+    if char.isdecimal() or char == "+" or char == "-":
+        # Charge: optional number, followed by one or more signs
+        digits_end = pos
+        while digits_end < end and symbol[digits_end].isdecimal():
+            digits_end += 1
+        if digits_end < end:
+            sign = symbol[digits_end]
+            if sign == "+" or sign == "-":
+                signs = symbol[digits_end:end]
+                if signs.count(sign) == len(signs):
+                    if digits_end == pos:
+                        charge = len(signs)
+                    elif len(signs) == 1:
+                        charge = int(symbol[pos:digits_end])
+                    else:
+                        # e.g. 2++
+                        raise RuntimeError(
+                            f"Cannot parse ion symbol {symbol}"
+                        )
+                    return (
+                        elem_symbol, -charge if sign == "-" else charge, False
+                    )
+
+    elif char == "(":
+        # Oxidation state in Roman numerals, e.g. (III)
+        numeral = symbol[pos + 1:end - 1]
+        if (numeral and symbol[end - 1] == ")"
+                and numeral.count("I") == len(numeral)):
+            return elem_symbol, len(numeral), False
+
+    else:
+        # Valence state: element symbol followed by "va" or "val"
+        if symbol[pos:end] in ("va", "val"):
+            return elem_symbol, 0, True
+        if pos == 2 and symbol[1:end] in ("va", "val"):
+            # Second letter was the "v" of "val", e.g. Cval
+            return symbol[0], 0, True
+
+    raise RuntimeError(f"Cannot parse ion symbol {symbol}")
+
+
+# Memoized parser, returning an immutable (element symbol, charge, valence
+# state) tuple so that the cached value cannot be altered
+_parse_ion_symbol = lru_cache(maxsize=4096)(_scan_ion_symbol)
+
+
+def parse_ion_symbol(symbol: str, atomic_nr: int = None):
+    """
+    Parse an ion symbol (e.g. "Fe3+", "O2-", "Cu(II)", "Cval") into a
+    dictionary of the arguments of Ion. Results are memoized.
+    """
+    elem_symbol, charge, val = _parse_ion_symbol(symbol)
     return {
         "element_symbol": elem_symbol,
         "charge": charge,
         "atomic_number": atomic_nr,
         "valence_state": val
     }
+
+
+@dataclass
+class ParsedIonSymbols:
+    """
+    Columnar results of parse_ion_symbols. Row i of element_symbols, charges
+    and valence_states is the parsed form of symbols[i].
+
+    errors maps each symbol which could not be parsed to the reason.
+    """
+    symbols: list[str] = field(default_factory=list)
+    element_symbols: list[str] = field(default_factory=list)
+    charges: list[int] = field(default_factory=list)
+    valence_states: list[bool] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+def parse_ion_symbols(symbols: Iterable[str]) -> ParsedIonSymbols:
+    """
+    Parse many ion symbols at once. Duplicate symbols are parsed only once
+    and appear once in the results, in order of first appearance.
+
+    Symbols which cannot be parsed do not stop parsing; they are collected
+    in the errors of the results instead.
+    """
+    parsed = ParsedIonSymbols()
+    for symbol in dict.fromkeys(symbols):
+        try:
+            elem_symbol, charge, val = _parse_ion_symbol(symbol)
+        except RuntimeError as err:
+            parsed.errors[symbol] = str(err)
+            continue
+        parsed.symbols.append(symbol)
+        parsed.element_symbols.append(elem_symbol)
+        parsed.charges.append(charge)
+        parsed.valence_states.append(val)
+    return parsed
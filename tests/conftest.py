@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import MetaData, create_engine
+
+from periodic_table_db.builder import generatedb
+
+from tests.resources.requests_local_file import LocalFileAdapter
+
+
+AT_WEIGHTS_FILE = Path(__file__).parent / "test_files" / "atomic-weights.htm"
+
+
+@pytest.fixture(scope="session")
+def local_file_cfg() -> dict:
+    """
+    Keyword arguments for get_elements, reading the CIAAW table from the
+    local test file.
+    """
+    return {
+        "url": AT_WEIGHTS_FILE.resolve().as_uri(),
+        "adapter_cfg": ("file://", LocalFileAdapter())
+    }
+
+
+@pytest.fixture
+def pt_db_engine(tmp_path, local_file_cfg):
+    """
+    Engine connected to a newly built extended periodic table database file.
+    """
+    db_path = tmp_path / "periodic_table.sqlite"
+    engine = create_engine(f"sqlite:///{db_path}")
+    generatedb.construct_db(engine, MetaData(), True, **local_file_cfg)
+    return engine
@@ -1,7 +1,11 @@
 from pathlib import Path
 
+import pytest
+from sqlalchemy import MetaData, text
+
 from periodic_table_db.builder import generatedb
 from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.shared import Ion
 
 from tests.resources.requests_local_file import LocalFileAdapter
 
@@ -15,3 +19,75 @@ def test_generate_db():
                                       url=at_weights_url, adapter_cfg=cfg)
 
     assert isinstance(pt_dbapi, PeriodicTableDBAPI)
+
+
+def test_ingest_ions(pt_db_engine, tmp_path):
+    csv_path = tmp_path / "ions.csv"
+    csv_path.write_text("symbol\nFe2+\nFe3+\nO2-\n")
+    db_path = Path(pt_db_engine.url.database)
+
+    report = generatedb.ingest_ions(
+        db_path, csv_path, "symbol", chunk_size=2, extended=True
+    )
+
+    assert report.rows_inserted == 3
+    assert report.chunks == 2
+    assert not report.failed_chunks
+
+    with pt_db_engine.connect() as conn:
+        sub_shells = dict(conn.execute(text(
+            "SELECT symbol, sub_shell_structure FROM Ion "
+            "WHERE symbol IN ('Fe', 'Fe2+', 'Fe3+')"
+        )).all())
+    assert sub_shells["Fe"].endswith("3d^{6}.4s^{2}")
+    assert sub_shells["Fe2+"].endswith("3p^{6}.3d^{6}")
+    assert sub_shells["Fe3+"].endswith("3p^{6}.3d^{5}")
+
+
+def test_update_db(pt_db_engine, local_file_cfg):
+    db_path = Path(pt_db_engine.url.database)
+    PeriodicTableDBAPI(pt_db_engine, MetaData()).add_ions(Ion("Fe", 3, False))
+
+    summary = generatedb.update_db(db_path, **local_file_cfg)
+
+    assert str(summary) == "Ion: 0 inserted, 1 updated, 0 deleted"
+    with pt_db_engine.connect() as conn:
+        assert conn.execute(text(
+            "SELECT shell_structure FROM Ion WHERE symbol = 'Fe3+'"
+        )).scalar_one() == "2.8.13"
+
+
+def test_update_db_failed_fetch(pt_db_engine, tmp_path, local_file_cfg):
+    db_path = Path(pt_db_engine.url.database)
+    no_table = tmp_path / "error.htm"
+    no_table.write_text("<html><body>Service unavailable</body></html>")
+    with pt_db_engine.connect() as conn:
+        before = conn.execute(text("SELECT * FROM Element")).all()
+
+    with pytest.raises(RuntimeError):
+        generatedb.update_db(
+            db_path, url=no_table.resolve().as_uri(),
+            adapter_cfg=local_file_cfg["adapter_cfg"]
+        )
+
+    with pt_db_engine.connect() as conn:
+        assert conn.execute(text("SELECT * FROM Element")).all() == before
+        assert conn.execute(
+            text("SELECT count(*) FROM ElementLabel")
+        ).scalar_one() == 162
+
+
+def test_update_db_extended_mismatch(pt_db_engine, local_file_cfg):
+    db_path = Path(pt_db_engine.url.database)
+
+    with pytest.raises(RuntimeError):
+        generatedb.update_db(db_path, extended=False, **local_file_cfg)
+
+
+def test_get_db_url(tmp_path):
+    db_path = tmp_path / "periodic_table.sqlite"
+    assert generatedb.get_db_url(db_path, False) == f"sqlite:///{db_path}"
+
+    db_path.touch()
+    assert generatedb.get_db_url(db_path, False) == f"sqlite:///{db_path}"
+    assert not db_path.exists()
@@ -0,0 +1,51 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from periodic_table_db.builder.extended.data import Atom  # noqa: E402
+from periodic_table_db.builder.extended.data.aufbau import (  # noqa: E402
+    MAX_ATOMIC_NR, SUB_SHELLS, electronic_structures
+)
+
+
+class TestElectronicStructures:
+
+    def test_same_as_atom(self):
+        structures = electronic_structures()
+
+        assert len(structures) == MAX_ATOMIC_NR
+        assert structures.dicts() == [
+            Atom(at_nr).dict() for at_nr in range(1, MAX_ATOMIC_NR + 1)
+        ]
+
+    def test_ions_same_as_atom(self):
+        structures = electronic_structures(charges=range(-3, 9))
+
+        assert structures.dicts() == [
+            Atom(at_nr, charge).dict()
+            for at_nr, charge in zip(
+                structures.atomic_nr.tolist(), structures.charge.tolist()
+            )
+        ]
+
+    def test_ions_without_electrons_skipped(self):
+        structures = electronic_structures([1, 2], [0, 1, 2])
+
+        assert structures.atomic_nr.tolist() == [1, 2, 2]
+        assert structures.charge.tolist() == [0, 0, 1]
+
+    def test_occupancy(self):
+        structures = electronic_structures([26, 29])
+        fe, cu = structures.occupancy
+        d3 = SUB_SHELLS.index((3, 2))
+        s4 = SUB_SHELLS.index((4, 0))
+
+        assert (fe[d3], fe[s4]) == (6, 2)
+        # Ground state correction
+        assert (cu[d3], cu[s4]) == (10, 1)
+        assert structures.occupancy.sum(axis=1).tolist() == [26, 29]
+
+    def test_ground_state_zero_listed(self):
+        la = electronic_structures([57])
+
+        assert "4f^{0}" in la.sub_shell_structure[0]
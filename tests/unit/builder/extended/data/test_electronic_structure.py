@@ -1,7 +1,8 @@
 import pytest
 
 from periodic_table_db.builder.extended.data.electronic_structure import (
-    SubShell, Atom
+    MAX_ATOMIC_NR, SubShell, Atom, ion_configurations,
+    precompute_configurations
 )
 
 
@@ -83,6 +84,11 @@ class TestSubShell:
         assert rest == -2
         assert sub_shell.electrons == 0
 
+    def test_repr(self):
+        sub_shell = SubShell(3, 2)
+        sub_shell.add_electrons(7)
+        assert repr(sub_shell) == "<SubShell: 3d (2, 2, 1, 1, 1)>"
+
     def test_str(self):
         sub_shell = SubShell(3, 2)
         sub_shell.add_electrons(6)
@@ -151,3 +157,94 @@ class TestAtom:
         at.correct_orbital_filling(correction)
         assert at.electrons == electrons
         assert at.sub_shell_structure == sub_shell_struct
+
+    def test_correct_orbital_filling_invalidates_cache(self):
+        at = Atom(26)
+        assert at.sub_shell_structure.endswith("3d^{6}.4s^{2}")
+        assert at.shell_structure == "2.8.14.2"
+
+        at.correct_orbital_filling("3d^{7}.4s^{1}")
+        assert at.sub_shell_structure.endswith("3d^{7}.4s^{1}")
+        assert at.shell_structure == "2.8.15.1"
+        assert at.electrons == 26
+
+    def test_sub_shell_changes_invalidate_cache(self):
+        at = Atom(26)
+        assert at.charge == 0
+
+        at.shells[4][0].remove_electrons(2)
+        assert at.charge == 2
+        assert at.electrons == 24
+        assert at.shell_structure == "2.8.14.0"
+
+        at.shells[3][2].add_electrons(1)
+        assert at.charge == 1
+        assert at.sub_shell_structure.endswith("3d^{7}.4s^{0}")
+
+
+class TestAtomConfiguration:
+
+    def test_for_atomic_number(self):
+        config = Atom.for_atomic_number(26)
+        assert Atom.for_atomic_number(26) is config
+        assert config.charge == 0
+        assert config.sub_shells[-1] == (4, 0, 2)
+        with pytest.raises(AttributeError):
+            config.group = 9
+
+    def test_precompute(self):
+        configs = precompute_configurations()
+        assert len(configs) == MAX_ATOMIC_NR
+        for at_nr, config in configs.items():
+            assert config.dict() == Atom(at_nr).dict()
+            assert Atom.for_atomic_number(at_nr) is config
+
+
+class TestIonConfiguration:
+
+    @pytest.mark.parametrize(
+        "at_nr, charge, sub_shell_struct, shell_struct",
+        [(26, 2, "1s^{2}.2s^{2}.2p^{6}.3s^{2}.3p^{6}.3d^{6}", "2.8.14"),
+         (26, 3, "1s^{2}.2s^{2}.2p^{6}.3s^{2}.3p^{6}.3d^{5}", "2.8.13"),
+         (29, 1, "1s^{2}.2s^{2}.2p^{6}.3s^{2}.3p^{6}.3d^{10}", "2.8.18"),
+         (8, -2, "1s^{2}.2s^{2}.2p^{6}", "2.8"),
+         (10, -1, "1s^{2}.2s^{2}.2p^{6}.3s^{1}", "2.8.1"),
+         (58, 4, "1s^{2}.2s^{2}.2p^{6}.3s^{2}.3p^{6}.3d^{10}.4s^{2}.4p^{6}."
+                 "4d^{10}.5s^{2}.5p^{6}", "2.8.18.18.8"),
+         ]
+    )
+    def test_for_ion(self, at_nr, charge, sub_shell_struct, shell_struct):
+        config = Atom.for_ion(at_nr, charge)
+        assert config.charge == charge
+        assert config.sub_shell_structure == sub_shell_struct
+        assert config.shell_structure == shell_struct
+        assert config.group is None
+        assert Atom.for_ion(at_nr, charge) is config
+
+    def test_for_ion_neutral(self):
+        assert Atom.for_ion(26, 0) is Atom.for_atomic_number(26)
+
+    def test_too_many_electrons_removed(self):
+        with pytest.raises(ValueError):
+            Atom.for_atomic_number(2).ionise(3)
+
+    def test_ion_configurations(self):
+        configs = list(ion_configurations(range(1, 4), range(-1, 3)))
+        assert [(c.atomic_nr, c.charge) for c in configs] == [
+            (1, -1), (1, 0),
+            (2, -1), (2, 0), (2, 1),
+            (3, -1), (3, 0), (3, 1), (3, 2),
+        ]
+        for config in configs:
+            electrons = sum(e for _, _, e in config.sub_shells)
+            assert electrons == config.atomic_nr - config.charge
+
+    def test_atom_charge(self):
+        at = Atom(26, 2)
+        assert at.electrons == 24
+        assert at.charge == 2
+
+    def test_atom_ion_not_corrected(self):
+        # Ground state corrections are for neutral atoms only
+        at = Atom(24, 6)
+        assert at.sub_shell_structure == "1s^{2}.2s^{2}.2p^{6}.3s^{2}.3p^{6}"
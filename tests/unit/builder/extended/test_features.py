@@ -0,0 +1,69 @@
+import pytest
+
+from periodic_table_db.builder.extended.data import Atom, label_rules
+from periodic_table_db.builder.extended.data.electronic_structure import (
+    MAX_ATOMIC_NR
+)
+from periodic_table_db.builder.extended.features import (
+    LabelIndex, add_labels
+)
+
+
+@pytest.fixture(scope="module")
+def index() -> LabelIndex:
+    return LabelIndex(
+        Atom.for_atomic_number(at_nr)
+        for at_nr in range(1, MAX_ATOMIC_NR + 1)
+    )
+
+
+class TestLabelIndex:
+
+    def test_label(self, index: LabelIndex):
+        assert index.atomic_nrs(index.label("Noble Gases")) == [
+            2, 10, 18, 36, 54, 86, 118
+        ]
+        assert index.elements_with("Lanthanoid") == list(range(57, 72))
+
+    def test_complement(self, index: LabelIndex):
+        not_lanthanoid = index.complement(index.label("Lanthanoid"))
+
+        assert index.atomic_nrs(not_lanthanoid) == (
+            list(range(1, 57)) + list(range(72, MAX_ATOMIC_NR + 1))
+        )
+        assert index.complement(index.all) == 0
+        with pytest.raises(ValueError):
+            index.atomic_nrs(~index.label("Lanthanoid"))
+
+    def test_labels_of(self, index: LabelIndex):
+        assert index.labels_of(29) == ("Transition Element", "Coinage Metal")
+        assert index.labels_of(1) == ("Alkali Metal", )
+        assert index.labels_of(200) == ()
+
+    def test_set_algebra(self, index: LabelIndex):
+        period_4_transition = (
+            index.label("Transition Element") & index.period(4)
+        )
+        assert index.atomic_nrs(period_4_transition) == list(range(21, 30))
+
+        rare_earth_not_lanthanoid = (
+            index.label("Rare Earth Element") & ~index.label("Lanthanoid")
+        )
+        assert index.atomic_nrs(rare_earth_not_lanthanoid) == [21, 39]
+
+        assert index.elements_with("Main Group", "Halogen") == [
+            9, 17, 35, 53, 85, 117
+        ]
+        assert index.atomic_nrs(index.group(1) | index.group(2))[:4] == [
+            1, 3, 4, 11
+        ]
+        assert index.atomic_nrs(index.block("s"))[:3] == [1, 2, 3]
+
+    def test_same_as_rules(self, index: LabelIndex):
+        atoms = [Atom(at_nr) for at_nr in range(1, MAX_ATOMIC_NR + 1)]
+        add_labels(atoms)
+
+        for atom in atoms:
+            assert atom.labels == [
+                label for label, rule in label_rules.items() if rule(atom)
+            ]
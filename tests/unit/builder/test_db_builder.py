@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import MetaData, create_engine, select
+
+from periodic_table_db.builder import PeriodicTableDBBuilder
+from periodic_table_db.builder.features import get_elements
+from periodic_table_db.shared import AT_WEIGHT, ATOMIC_NR
+
+
+@pytest.fixture
+def builder(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'periodic_table.sqlite'}")
+    builder = PeriodicTableDBBuilder(engine, MetaData())
+    builder.create_db()
+    return builder
+
+
+def weight_ids(builder, conn):
+    """
+    Atomic weight id of each element, keyed by atomic number.
+    """
+    element = builder.element
+    return dict(conn.execute(
+        select(element.c[ATOMIC_NR], element.c.atomic_weight_id)
+    ).all())
+
+
+class TestAddElements:
+
+    def test_shared_weights(self, builder, local_file_cfg):
+        elements = get_elements(**local_file_cfg)
+        no_weight = [
+            elem.atomic_number for elem in elements
+            if elem.weight.weight is None
+        ]
+        assert len(no_weight) > 1
+
+        builder.add_elements(elements)
+
+        with builder.connect() as conn:
+            ids = weight_ids(builder, conn)
+            n_weights = len(conn.execute(
+                select(builder.atomic_weight.c.id)
+            ).all())
+        # All elements without a weight share a single row
+        assert len({ids[atomic_nr] for atomic_nr in no_weight}) == 1
+        assert n_weights == len(set(ids.values()))
+        assert n_weights == len(elements) - len(no_weight) + 1
+
+    def test_non_empty_tables(self, builder, local_file_cfg):
+        elements = get_elements(**local_file_cfg)
+
+        builder.add_elements(elements[:10])
+        with builder.connect() as conn:
+            first_ids = set(weight_ids(builder, conn).values())
+        builder.add_elements(elements[10:])
+
+        at_weight = builder.atomic_weight
+        with builder.connect() as conn:
+            ids = weight_ids(builder, conn)
+            weights = dict(conn.execute(
+                select(at_weight.c.id, at_weight.c[AT_WEIGHT])
+            ).all())
+        # New weights are numbered after the existing ones
+        assert min(set(ids.values()) - first_ids) == max(first_ids) + 1
+        assert len(ids) == len(elements)
+        assert all(
+            weights[ids[elem.atomic_number]] == elem.weight.weight
+            for elem in elements
+        )
+        assert len(builder.dbapi.get_ids_for_ion_symbols(
+            [elem.symbol for elem in elements]
+        )) == len(elements)
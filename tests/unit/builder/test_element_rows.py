@@ -0,0 +1,79 @@
+import pytest
+import requests
+
+from periodic_table_db.builder.features import (
+    ElementRowParser, get_elements, get_elements_from_html,
+    iter_elements_from_html, parse_elements_text
+)
+
+from tests.conftest import AT_WEIGHTS_FILE
+from tests.resources.requests_local_file import LocalFileAdapter
+
+
+HTML = """
+<table><thead><tr><th>Z</th><th>Symbol</th></tr></thead>
+<tbody>
+<tr><td>1</td><td>H</td><td><a href="h.htm">hydrogen</a></td>
+<td>&nbsp;&nbsp;[1.007&nbsp;84,&nbsp;1.008&nbsp;11]</td><td></td></tr>
+<tr><td>2<td>He<td>helium<td>4.002&nbsp;602(2)<tr><td>43</td><td>Tc</td>
+<td>technetium</td><td>—</td></tr>
+</tbody></table>
+<table><tbody><tr><td>0</td><td>X</td><td>x</td><td>1.0(1)</td></tr>
+</tbody></table>
+"""
+
+
+class TestElementRowParser:
+
+    def test_rows(self):
+        parser = ElementRowParser()
+        parser.feed(HTML)
+        parser.close()
+        raw_elements = parser.pop_raw_elements()
+
+        assert [raw.symbol for raw in raw_elements] == ["H", "He", "Tc"]
+        assert raw_elements[0].name == "Hydrogen"
+        assert raw_elements[0].atomic_weight_tabulated == [
+            "1.00784", "1.00811"
+        ]
+        # End tags of rows and cells omitted
+        assert raw_elements[1].atomic_weight_tabulated == ["4.002602(2)"]
+        assert parser.pop_raw_elements() == []
+
+    def test_streamed_in_chunks(self):
+        chunks = [HTML[i:i + 5] for i in range(0, len(HTML), 5)]
+        elements = list(iter_elements_from_html(chunks))
+
+        assert [elem.atomic_number for elem in elements] == [1, 2, 43]
+        assert elements[1].weight.weight_esd == 0.000002
+        assert elements[2].weight.weight is None
+
+    def test_matches_beautifulsoup(self, local_file_cfg):
+        with requests.Session() as session:
+            session.mount(*local_file_cfg["adapter_cfg"])
+            resp = session.get(local_file_cfg["url"])
+        expected = parse_elements_text(get_elements_from_html(resp))
+
+        html = AT_WEIGHTS_FILE.read_text(encoding="utf-8")
+        assert list(iter_elements_from_html([html])) == expected
+        assert get_elements(**local_file_cfg) == expected
+
+    @pytest.mark.parametrize("html", [
+        "<html><body>Service unavailable</body></html>",
+        "<table><thead><tr><th>Z</th></tr></thead><tbody></tbody></table>",
+    ])
+    def test_no_elements(self, html):
+        with pytest.raises(RuntimeError):
+            list(iter_elements_from_html([html]))
+
+    def test_http_error(self, local_file_cfg):
+        class NotFoundAdapter(LocalFileAdapter):
+            def build_response(self, req, resp):
+                resp.status, resp.reason = 404, "Not Found"
+                return super().build_response(req, resp)
+
+        with pytest.raises(requests.HTTPError):
+            get_elements(
+                url=local_file_cfg["url"],
+                adapter_cfg=("file://", NotFoundAdapter())
+            )
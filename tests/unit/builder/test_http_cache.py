@@ -0,0 +1,102 @@
+import pytest
+import requests
+
+from periodic_table_db.builder.features import get_elements
+from periodic_table_db.builder.http_cache import CachingAdapter
+
+from tests.resources.requests_local_file import FileResponse, LocalFileAdapter
+
+
+class ETagFileAdapter(LocalFileAdapter):
+    """
+    LocalFileAdapter replying with an ETag, and 304 Not Modified to requests
+    with a matching If-None-Match.
+    """
+
+    def __init__(self, etag: str) -> None:
+        super().__init__()
+        self.etag = etag
+        self.sent_headers: list[dict] = []
+
+    def send(self, request, **kwargs):
+        self.sent_headers.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == self.etag:
+            raw = FileResponse(b"")
+            raw.status, raw.reason = 304, "Not Modified"
+            raw.headers = {"ETag": self.etag}
+            return self.build_response(request, raw)
+
+        resp = super().send(request, **kwargs)
+        resp.headers["ETag"] = self.etag
+        return resp
+
+
+@pytest.fixture
+def file_server() -> ETagFileAdapter:
+    return ETagFileAdapter('"v1"')
+
+
+def cached_get_elements(local_file_cfg, cache_dir, adapter, **kwargs):
+    return get_elements(
+        url=local_file_cfg["url"],
+        adapter_cfg=CachingAdapter.adapter_cfg(
+            local_file_cfg["url"], cache_dir, adapter=adapter, **kwargs
+        )
+    )
+
+
+class TestCachingAdapter:
+
+    def test_conditional_request(self, local_file_cfg, tmp_path, file_server):
+        elements = get_elements(**local_file_cfg)
+
+        assert cached_get_elements(
+            local_file_cfg, tmp_path, file_server
+        ) == elements
+        assert cached_get_elements(
+            local_file_cfg, tmp_path, file_server
+        ) == elements
+
+        first, second = file_server.sent_headers
+        assert "If-None-Match" not in first
+        assert second["If-None-Match"] == '"v1"'
+
+    def test_changed(self, local_file_cfg, tmp_path, file_server):
+        cached_get_elements(local_file_cfg, tmp_path, file_server)
+        file_server.etag = '"v2"'
+        cached_get_elements(local_file_cfg, tmp_path, file_server)
+        cached_get_elements(local_file_cfg, tmp_path, file_server)
+
+        assert [
+            headers.get("If-None-Match")
+            for headers in file_server.sent_headers
+        ] == [None, '"v1"', '"v2"']
+
+    def test_ttl(self, local_file_cfg, tmp_path, file_server):
+        cached_get_elements(local_file_cfg, tmp_path, file_server, ttl=60)
+        cached_get_elements(local_file_cfg, tmp_path, file_server, ttl=60)
+
+        assert len(file_server.sent_headers) == 1
+
+    def test_offline(self, local_file_cfg, tmp_path, file_server):
+        with pytest.raises(requests.ConnectionError):
+            cached_get_elements(
+                local_file_cfg, tmp_path, file_server, offline=True
+            )
+
+        elements = cached_get_elements(local_file_cfg, tmp_path, file_server)
+        assert cached_get_elements(
+            local_file_cfg, tmp_path, file_server, offline=True
+        ) == elements
+        assert len(file_server.sent_headers) == 1
+
+    def test_unreachable(self, local_file_cfg, tmp_path, file_server):
+        elements = cached_get_elements(local_file_cfg, tmp_path, file_server)
+
+        class UnreachableAdapter(LocalFileAdapter):
+            def send(self, request, **kwargs):
+                raise requests.ConnectionError("unreachable")
+
+        assert cached_get_elements(
+            local_file_cfg, tmp_path, UnreachableAdapter()
+        ) == elements
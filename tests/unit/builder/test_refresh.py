@@ -0,0 +1,105 @@
+from dataclasses import replace
+
+import pytest
+from sqlalchemy import MetaData, select
+
+from periodic_table_db.builder import PeriodicTableDBBuilder
+from periodic_table_db.builder.extended import ExtendedPeriodicTableDBBuilder
+from periodic_table_db.builder.features import get_elements
+from periodic_table_db.builder.refresh import ChangeSummary, diff_rows
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.shared import Ion
+
+
+def test_diff_rows():
+    existing = {1: {"a": 1}, 2: {"a": 2}, 3: {"a": 3}}
+    fresh = {2: {"a": 2}, 3: {"a": 4}, 5: {"a": 5}}
+
+    assert diff_rows(existing, fresh) == ([5], [3], [1])
+
+
+def test_change_summary():
+    summary = ChangeSummary()
+    assert not summary.changed
+    assert str(summary) == "No changes."
+
+    summary.record("Element", inserted=[1])
+    summary.record("Element", updated=[1, 2])
+    summary.record("Ion")
+
+    assert summary.changed
+    assert summary.tables["Element"].updated == {2}
+    assert str(summary) == "Element: 1 inserted, 1 updated, 0 deleted"
+
+
+class TestRefreshElements:
+
+    def test_unchanged(self, pt_db_engine, local_file_cfg):
+        elements = get_elements(**local_file_cfg)
+        builder = ExtendedPeriodicTableDBBuilder(pt_db_engine, MetaData())
+
+        assert not builder.refresh_elements(elements).changed
+
+    def test_changes(self, pt_db_engine, local_file_cfg):
+        elements = get_elements(**local_file_cfg)
+        PeriodicTableDBAPI(pt_db_engine, MetaData()).add_ions(
+            Ion("Cu", 2, False)
+        )
+        iron, copper = elements[25], elements[28]
+        changed = elements[:-1]  # Without Og
+        changed[25] = replace(
+            iron, weight=replace(iron.weight, weight_esd=0.003)
+        )
+        changed[28] = replace(copper, symbol="Cx")
+
+        builder = ExtendedPeriodicTableDBBuilder(pt_db_engine, MetaData())
+        summary = builder.refresh_elements(changed, allow_deletes=True)
+
+        assert summary.tables["AtomicWeight"].updated == {55.845}
+        assert summary.tables["Element"].updated == {29}
+        assert summary.tables["Element"].deleted == {118}
+        assert len(summary.tables["Ion"].updated) == 2
+        assert len(summary.tables["ElementLabel"].deleted) == 2
+        with pt_db_engine.connect() as conn:
+            assert conn.execute(
+                select(builder.ion.c.symbol, builder.ion.c.sub_shell_structure)
+                .where(builder.ion.c.atomic_number == 29)
+                .order_by(builder.ion.c.charge)
+            ).all() == [
+                ("Cx", "1s^{2}.2s^{2}.2p^{6}.3s^{2}.3p^{6}.3d^{10}.4s^{1}"),
+                ("Cx2+", "1s^{2}.2s^{2}.2p^{6}.3s^{2}.3p^{6}.3d^{9}"),
+            ]
+
+        summary = builder.refresh_elements(elements)
+        assert summary.tables["Element"].inserted == {118}
+        assert summary.tables["ElementLabel"].inserted
+        assert not builder.refresh_elements(elements).changed
+
+    def test_partial_list(self, pt_db_engine, local_file_cfg):
+        elements = get_elements(**local_file_cfg)
+        builder = ExtendedPeriodicTableDBBuilder(pt_db_engine, MetaData())
+        with pt_db_engine.connect() as conn:
+            before = conn.execute(select(builder.element)).all()
+
+        with pytest.raises(RuntimeError):
+            builder.refresh_elements([])
+        with pytest.raises(RuntimeError):
+            builder.refresh_elements(elements[:50])
+
+        with pt_db_engine.connect() as conn:
+            assert conn.execute(select(builder.element)).all() == before
+
+        # Gaps within the range of atomic numbers are deleted
+        summary = builder.refresh_elements(elements[:9] + elements[10:])
+        assert summary.tables["Element"].deleted == {10}
+
+    def test_new_database(self, tmp_path, local_file_cfg):
+        elements = get_elements(**local_file_cfg)
+        engine_url = f"sqlite:///{tmp_path / 'new.sqlite'}"
+        builder = PeriodicTableDBBuilder.from_url(engine_url)
+        builder.create_db()
+
+        summary = builder.refresh_elements(elements)
+        assert len(summary.tables["Element"].inserted) == len(elements)
+        assert len(summary.tables["Ion"].inserted) == len(elements)
+        assert not builder.refresh_elements(elements).changed
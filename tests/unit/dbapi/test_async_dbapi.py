@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from sqlalchemy import MetaData
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from periodic_table_db.dbapi.async_dbapi import (  # noqa: E402
+    AsyncPeriodicTableDBAPI
+)
+from periodic_table_db.shared import Ion  # noqa: E402
+
+
+def run_with_api(pt_db_engine, coro_fn):
+    """
+    Create an AsyncPeriodicTableDBAPI for the test database and run
+    coro_fn(api) in a new event loop.
+    """
+    async def main():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{pt_db_engine.url.database}"
+        )
+        try:
+            api = await AsyncPeriodicTableDBAPI.create(engine, MetaData())
+            return await coro_fn(api)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+class TestAsyncPeriodicTableDBAPI:
+
+    def test_get_atomic_nr_for_symbol(self, pt_db_engine):
+        async def lookup(api: AsyncPeriodicTableDBAPI):
+            return await asyncio.gather(
+                api.get_atomic_nr_for_symbol("Fe"),
+                api.get_atomic_nr_for_symbol("Xx"),
+                api.get_atomic_nrs_for_symbols(["H", "He", "Xx"]),
+            )
+
+        assert run_with_api(pt_db_engine, lookup) == [
+            26, None, {"H": 1, "He": 2}
+        ]
+
+    def test_add_ions(self, pt_db_engine):
+        async def add(api: AsyncPeriodicTableDBAPI):
+            await api.add_ions([Ion("Fe", 2, False), Ion("Fe", 3, False)])
+            return await api.get_ids_for_ion_symbols(["Fe", "Fe2+", "Fe3+"])
+
+        assert set(run_with_api(pt_db_engine, add)) == {"Fe", "Fe2+", "Fe3+"}
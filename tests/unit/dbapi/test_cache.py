@@ -0,0 +1,39 @@
+import pytest
+
+from periodic_table_db.dbapi.cache import LookupCache
+
+
+class TestLookupCache:
+
+    def test_get(self):
+        cache = LookupCache(2)
+        cache["Fe"] = 26
+
+        assert cache.get("Fe") == 26
+        assert cache.get("Co") is None
+        assert cache.info() == (1, 1, 2, 1)
+
+    def test_eviction(self):
+        cache = LookupCache(2)
+        cache["Fe"] = 26
+        cache["Co"] = 27
+        cache.get("Fe")
+        cache["Ni"] = 28
+
+        # Co is least recently used
+        assert "Co" not in cache
+        assert "Fe" in cache
+        assert "Ni" in cache
+        assert len(cache) == 2
+
+    def test_clear(self):
+        cache = LookupCache(2)
+        cache["Fe"] = 26
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get("Fe") is None
+
+    def test_bad_size(self):
+        with pytest.raises(ValueError):
+            LookupCache(0)
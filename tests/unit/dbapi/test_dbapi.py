@@ -0,0 +1,162 @@
+import pytest
+
+from sqlalchemy import MetaData, select
+
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.shared import Ion
+
+
+class TestLookupCaching:
+
+    def test_atomic_nr_cached(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), cache_size=8)
+
+        assert dbapi.get_atomic_nr_for_symbol("Fe") == 26
+        assert dbapi.get_atomic_nr_for_symbol("Fe") == 26
+        info = dbapi.cache_info()["atomic_number"]
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_unknown_symbol_not_cached(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), cache_size=8)
+
+        assert dbapi.get_atomic_nr_for_symbol("Xx") is None
+        assert dbapi.cache_info()["atomic_number"].currsize == 0
+
+    def test_ion_ids_cached(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), cache_size=8)
+
+        ids = dbapi.get_ids_for_ion_symbols(["Fe", "O"])
+        assert dbapi.get_ids_for_ion_symbols(["Fe", "O", "Xx"]) == ids
+        info = dbapi.cache_info()["id"]
+        assert (info.hits, info.currsize) == (2, 2)
+
+    def test_add_ions_invalidates(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), cache_size=8)
+        dbapi.get_ids_for_ion_symbols("Cu")
+        assert dbapi.cache_info()["id"].currsize == 1
+
+        dbapi.add_ions(Ion("Cu", 1, False, 29))
+        assert dbapi.cache_info()["id"].currsize == 0
+        assert "Cu1+" in dbapi.get_ids_for_ion_symbols("Cu1+")
+
+    def test_rollback_invalidates(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), cache_size=8)
+
+        with pytest.raises(ValueError):
+            with dbapi.session():
+                dbapi.add_ions(Ion("Fe", 3, False))
+                assert "Fe3+" in dbapi.get_ids_for_ion_symbols("Fe3+")
+                raise ValueError
+        assert dbapi.cache_info()["id"].currsize == 0
+        assert dbapi.get_ids_for_ion_symbols("Fe3+") == {}
+
+    def test_no_cache(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+
+        assert dbapi.get_atomic_nr_for_symbol("Fe") == 26
+        assert dbapi.cache_info() == {}
+
+
+class TestBulkLookup:
+
+    def test_get_atomic_nrs_for_symbols(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+
+        at_nrs = dbapi.get_atomic_nrs_for_symbols(["H", "Fe", "Xx", "Fe"])
+        assert at_nrs == {"H": 1, "Fe": 26}
+
+    def test_get_atomic_nrs_chunked(self, pt_db_engine, monkeypatch):
+        monkeypatch.setattr(
+            "periodic_table_db.dbapi.dbapi.MAX_IN_PARAMETERS", 7
+        )
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), cache_size=4)
+        symbols = ["H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne", "Na"]
+
+        at_nrs = dbapi.get_atomic_nrs_for_symbols(symbols)
+        assert at_nrs == dict(zip(symbols, range(1, 12)))
+
+    def test_add_ions_by_element_symbol(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+        ions = [Ion("Fe", 3, False), Ion("O", -2, False)]
+
+        dbapi.add_ions(ions)
+        assert [ion.atomic_number for ion in ions] == [26, 8]
+        assert set(dbapi.get_ids_for_ion_symbols(["Fe3+", "O2-"])) == {
+            "Fe3+", "O2-"
+        }
+        with dbapi.connect() as conn:
+            ion = dbapi.tables["Ion"]
+            atomic_nrs = dict(conn.execute(
+                select(ion.c.symbol, ion.c.atomic_number)
+                .where(ion.c.symbol.in_(["Fe3+", "O2-"]))
+            ).all())
+        assert atomic_nrs == {"Fe3+": 26, "O2-": 8}
+
+    def test_preload_ions(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+        Ion.clear_registry()
+
+        ions = dbapi.preload_ions()
+        assert len(ions) == 118
+        iron = Ion.get("Fe", 0)
+        assert iron.atomic_number == 26
+        assert any(ion is iron for ion in ions)
+
+    def test_add_ions_unknown_element(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+
+        with pytest.raises(RuntimeError):
+            dbapi.add_ions(Ion("Xx", 1, False))
+
+    def test_get_ids_for_many_ion_symbols(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+        symbols = [f"X{i}" for i in range(5000)] + ["Fe", "O"]
+
+        assert set(dbapi.get_ids_for_ion_symbols(symbols)) == {"Fe", "O"}
+
+    def test_get_ids_temp_table(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(
+            pt_db_engine, MetaData(), temp_table_threshold=2
+        )
+        symbols = ["Fe", "Xx", "O", "Fe"]
+
+        with dbapi.session() as conn:
+            ids = dbapi.get_ids_for_ion_symbols(symbols)
+            # Temporary table cleaned up afterwards
+            assert dbapi.get_ids_for_ion_symbols(symbols) == ids
+        assert set(ids) == {"Fe", "O"}
+        assert conn.closed
+
+
+class TestElementQueries:
+
+    def test_get_elements_by_label(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+
+        assert dbapi.get_elements_by_label("Halogen") == {
+            "F": 9, "Cl": 17, "Br": 35, "I": 53, "At": 85, "Ts": 117
+        }
+        assert dbapi.get_elements_by_label("Not A Label") == {}
+
+    def test_get_elements_in_group_period_block(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+
+        assert list(dbapi.get_elements_in_group(2).values()) == [
+            4, 12, 20, 38, 56, 88
+        ]
+        assert list(dbapi.get_elements_in_period(1)) == ["H", "He"]
+        assert len(dbapi.get_elements_in_block("f")) == 28
+
+    def test_get_elements_combined(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+
+        assert dbapi.get_elements(
+            labels=["Transition Element"], period=4, group=8
+        ) == {"Fe": 26}
+        assert dbapi.get_elements(group=1, block="p") == {}
+
+    def test_get_elements_requires_extended(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+
+        with pytest.raises(RuntimeError):
+            dbapi.get_elements_in_group(1)
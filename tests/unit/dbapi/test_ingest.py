@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import MetaData
+
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.dbapi.ingest import chunked, read_csv_column
+
+
+def test_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+    with pytest.raises(ValueError):
+        list(chunked(range(5), 0))
+
+
+class TestReadCSVColumn:
+
+    def test_index(self, tmp_path):
+        csv_path = tmp_path / "ions.csv"
+        csv_path.write_text("Fe3+,iron\n,none\nO2-, oxide\n")
+
+        assert list(read_csv_column(csv_path)) == ["Fe3+", "O2-"]
+        assert list(read_csv_column(csv_path, 1)) == ["iron", "none", "oxide"]
+
+    def test_name(self, tmp_path):
+        csv_path = tmp_path / "ions.csv"
+        csv_path.write_text("name,symbol\niron,Fe3+\noxide,O2-\n")
+
+        assert list(read_csv_column(csv_path, "symbol")) == ["Fe3+", "O2-"]
+        with pytest.raises(RuntimeError):
+            list(read_csv_column(csv_path, "charge"))
+
+
+class TestIngestIonSymbols:
+
+    def test_ingest(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+        symbols = ["Fe2+", "Fe3+", "O2-", "Cu(II)", "Cval"]
+
+        report = dbapi.ingest_ion_symbols(iter(symbols), chunk_size=2)
+        assert report.chunks == 3
+        assert report.rows_inserted == 5
+        assert report.failed_chunks == []
+        assert report.rows_per_second > 0
+        assert set(dbapi.get_ids_for_ion_symbols(
+            ["Fe2+", "Fe3+", "O2-", "Cu2+", "Cval"]
+        )) == {"Fe2+", "Fe3+", "O2-", "Cu2+", "Cval"}
+
+    def test_failed_chunk(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+        symbols = ["Fe2+", "Fe3+", "Xx+", "Cu2+", "Li+", "O2--"]
+
+        report = dbapi.ingest_ion_symbols(symbols, chunk_size=2)
+        assert report.rows_inserted == 2
+        assert [idx for idx, _ in report.failed_chunks] == [1, 2]
+        assert set(dbapi.get_ids_for_ion_symbols(symbols)) == {"Fe2+", "Fe3+"}
+
+    def test_streaming(self, pt_db_engine, monkeypatch):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+        read = []
+        read_at_insert = []
+
+        def symbols():
+            for charge in range(1, 7):
+                read.append(charge)
+                yield f"Mn{charge}+"
+
+        ion_values = dbapi._ion_values
+
+        def spy_ion_values(ions, conn):
+            read_at_insert.append(len(read))
+            return ion_values(ions, conn)
+        monkeypatch.setattr(dbapi, "_ion_values", spy_ion_values)
+
+        with dbapi.session():
+            report = dbapi.ingest_ion_symbols(symbols(), chunk_size=2)
+        assert report.rows_inserted == 6
+        # Symbols are only read as each chunk is needed
+        assert read_at_insert == [2, 4, 6]
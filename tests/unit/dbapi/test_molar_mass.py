@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import MetaData
+
+np = pytest.importorskip("numpy")
+
+from periodic_table_db.dbapi import PeriodicTableDBAPI  # noqa: E402
+from periodic_table_db.dbapi.molar_mass import (  # noqa: E402
+    MolarMassCalculator, parse_formula
+)
+
+
+class TestParseFormula:
+
+    @pytest.mark.parametrize(
+            "formula, exp", [
+                ("H2O", {"H": 2, "O": 1}),
+                ("Ca(OH)2", {"Ca": 1, "O": 2, "H": 2}),
+                ("K4[Fe(CN)6]", {"K": 4, "Fe": 1, "C": 6, "N": 6}),
+                ("CuSO4·5H2O", {"Cu": 1, "S": 1, "O": 9, "H": 10}),
+                ("Fe0.95O", {"Fe": 0.95, "O": 1}),
+                ("CH3COOH", {"C": 2, "H": 4, "O": 2}),
+            ]
+    )
+    def test_parse(self, formula, exp):
+        assert parse_formula(formula) == exp
+
+    @pytest.mark.parametrize(
+            "formula", ["", "H2O)", "(H2O", "2", "H2 3", "Fe$", "()", "H2O·"]
+    )
+    def test_parse_fail(self, formula):
+        with pytest.raises(RuntimeError):
+            parse_formula(formula)
+
+
+class TestMolarMassCalculator:
+
+    @pytest.fixture
+    def calculator(self, pt_db_engine):
+        return MolarMassCalculator(
+            PeriodicTableDBAPI(pt_db_engine, MetaData())
+        )
+
+    def test_molar_masses(self, calculator: MolarMassCalculator):
+        masses = calculator.molar_masses(["H2O", "Fe2O3", "Fe", "O"])
+
+        assert masses.mass == pytest.approx(
+            [18.015, 159.687, 55.845, 15.999], abs=0.005
+        )
+        # Fe: 55.845(2)
+        assert masses.esd[2] == pytest.approx(0.002)
+        assert masses.esd[1] == pytest.approx(
+            np.sqrt((2 * masses.esd[2]) ** 2 + (3 * masses.esd[3]) ** 2)
+        )
+        assert np.all(masses.min <= masses.mass)
+        assert np.all(masses.max >= masses.mass)
+
+    def test_no_weight(self, calculator: MolarMassCalculator):
+        masses = calculator.molar_masses(["TcO2", "NaCl"])
+
+        assert np.isnan(masses.mass[0])
+        assert np.isnan(masses.esd[0])
+        assert not np.isnan(masses.mass[1])
+
+    def test_matrix(self, calculator: MolarMassCalculator):
+        formulas = ["NaCl", "Ca(OH)2"]
+        matrix = calculator.composition_matrix(formulas)
+
+        assert matrix.shape == (2, calculator.size)
+        assert matrix[1, 20] == 1
+        np.testing.assert_array_equal(
+            calculator.molar_masses(matrix).mass,
+            calculator.molar_masses(formulas).mass
+        )
+
+    def test_unknown_element(self, calculator: MolarMassCalculator):
+        with pytest.raises(RuntimeError):
+            calculator.molar_masses(["Xx2O"])
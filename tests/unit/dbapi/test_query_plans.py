@@ -0,0 +1,104 @@
+"""
+Regression tests checking (with EXPLAIN QUERY PLAN) that the queries made by
+the DBAPI use indexes rather than scanning the tables.
+"""
+import pytest
+from sqlalchemy import Connection, Executable, MetaData, update
+
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.dbapi.dbapi import (
+    LOOKUP_SYMBOLS, lookup_symbols_table
+)
+from periodic_table_db.shared import ATOMIC_NR, ELEM_SYMBOL, ION_ID
+
+
+def query_plan(
+        conn: Connection, stmt: Executable, params: dict | None = None
+) -> list[str]:
+    """
+    Details of each step of the SQLite query plan of stmt.
+    """
+    if params:
+        stmt = stmt.params(**params)
+    compiled = stmt.compile(
+        conn, compile_kwargs={"literal_binds": True}
+    )
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")
+    return [row[3] for row in plan]
+
+
+def assert_uses_index(plan: list[str], table: str):
+    table_steps = [step for step in plan if f" {table} " in f"{step} "]
+    assert table_steps, f"{table} not found in query plan {plan}"
+    for step in table_steps:
+        assert step.startswith("SEARCH"), plan
+        assert "INDEX" in step or "PRIMARY KEY" in step, plan
+
+
+@pytest.fixture
+def dbapi(pt_db_engine):
+    return PeriodicTableDBAPI(pt_db_engine, MetaData())
+
+
+class TestQueryPlans:
+
+    def test_atomic_nr_for_symbol(self, dbapi: PeriodicTableDBAPI):
+        with dbapi.connect() as conn:
+            plan = query_plan(
+                conn, dbapi._atomic_nr_stmt, {ELEM_SYMBOL: "Fe"}
+            )
+        assert_uses_index(plan, "Element")
+
+    @pytest.mark.parametrize(
+            "key, table", [(ATOMIC_NR, "Element"), (ION_ID, "Ion")]
+    )
+    def test_symbol_lookup(self, dbapi: PeriodicTableDBAPI, key, table):
+        in_stmt, _ = dbapi._lookup_stmts[key]
+        with dbapi.connect() as conn:
+            plan = query_plan(conn, in_stmt, {LOOKUP_SYMBOLS: ["Fe", "O"]})
+        assert_uses_index(plan, table)
+
+    @pytest.mark.parametrize(
+            "key, table", [(ATOMIC_NR, "Element"), (ION_ID, "Ion")]
+    )
+    def test_symbol_lookup_temp_table(
+        self, dbapi: PeriodicTableDBAPI, key, table
+    ):
+        _, join_stmt = dbapi._lookup_stmts[key]
+        with dbapi.connect() as conn:
+            lookup_symbols_table.create(conn)
+            plan = query_plan(conn, join_stmt)
+        # Only the (small) temporary table may be scanned
+        assert_uses_index(plan, table)
+
+    def test_ion_update_by_atomic_nr(self, dbapi: PeriodicTableDBAPI):
+        # Used by ExtendedPeriodicTableDBBuilder.add_electronic_structure_data
+        ion = dbapi.tables["Ion"]
+        update_stmt = (
+            update(ion)
+            .where(ion.c[ATOMIC_NR] == 2)
+            .values(shell_structure="2")
+        )
+        with dbapi.connect() as conn:
+            plan = query_plan(conn, update_stmt)
+        assert_uses_index(plan, "Ion")
+
+    @pytest.mark.parametrize("query", [
+        {"group": 8}, {"period": 4}, {"block": "d"},
+    ])
+    def test_elements_by_group_period_block(self, pt_db_engine, query):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+        elements_stmt = dbapi._elements_stmt(
+            (), query.get("group"), query.get("period"), query.get("block")
+        )
+        with dbapi.connect() as conn:
+            plan = query_plan(conn, elements_stmt)
+        assert_uses_index(plan, "Element")
+
+    def test_elements_by_label(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+        elements_stmt = dbapi._elements_stmt(["Halogen"], None, None, None)
+        with dbapi.connect() as conn:
+            plan = query_plan(conn, elements_stmt)
+        assert_uses_index(plan, "ElementLabel")
+        assert_uses_index(plan, "Label")
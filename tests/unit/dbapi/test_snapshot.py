@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from sqlalchemy import MetaData
+
+from periodic_table_db.dbapi import PeriodicTableDBAPI, SnapshotDBAPI
+
+
+class TestSnapshotDBAPI:
+
+    def test_lookups_match_dbapi(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+        snapshot = dbapi.snapshot()
+        symbols = ["H", "Fe", "U", "Xx"]
+
+        assert isinstance(snapshot, SnapshotDBAPI)
+        assert snapshot.extended
+        for symbol in symbols:
+            assert (snapshot.get_atomic_nr_for_symbol(symbol)
+                    == dbapi.get_atomic_nr_for_symbol(symbol))
+        assert (snapshot.get_atomic_nrs_for_symbols(symbols)
+                == dbapi.get_atomic_nrs_for_symbols(symbols))
+        assert (snapshot.get_ids_for_ion_symbols(symbols)
+                == dbapi.get_ids_for_ion_symbols(symbols))
+
+    def test_no_database_access(self, pt_db_engine):
+        snapshot = PeriodicTableDBAPI(pt_db_engine, MetaData()).snapshot()
+        pt_db_engine.dispose()
+        os.remove(pt_db_engine.url.database)
+
+        assert snapshot.get_atomic_nr_for_symbol("Fe") == 26
+
+    def test_get_element(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+        snapshot = dbapi.snapshot()
+
+        iron = snapshot.get_element("Fe")
+        assert iron == snapshot.get_element(26)
+        assert iron == snapshot.get_element("Iron")
+        assert iron["weight_type"] == "Reported"
+        assert iron["weight"] == 55.845
+        assert iron["labels"] == ["Transition Element"]
+        assert snapshot.get_element("Xx") is None
+
+        technetium = snapshot.get_element("Tc")
+        assert technetium["weight"] is None
+        assert technetium["weight_type"] == "None"
+
+    def test_get_ion_symbols_for_atomic_nr(self, pt_db_engine):
+        snapshot = PeriodicTableDBAPI(pt_db_engine, MetaData()).snapshot()
+
+        assert snapshot.get_ion_symbols_for_atomic_nr(8) == ["O"]
+        assert "labels" not in snapshot.get_element(8)
+
+    def test_get_elements_match_dbapi(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData(), extended=True)
+        snapshot = dbapi.snapshot()
+        queries = [
+            {"labels": "Halogen"},
+            {"labels": ["Transition Element"], "period": 4},
+            {"group": 1},
+            {"period": 2, "block": "p"},
+            {"block": "f"},
+            {"labels": "Not A Label"},
+        ]
+
+        for query in queries:
+            assert (snapshot.get_elements(**query)
+                    == dbapi.get_elements(**query))
+        assert (snapshot.get_elements_in_group(18)
+                == dbapi.get_elements_in_group(18))
+
+    def test_get_elements_requires_extended(self, pt_db_engine):
+        snapshot = PeriodicTableDBAPI(pt_db_engine, MetaData()).snapshot()
+
+        with pytest.raises(RuntimeError):
+            snapshot.get_elements_in_period(1)
@@ -0,0 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import (
+    Column, Integer, MetaData, Table, create_engine, inspect
+)
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
+
+from periodic_table_db import dbconnector
+from periodic_table_db.dbapi import PeriodicTableDBAPI
+from periodic_table_db.dbconnector import (
+    DBConnector, clear_reflection_cache, create_db_engine, POOL_STATIC,
+    POOL_QUEUE, POOL_THREAD
+)
+from periodic_table_db.shared import Ion, TABLE_NAMES
+
+
+class TestGetTablesFromExisting:
+
+    def test_only_requested_tables(self, pt_db_engine):
+        md = MetaData()
+        connector = DBConnector(pt_db_engine, md)
+
+        tables = connector.get_tables_from_existing(["Ion"])
+        assert list(tables) == ["Ion"]
+        # Ion references Element, which references the weight & extended
+        # tables; the labels are not needed
+        assert "Label" not in md.tables
+        assert "ElementLabel" not in md.tables
+        assert "Label" in inspect(pt_db_engine).get_table_names()
+
+    def test_cached(self, pt_db_engine, monkeypatch):
+        connector = DBConnector(pt_db_engine, MetaData())
+        tables = connector.get_tables_from_existing(TABLE_NAMES)
+
+        def no_reflect(*args, **kwargs):
+            raise AssertionError("Reflection should not be called")
+        monkeypatch.setattr(MetaData, "reflect", no_reflect)
+
+        md = MetaData()
+        connector = DBConnector(pt_db_engine, md)
+        cached_tables = connector.get_tables_from_existing(TABLE_NAMES)
+        for nm in TABLE_NAMES:
+            # Copied into the MetaData of the new connector
+            assert cached_tables[nm] is md.tables[nm]
+            assert cached_tables[nm] is not tables[nm]
+            assert cached_tables[nm].c.keys() == tables[nm].c.keys()
+        # Referenced tables are copied too, so foreign keys resolve
+        fk_tables = {
+            fk.column.table for fk in cached_tables["Element"].foreign_keys
+        }
+        assert all(table.metadata is md for table in fk_tables)
+
+    def test_clear_cache(self, pt_db_engine):
+        connector = DBConnector(pt_db_engine, MetaData())
+        tables = connector.get_tables_from_existing(TABLE_NAMES)
+
+        clear_reflection_cache(pt_db_engine)
+        connector = DBConnector(pt_db_engine, MetaData())
+        new_tables = connector.get_tables_from_existing(TABLE_NAMES)
+        assert tables["Ion"] is not new_tables["Ion"]
+
+    def test_memory_db_not_cached(self):
+        clear_reflection_cache()
+        engine = create_engine("sqlite:///:memory:")
+        md = MetaData()
+        Table("pt_Ion", md, Column("id", Integer, primary_key=True))
+        md.create_all(engine)
+
+        connector = DBConnector(engine, MetaData())
+        tables = connector.get_tables_from_existing(["Ion"], prefix="pt_")
+        assert tables["Ion"].name == "pt_Ion"
+        assert not dbconnector._reflected_tables
+
+
+class TestCreateDBEngine:
+
+    @pytest.mark.parametrize(
+            "pooling, pool_class", [
+                (POOL_STATIC, StaticPool),
+                (POOL_QUEUE, QueuePool),
+                (POOL_THREAD, SingletonThreadPool),
+            ]
+    )
+    def test_pooling(self, tmp_path, pooling, pool_class):
+        engine = create_db_engine(
+            f"sqlite:///{tmp_path / 'test.sqlite'}", pooling=pooling
+        )
+        assert isinstance(engine.pool, pool_class)
+
+    def test_static_memory_db_shared(self):
+        engine = create_db_engine("sqlite:///:memory:", pooling=POOL_STATIC)
+        md = MetaData()
+        Table("Ion", md, Column("id", Integer, primary_key=True))
+        md.create_all(engine)
+
+        def count_tables():
+            return len(inspect(engine).get_table_names())
+        with ThreadPoolExecutor(1) as pool:
+            assert pool.submit(count_tables).result() == 1
+
+    def test_unknown_pooling(self):
+        with pytest.raises(ValueError):
+            create_db_engine("sqlite:///:memory:", pooling="swimming")
+
+
+class TestSession:
+
+    def test_shared_connection(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+        used_connections = []
+        connect = dbapi.connect
+
+        def spy_connect():
+            conn = connect()
+            used_connections.append(conn)
+            return conn
+        dbapi.connect = spy_connect
+
+        with dbapi.session() as conn:
+            dbapi.add_ions(Ion("Fe", 3, False))
+            with dbapi.session() as inner_conn:
+                assert inner_conn is conn
+            assert dbapi.get_ids_for_ion_symbols("Fe3+")
+        assert used_connections == []
+        assert dbapi.get_ids_for_ion_symbols("Fe3+")
+        assert used_connections != []
+
+    def test_rollback(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI(pt_db_engine, MetaData())
+
+        with pytest.raises(KeyError):
+            with dbapi.session():
+                dbapi.add_ions(Ion("Fe", 3, False))
+                assert dbapi.get_ids_for_ion_symbols("Fe3+")
+                raise KeyError()
+        assert dbapi.get_ids_for_ion_symbols("Fe3+") == {}
+
+    def test_from_url(self, pt_db_engine):
+        dbapi = PeriodicTableDBAPI.from_url(
+            str(pt_db_engine.url), pooling=POOL_QUEUE, cache_size=4
+        )
+        assert isinstance(dbapi.engine.pool, QueuePool)
+        assert dbapi.get_atomic_nr_for_symbol("Fe") == 26
@@ -1,6 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+import random
+
 import pytest
 
-from periodic_table_db.shared import parse_ion_symbol, Ion
+from periodic_table_db.shared import (
+    _match_ion_symbol, _parse_ion_symbol, _scan_ion_symbol, parse_ion_symbol,
+    parse_ion_symbols, Ion
+)
 
 
 class TestParseIonSymbol:
@@ -69,6 +76,82 @@ class TestParseIonSymbol:
         with pytest.raises(RuntimeError):
             parse_ion_symbol(symbol)
 
+    def test_parse_memoized(self):
+        _parse_ion_symbol.cache_clear()
+        first = parse_ion_symbol("Fe3+")
+        second = parse_ion_symbol("Fe3+", 26)
+        assert _parse_ion_symbol.cache_info().hits == 1
+        assert second == {**first, "atomic_number": 26}
+        # Results are independent copies of the cached value
+        first["charge"] = 0
+        assert parse_ion_symbol("Fe3+")["charge"] == 3
+
+
+class TestParseIonSymbols:
+
+    def test_parse(self):
+        parsed = parse_ion_symbols(
+            ["Fe3+", "O2-", "Fe3+", "Naval", "Cu(II)", "O2-"]
+        )
+        assert parsed.symbols == ["Fe3+", "O2-", "Naval", "Cu(II)"]
+        assert parsed.element_symbols == ["Fe", "O", "Na", "Cu"]
+        assert parsed.charges == [3, -2, 0, 2]
+        assert parsed.valence_states == [False, False, True, False]
+        assert parsed.errors == {}
+        assert len(parsed) == 4
+
+    def test_parse_errors(self):
+        parsed = parse_ion_symbols(iter(["Li+-", "Li+", "O2--", "Li+-"]))
+        assert parsed.symbols == ["Li+"]
+        assert parsed.charges == [1]
+        assert list(parsed.errors) == ["Li+-", "O2--"]
+        assert "Li+-" in parsed.errors["Li+-"]
+
+
+def parse_result(parse, symbol: str):
+    try:
+        return parse(symbol)
+    except RuntimeError:
+        return RuntimeError
+
+
+class TestScanIonSymbol:
+    """
+    The hand-written scanner must accept exactly the symbols matched by
+    ion_symbol_re, with the same results.
+    """
+    # Characters covering every part of the grammar, plus a non-ASCII digit
+    # ("\u0663" is Arabic-Indic 3) and the newline ignored at the end
+    alphabet = "CFavl(I)+-2\u0663\n"
+
+    def test_exhaustive(self):
+        for length in range(6):
+            for chars in product(self.alphabet, repeat=length):
+                symbol = "".join(chars)
+                assert (parse_result(_scan_ion_symbol, symbol)
+                        == parse_result(_match_ion_symbol, symbol)), symbol
+
+    def test_random(self):
+        rng = random.Random(20240601)
+        alphabet = self.alphabet + "NOSeiLx09 ()+-"
+        for _ in range(20000):
+            symbol = "".join(rng.choices(alphabet, k=rng.randint(1, 12)))
+            assert (parse_result(_scan_ion_symbol, symbol)
+                    == parse_result(_match_ion_symbol, symbol)), symbol
+
+    @pytest.mark.parametrize(
+            "symbol, exp", [
+                ("Cval", ("C", 0, True)),
+                ("Cvval", ("Cv", 0, True)),
+                ("Nava", ("Na", 0, True)),
+                ("Fe(III)", ("Fe", 3, False)),
+                ("O2-\n", ("O", -2, False)),
+                ("Ca++", ("Ca", 2, False)),
+            ]
+    )
+    def test_scan(self, symbol, exp):
+        assert _scan_ion_symbol(symbol) == exp
+
 
 class TestIon:
 
@@ -95,3 +178,55 @@ class TestIon:
                     exp: Ion):
         ion = Ion(**in_dict)
         assert ion.symbol == exp
+
+    def test_to_row(self):
+        ion = Ion("Fe", 3, atomic_number=26)
+        assert ion.to_row() == {
+            "symbol": "Fe3+",
+            "charge": 3,
+            "atomic_number": 26,
+            "valence_state": False,
+        }
+        assert not hasattr(ion, "__dict__")
+
+    def test_immutable(self):
+        ion = Ion("Fe", 3)
+        with pytest.raises(AttributeError):
+            ion.charge = 2
+
+
+class TestIonRegistry:
+
+    @pytest.fixture(autouse=True)
+    def clear_registry(self):
+        Ion.clear_registry()
+        yield
+        Ion.clear_registry()
+
+    def test_get_shared(self):
+        ion = Ion.get("Fe", 3)
+        assert Ion.get("Fe", 3, False) is ion
+        assert ion == Ion("Fe", 3)
+        assert Ion.get("Fe", 2) is not ion
+        assert Ion.get("Fe", 0, True) is not Ion.get("Fe", 0)
+
+    def test_get_atomic_number(self):
+        ion = Ion.get("Fe", 3)
+        numbered = Ion.get("Fe", 3, atomic_number=26)
+        assert numbered is ion
+        assert ion.atomic_number == 26
+        assert Ion.get("Fe", 3) is ion
+        with pytest.raises(RuntimeError):
+            Ion.get("Fe", 3, atomic_number=27)
+
+    def test_atomic_number_not_compared(self):
+        ion = Ion("Fe", 3)
+        assert ion == Ion("Fe", 3, atomic_number=26)
+        assert hash(ion) == hash(Ion("Fe", 3, atomic_number=26))
+
+    def test_get_threads(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ions = list(executor.map(
+                lambda _: Ion.get("O", -2), range(1000)
+            ))
+        assert all(ion is ions[0] for ion in ions)